@@ -11,7 +11,7 @@ from datarush.core.types import (
     TableStr,
     ValueType,
 )
-from datarush.run import run_template, run_template_from_command_line
+from datarush.run import run_template, run_template_batch, run_template_from_command_line
 from datarush.version import __version__
 
 __all__ = [
@@ -27,6 +27,7 @@ __all__ = [
     "Tableset",
     "register_operation_type",
     "run_template",
+    "run_template_batch",
     "run_template_from_command_line",
     "__version__",
 ]
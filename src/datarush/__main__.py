@@ -1,6 +1,22 @@
 """Main entry point."""
 
+import sys
+
 from datarush.run import run_template_from_command_line
 
 if __name__ == "__main__":
-    run_template_from_command_line()
+    # Subcommands are imported when used, so that running a template does not pay for them
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from datarush.server import serve_from_command_line
+
+        serve_from_command_line()
+    elif len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        from datarush.benchmark import benchmark_from_command_line
+
+        benchmark_from_command_line()
+    elif len(sys.argv) > 1 and sys.argv[1] == "compact":
+        from datarush.compaction import compact_from_command_line
+
+        compact_from_command_line()
+    else:
+        run_template_from_command_line()
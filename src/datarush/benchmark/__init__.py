@@ -0,0 +1,31 @@
+"""Benchmarks of operations and templates over synthetic tables."""
+
+from datarush.benchmark.cases import BenchmarkCase, get_benchmark_case, register_benchmark_case
+from datarush.benchmark.data import SyntheticTableSpec, generate_table
+from datarush.benchmark.end_to_end import EndToEndScenario, run_end_to_end_benchmarks
+from datarush.benchmark.runner import (
+    BenchmarkResult,
+    Regression,
+    benchmark_from_command_line,
+    compare_to_baseline,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "EndToEndScenario",
+    "Regression",
+    "SyntheticTableSpec",
+    "benchmark_from_command_line",
+    "compare_to_baseline",
+    "generate_table",
+    "get_benchmark_case",
+    "load_results",
+    "register_benchmark_case",
+    "run_benchmarks",
+    "run_end_to_end_benchmarks",
+    "save_results",
+]
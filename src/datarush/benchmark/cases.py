@@ -0,0 +1,269 @@
+"""Benchmark cases of the built-in operations."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pandas as pd
+
+from datarush.core.types import ContentType
+from datarush.utils.misc import to_file
+
+TABLE = "data"
+
+
+def _main_table(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    return {TABLE: df}
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """How to benchmark an operation on a synthetic table.
+
+    Attributes:
+        operation: Name of the benchmarked operation.
+        model: Operation parameters, the synthetic table is called `data`.
+        columns: Columns of the synthetic table the case needs.
+        tables: Build the input tables of the operation from the synthetic table.
+        model_extras: Build additional operation parameters from the synthetic table.
+        max_rows: Skip the case at larger scales, for operations that cannot scale,
+            e.g. a transpose producing a column per row.
+    """
+
+    operation: str
+    model: dict[str, Any]
+    columns: tuple[str, ...] = ()
+    tables: Callable[[pd.DataFrame], dict[str, pd.DataFrame]] = field(default=_main_table)
+    model_extras: Callable[[pd.DataFrame], dict[str, Any]] | None = None
+    max_rows: int | None = None
+
+    def build_model(self, df: pd.DataFrame) -> dict[str, Any]:
+        """Get the operation parameters for the synthetic table."""
+        if self.model_extras is None:
+            return self.model
+        return {**self.model, **self.model_extras(df)}
+
+
+# Operations reading from or writing to external services are not benchmarked in-process
+EXTERNAL_OPERATIONS = {
+    "compact_s3_dataset",
+    "read_s3_dataset",
+    "read_s3_object",
+    "read_s3_objects",
+    "send_http_request",
+    "write_s3_dataset",
+    "write_s3_object",
+}
+
+_CASES: dict[str, BenchmarkCase] = {}
+
+
+def register_benchmark_case(case: BenchmarkCase) -> None:
+    """Register a benchmark case, e.g. for a custom operation."""
+    _CASES[case.operation] = case
+
+
+def get_benchmark_case(operation: str) -> BenchmarkCase | None:
+    """Get the benchmark case of an operation or None if it has none."""
+    return _CASES.get(operation)
+
+
+def _with_dimension_table(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    keys = pd.Series(df["int"].unique()).sort_values(ignore_index=True)
+    dimension = pd.DataFrame({"int": keys, "label": "dimension_" + keys.astype(str)})
+    return {TABLE: df, "dimension": dimension}
+
+
+def _wide_table(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    return {TABLE: pd.DataFrame({"id": df["id"], "value1": df["int"], "value2": df["float"]})}
+
+
+def _csv_file_model(df: pd.DataFrame) -> dict[str, Any]:
+    columns = [col for col in ("id", "int", "float", "bool", "string") if col in df.columns]
+    return {"content_type": ContentType.CSV, "file": to_file(df[columns], ContentType.CSV).read()}
+
+
+for _case in [
+    # Source
+    BenchmarkCase(
+        "local_file",
+        {"table_name": TABLE},
+        columns=("int", "float", "bool", "string"),
+        model_extras=_csv_file_model,
+    ),
+    # Transformation
+    BenchmarkCase("add_range_column", {"table": TABLE, "column": "range"}),
+    BenchmarkCase(
+        "assert_has_columns", {"table": TABLE, "columns": ["id", "int"]}, columns=("int",)
+    ),
+    BenchmarkCase("astype", {"table": TABLE, "column": "int", "dtype": "float"}, columns=("int",)),
+    BenchmarkCase(
+        "calculate",
+        {"table": TABLE, "target_column": "result", "expression": "int * 2 + float"},
+        columns=("int", "float"),
+    ),
+    BenchmarkCase(
+        "calculate_hash",
+        {"table": TABLE, "columns": ["id", "string"], "target_column": "hash"},
+        columns=("string",),
+        # Hashes row by row
+        max_rows=1_000_000,
+    ),
+    BenchmarkCase(
+        "change_case", {"table": TABLE, "columns": ["text"], "case": "upper"}, columns=("text",)
+    ),
+    BenchmarkCase(
+        "columns_to_dict",
+        {"table": TABLE, "columns": ["int", "string"], "output_column": "record"},
+        columns=("int", "string"),
+    ),
+    BenchmarkCase(
+        "concatenate_tables",
+        {"tables": [TABLE, "dimension"], "output_table": "concatenated"},
+        columns=("int",),
+        tables=_with_dimension_table,
+    ),
+    BenchmarkCase(
+        "copy_column",
+        {"table": TABLE, "source_column": "string", "target_column": "copy"},
+        columns=("string",),
+    ),
+    BenchmarkCase("copy_table", {"source_table": TABLE, "target_table": "copy"}),
+    BenchmarkCase(
+        "deduplicate_column_values", {"table": TABLE, "column": "list"}, columns=("list",)
+    ),
+    BenchmarkCase(
+        "deduplicate_rows",
+        {"table": TABLE, "columns": ["int", "bool"]},
+        columns=("int", "bool"),
+    ),
+    BenchmarkCase(
+        "derive_column",
+        {"table": TABLE, "target_column": "derived", "template": "{{ string }}-{{ int }}"},
+        columns=("int", "string"),
+        # Renders a template row by row
+        max_rows=1_000_000,
+    ),
+    BenchmarkCase("dict_to_columns", {"table": TABLE, "column": "dict"}, columns=("dict",)),
+    BenchmarkCase("dropna", {"table": TABLE}),
+    BenchmarkCase("explode", {"table": TABLE, "columns": ["list"]}, columns=("list",)),
+    BenchmarkCase(
+        "extract_regex_group",
+        {"table": TABLE, "column": "text", "regex": r"Code-(\d+)", "target_column": "code"},
+        columns=("text",),
+    ),
+    BenchmarkCase(
+        "fillna",
+        {"table": TABLE, "columns": ["float"], "method": "mean"},
+        columns=("float",),
+    ),
+    BenchmarkCase(
+        "filter_rows",
+        {
+            "table": TABLE,
+            "conditions": {
+                "conditions": [
+                    {
+                        "column": "int",
+                        "operator": "is less than",
+                        "value": "500",
+                        "value_type": "integer",
+                    },
+                    {"column": "text", "operator": "matches regex", "value": "Code-00"},
+                ],
+                "combine": "and",
+            },
+        },
+        columns=("int", "text"),
+    ),
+    BenchmarkCase(
+        "groupby",
+        {
+            "table": TABLE,
+            "group_by": ["string"],
+            "aggregation_column": "float",
+            "agg_func": "mean",
+            "output_table": "grouped",
+        },
+        columns=("string", "float"),
+    ),
+    BenchmarkCase(
+        "join",
+        {
+            "left_table": TABLE,
+            "right_table": "dimension",
+            "left_on": "int",
+            "right_on": "int",
+            "join_type": "left",
+            "output_table": "joined",
+        },
+        columns=("int",),
+        tables=_with_dimension_table,
+    ),
+    BenchmarkCase(
+        "melt",
+        {"table": TABLE, "id_vars": ["id"], "value_vars": ["int", "float"]},
+        columns=("int", "float"),
+    ),
+    BenchmarkCase(
+        "normalize_empty_values",
+        {"table": TABLE, "columns": ["string", "text"], "custom_empty_values": ["label_0"]},
+        columns=("string", "text"),
+    ),
+    BenchmarkCase(
+        "parse_datetime",
+        {"table": TABLE, "column": "date_string", "format": "%Y-%m-%d"},
+        columns=("date_string",),
+        # Parses value by value
+        max_rows=1_000_000,
+    ),
+    BenchmarkCase("parse_json_column", {"table": TABLE, "column": "json"}, columns=("json",)),
+    BenchmarkCase(
+        "pivot_table",
+        {
+            "table": TABLE,
+            "index": ["string"],
+            "columns": ["bool"],
+            "values": ["float"],
+            "aggfunc": "sum",
+            "output_table": "pivoted",
+        },
+        columns=("string", "bool", "float"),
+    ),
+    BenchmarkCase(
+        "rename_columns",
+        {"table": TABLE, "column_mapping": {"id": "identifier"}},
+    ),
+    BenchmarkCase("rename_table", {"table": TABLE, "new_name": "renamed"}),
+    BenchmarkCase(
+        "replace",
+        {"table": TABLE, "columns": ["string"], "to_replace": {"label_1": "replaced"}},
+        columns=("string",),
+    ),
+    BenchmarkCase("select_columns", {"table": TABLE, "columns": ["id", "int"]}, columns=("int",)),
+    BenchmarkCase("set_header", {"table": TABLE, "row_index": 0}),
+    BenchmarkCase("sort", {"table": TABLE, "column": "float"}, columns=("float",)),
+    BenchmarkCase(
+        "split_table_on_column",
+        {"table": TABLE, "split_column": "bool"},
+        columns=("bool",),
+    ),
+    BenchmarkCase("strip", {"table": TABLE, "columns": ["text"]}, columns=("text",)),
+    # Produces a column per row
+    BenchmarkCase("transpose", {"table": TABLE}, max_rows=10_000),
+    BenchmarkCase("unset_header", {"tables": [TABLE]}),
+    BenchmarkCase(
+        "wide_to_long",
+        {
+            "table": TABLE,
+            "index_columns": ["id"],
+            "value_column": "value",
+            "variable_column": "variable",
+            "stubs": ["value"],
+        },
+        columns=("int", "float"),
+        tables=_wide_table,
+    ),
+]:
+    register_benchmark_case(_case)
@@ -0,0 +1,133 @@
+"""Synthetic tables for benchmarks."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+ColumnKind = str
+
+ALL_COLUMN_KINDS: tuple[ColumnKind, ...] = (
+    "int",
+    "float",
+    "bool",
+    "string",
+    "category",
+    "datetime",
+    "date_string",
+    "text",
+    "json",
+    "dict",
+    "list",
+)
+
+
+@dataclass(frozen=True)
+class SyntheticTableSpec:
+    """Shape of a synthetic benchmark table.
+
+    Every table has a unique integer `id` column followed by one column per kind in
+    `columns`, named after its kind. Repeated kinds get a numeric suffix, e.g. `int_2`.
+    """
+
+    rows: int = 10_000
+    cardinality: int = 1_000
+    null_fraction: float = 0.05
+    columns: tuple[ColumnKind, ...] = ALL_COLUMN_KINDS
+    seed: int = 0
+
+
+def generate_table(spec: SyntheticTableSpec) -> pd.DataFrame:
+    """Generate a synthetic table.
+
+    Values are drawn from `spec.cardinality` distinct values per column, so the same spec
+    always produces the same table. Nullable kinds (float, string, text) have about
+    `spec.null_fraction` of missing values.
+    """
+    unknown = set(spec.columns) - set(ALL_COLUMN_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown column kinds: {sorted(unknown)}")
+
+    rng = np.random.default_rng(spec.seed)
+    data: dict[str, object] = {"id": np.arange(spec.rows, dtype="int64")}
+
+    for kind in spec.columns:
+        name, suffix = kind, 2
+        while name in data:
+            name, suffix = f"{kind}_{suffix}", suffix + 1
+        data[name] = _COLUMN_GENERATORS[kind](rng, spec)
+
+    return pd.DataFrame(data)
+
+
+def _codes(rng: np.random.Generator, spec: SyntheticTableSpec) -> np.ndarray:
+    return rng.integers(0, spec.cardinality, spec.rows)
+
+
+def _null_mask(rng: np.random.Generator, spec: SyntheticTableSpec) -> np.ndarray:
+    return rng.random(spec.rows) < spec.null_fraction
+
+
+def _take(
+    rng: np.random.Generator, spec: SyntheticTableSpec, make: Callable[[int], object]
+) -> np.ndarray:
+    """Pick values from `cardinality` distinct objects, sharing them between rows."""
+    distinct = np.empty(spec.cardinality, dtype=object)
+    for i in range(spec.cardinality):
+        # Assigned one by one, numpy would turn a list of lists into a 2D array
+        distinct[i] = make(i)
+    values: np.ndarray = distinct[_codes(rng, spec)]
+    return values
+
+
+def _with_nulls(rng: np.random.Generator, spec: SyntheticTableSpec, values: np.ndarray) -> object:
+    values[_null_mask(rng, spec)] = None
+    return values
+
+
+def _float(rng: np.random.Generator, spec: SyntheticTableSpec) -> object:
+    values = rng.normal(100.0, 25.0, spec.rows)
+    values[_null_mask(rng, spec)] = np.nan
+    return values
+
+
+def _category(rng: np.random.Generator, spec: SyntheticTableSpec) -> object:
+    categories = [f"category_{i}" for i in range(spec.cardinality)]
+    return pd.Categorical.from_codes(_codes(rng, spec), categories=categories)
+
+
+def _datetime(rng: np.random.Generator, spec: SyntheticTableSpec) -> object:
+    seconds = rng.integers(0, 365 * 24 * 3600, spec.rows)
+    return pd.Timestamp("2024-01-01") + pd.to_timedelta(seconds, unit="s")
+
+
+def _date_string(rng: np.random.Generator, spec: SyntheticTableSpec) -> object:
+    dates = pd.date_range("2020-01-01", periods=spec.cardinality, freq="D").strftime("%Y-%m-%d")
+    return _take(rng, spec, lambda i: dates[i])
+
+
+_COLUMN_GENERATORS: dict[
+    ColumnKind, Callable[[np.random.Generator, SyntheticTableSpec], object]
+] = {
+    "int": _codes,
+    "float": _float,
+    "bool": lambda rng, spec: rng.random(spec.rows) < 0.5,
+    "string": lambda rng, spec: _with_nulls(rng, spec, _take(rng, spec, lambda i: f"label_{i}")),
+    "category": _category,
+    "datetime": _datetime,
+    "date_string": _date_string,
+    "text": lambda rng, spec: _with_nulls(
+        rng, spec, _take(rng, spec, lambda i: f"  Item {i} Code-{i * 7 % 10_000:04d}  ")
+    ),
+    "json": lambda rng, spec: _take(
+        rng, spec, lambda i: json.dumps({"id": i, "name": f"label_{i}", "score": i / 2})
+    ),
+    "dict": lambda rng, spec: _take(
+        rng, spec, lambda i: {"id": i, "name": f"label_{i}", "score": i / 2}
+    ),
+    "list": lambda rng, spec: _take(rng, spec, lambda i: [i % 5, i % 3, i % 5][: 1 + i % 3]),
+}
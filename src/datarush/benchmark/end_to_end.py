@@ -0,0 +1,317 @@
+"""End-to-end benchmarks of templates reading and writing S3 datasets.
+
+Templates run through `run_template` against a local S3 emulator, so the measured time
+includes loading the template, reading the source dataset, transforming it and writing
+the result, the I/O paths that the operation benchmarks skip.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Iterator, Sequence
+
+import boto3
+import numpy as np
+import pandas as pd
+from envarify import SecretString
+
+from datarush.benchmark.data import SyntheticTableSpec, generate_table
+from datarush.benchmark.runner import BenchmarkResult
+from datarush.config import DatarushConfig, S3Config
+from datarush.core.templates import TemplateDict, get_template_manager
+from datarush.core.types import ContentType
+from datarush.run import run_template, setup
+from datarush.utils.s3_client import DatasetWriteMode, S3Dataset, get_s3_client
+from datarush.version import __version__
+
+LOG = logging.getLogger(__name__)
+
+END_TO_END_SCALES = (10_000, 1_000_000)
+
+# Flat columns every content type can store and read back
+END_TO_END_COLUMN_KINDS = ("int", "float", "bool", "string", "datetime", "text")
+
+BUCKET = "datarush-benchmark"
+_TEMPLATE_VERSION = "v1"
+
+
+@dataclass(frozen=True)
+class EndToEndScenario:
+    """Template writing the transformed source dataset to a target dataset.
+
+    Attributes:
+        name: Name of the scenario.
+        mode: Write mode of the target dataset.
+        unique_ids: Columns deduplicating appended records against the target dataset, or
+            matching upserted records with existing ones.
+        seed_fraction: Share of the source rows already in the target dataset before each
+            run, so that writing with unique IDs has existing records to compare against.
+    """
+
+    name: str
+    mode: DatasetWriteMode
+    unique_ids: tuple[str, ...] = ()
+    seed_fraction: float = 0.0
+
+
+END_TO_END_SCENARIOS = (
+    EndToEndScenario("overwrite", DatasetWriteMode.OVERWRITE),
+    EndToEndScenario(
+        "append_unique", DatasetWriteMode.APPEND, unique_ids=("id",), seed_fraction=0.5
+    ),
+    EndToEndScenario("upsert", DatasetWriteMode.UPSERT, unique_ids=("id",), seed_fraction=0.5),
+)
+
+
+def run_end_to_end_benchmarks(
+    scales: Sequence[int] = END_TO_END_SCALES,
+    spec: SyntheticTableSpec | None = None,
+    content_types: Sequence[ContentType] = tuple(ContentType),
+    scenarios: Sequence[EndToEndScenario] = END_TO_END_SCENARIOS,
+    repeat: int = 3,
+    files: int = 4,
+    config: DatarushConfig | None = None,
+) -> list[BenchmarkResult]:
+    """Time templates moving S3 datasets through `run_template` against a local S3 emulator.
+
+    Every template reads a source dataset, strips, upper-cases and fills some of its columns,
+    then writes it to a target dataset. The target dataset is reset before each run, which
+    is not timed. The fastest of `repeat` runs is reported, results are named
+    `end_to_end:<scenario>:<content type>`.
+
+    Args:
+        scales: Numbers of rows of the source datasets.
+        spec: Shape of the source datasets, its number of rows is replaced by each scale.
+        content_types: Content types of the source and target datasets.
+        scenarios: Templates to run for each content type.
+        repeat: Number of timed runs per scenario, content type and scale.
+        files: Number of objects the source dataset is split into.
+        config: Optional DatarushConfig whose custom operations are registered, its S3
+            configuration is replaced by the emulator.
+
+    Returns:
+        list[BenchmarkResult]: Result of every scenario and content type at every scale.
+    """
+    spec = spec or SyntheticTableSpec(columns=END_TO_END_COLUMN_KINDS)
+
+    results = []
+    with local_s3() as s3_config, _s3_template_store():
+        benchmark_config = DatarushConfig(
+            custom_operations=config.custom_operations if config else None,
+            s3_config_factory=lambda: s3_config,
+        )
+        setup(benchmark_config)
+
+        for rows in scales:
+            LOG.info(f"Generating synthetic table with {rows:,} rows")
+            df = generate_table(replace(spec, rows=rows))
+
+            for content_type in content_types:
+                source = _seed_dataset(s3_config, df, content_type, files)
+                for scenario in scenarios:
+                    result = _run_scenario(
+                        benchmark_config, s3_config, scenario, content_type, source, df, repeat
+                    )
+                    timing = f" in {result.seconds:.4f}s" if result.seconds is not None else ""
+                    note = f" ({result.note})" if result.note else ""
+                    LOG.info(f"{result.operation} @ {rows:,} rows: {result.status}{timing}{note}")
+                    results.append(result)
+
+    return results
+
+
+@contextmanager
+def local_s3() -> Iterator[S3Config]:
+    """Run a local S3 emulator with an empty benchmark bucket for the duration of the context.
+
+    The emulator is moto's server, which is an optional dependency of the benchmarks.
+
+    Yields:
+        S3Config: Configuration of an S3 client talking to the emulator.
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError as e:
+        raise ImportError(
+            "End-to-end benchmarks need the moto server, "
+            "install it with `pip install datarush[benchmark]`"
+        ) from e
+
+    # The emulator logs every request
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        config = S3Config(
+            endpoint=f"http://{host}:{port}",
+            access_key="benchmark",
+            secret_key=SecretString("benchmark"),
+            region_name="us-east-1",
+        )
+        boto3.client(
+            "s3",
+            endpoint_url=config.endpoint,
+            aws_access_key_id=config.access_key,
+            aws_secret_access_key=config.secret_key.reveal(),
+            region_name=config.region_name,
+        ).create_bucket(Bucket=BUCKET)
+        yield config
+    finally:
+        server.stop()
+
+
+@contextmanager
+def _s3_template_store() -> Iterator[None]:
+    """Store templates in the benchmark bucket instead of the configured template store."""
+    environ = {
+        "TEMPLATE_STORE_TYPE": "S3",
+        "TEMPLATE_STORE_S3_BUCKET": BUCKET,
+        "TEMPLATE_STORE_S3_PREFIX": "templates",
+    }
+    previous = {key: os.environ.get(key) for key in environ}
+    os.environ.update(environ)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _dataset(
+    s3_config: S3Config,
+    path: str,
+    content_type: ContentType,
+    mode: DatasetWriteMode = DatasetWriteMode.OVERWRITE,
+) -> S3Dataset:
+    return S3Dataset(
+        bucket=BUCKET,
+        prefix=path,
+        content_type=content_type,
+        write_mode=mode,
+        config=s3_config,
+    )
+
+
+def _seed_dataset(
+    s3_config: S3Config, df: pd.DataFrame, content_type: ContentType, files: int
+) -> str:
+    """Write the source dataset split into `files` objects and get its path."""
+    path = f"source/{len(df)}/{content_type.value.lower()}"
+    for i, chunk in enumerate(np.array_split(np.arange(len(df)), max(files, 1))):
+        mode = DatasetWriteMode.OVERWRITE if i == 0 else DatasetWriteMode.APPEND
+        _dataset(s3_config, path, content_type, mode=mode).write(df.iloc[chunk])
+    return path
+
+
+def _run_scenario(
+    config: DatarushConfig,
+    s3_config: S3Config,
+    scenario: EndToEndScenario,
+    content_type: ContentType,
+    source: str,
+    df: pd.DataFrame,
+    repeat: int,
+) -> BenchmarkResult:
+    """Time a scenario with one content type."""
+    name = f"end_to_end:{scenario.name}:{content_type.value.lower()}"
+    rows = len(df)
+    target = f"target/{rows}/{scenario.name}/{content_type.value.lower()}"
+    template_name = f"benchmark_{scenario.name}_{content_type.value.lower()}_{rows}"
+
+    try:
+        get_template_manager().write_template(
+            _template(scenario, content_type, source, target, list(df.columns)),
+            template_name,
+            _TEMPLATE_VERSION,
+        )
+
+        timings = []
+        for _ in range(repeat):
+            _reset_target(s3_config, scenario, content_type, target, df)
+            start_time = time.perf_counter()
+            run_template(template_name, _TEMPLATE_VERSION, config=config)
+            timings.append(time.perf_counter() - start_time)
+    except Exception as e:
+        LOG.exception(f"End-to-end benchmark {name} failed")
+        return BenchmarkResult(name, rows, "failed", note=f"{type(e).__name__}: {e}")
+
+    seconds = min(timings)
+    return BenchmarkResult(
+        operation=name,
+        rows=rows,
+        status="ok",
+        seconds=seconds,
+        rows_per_second=rows / seconds if seconds > 0 else None,
+    )
+
+
+def _reset_target(
+    s3_config: S3Config,
+    scenario: EndToEndScenario,
+    content_type: ContentType,
+    target: str,
+    df: pd.DataFrame,
+) -> None:
+    """Delete the target dataset, then seed it with the records existing before a run."""
+    s3 = get_s3_client(s3_config)
+    for obj in s3.list_objects(BUCKET, target):
+        s3.delete_object(BUCKET, obj["Key"])
+
+    seed_rows = int(len(df) * scenario.seed_fraction)
+    if seed_rows:
+        _dataset(s3_config, target, content_type).write(df.iloc[:seed_rows])
+
+
+def _template(
+    scenario: EndToEndScenario,
+    content_type: ContentType,
+    source: str,
+    target: str,
+    columns: list[str],
+) -> TemplateDict:
+    """Build the template of a scenario, its transformations keep the source columns."""
+    transformations: list[dict[str, Any]] = [
+        {"name": "strip", "data": {"table": "data", "columns": ["text"]}},
+        {"name": "change_case", "data": {"table": "data", "columns": ["string"], "case": "upper"}},
+        {"name": "fillna", "data": {"table": "data", "columns": ["float"], "method": "mean"}},
+    ]
+    operations: list[dict[str, Any]] = [
+        {
+            "name": "read_s3_dataset",
+            "data": {
+                "bucket": BUCKET,
+                "path": source,
+                "content_type": content_type.value,
+                "table_name": "data",
+            },
+        },
+        *(
+            transformation
+            for transformation in transformations
+            if set(transformation["data"]["columns"]) <= set(columns)
+        ),
+        {
+            "name": "write_s3_dataset",
+            "data": {
+                "bucket": BUCKET,
+                "path": target,
+                "content_type": content_type.value,
+                "mode": scenario.mode.value,
+                "table": "data",
+                **({"unique_ids": list(scenario.unique_ids)} if scenario.unique_ids else {}),
+            },
+        },
+    ]
+    return {
+        "parameters": [],
+        "operations": [{**operation, "advanced_mode": False} for operation in operations],
+        "datarush_version": __version__,
+    }
@@ -0,0 +1,390 @@
+"""Benchmark runner for registered operations."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+import pandas as pd
+
+from datarush.benchmark.cases import EXTERNAL_OPERATIONS, BenchmarkCase, get_benchmark_case
+from datarush.benchmark.data import ALL_COLUMN_KINDS, SyntheticTableSpec, generate_table
+from datarush.config import DatarushConfig
+from datarush.core.dataflow import Operation, Table, Tableset
+from datarush.core.operations import list_operation_types
+from datarush.core.types import ContentType
+from datarush.run import setup
+from datarush.utils.logging import setup_logging
+from datarush.version import __version__
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_SCALES = (10_000, 1_000_000, 10_000_000)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory of an operation at one scale.
+
+    Attributes:
+        operation: Name of the operation or of the end-to-end scenario.
+        rows: Number of rows of the synthetic table.
+        status: `ok`, `skipped` or `failed`.
+        seconds: Fastest wall time of the repeats.
+        rows_per_second: Rows of the synthetic table processed per second.
+        peak_memory_bytes: Peak memory allocated while the operation ran.
+        note: Reason for skipped or failed results.
+    """
+
+    operation: str
+    rows: int
+    status: str
+    seconds: float | None = None
+    rows_per_second: float | None = None
+    peak_memory_bytes: int | None = None
+    note: str | None = None
+
+
+@dataclass
+class Regression:
+    """Metric of an operation that got worse than in the baseline."""
+
+    operation: str
+    rows: int
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Get the current value relative to the baseline."""
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def summary(self) -> str:
+        """Provide a summary of the regression."""
+        return (
+            f"{self.operation} @ {self.rows:,} rows: {self.metric} "
+            f"{self.baseline:.4g} -> {self.current:.4g} ({self.ratio:.2f}x)"
+        )
+
+
+def run_benchmarks(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    spec: SyntheticTableSpec | None = None,
+    operations: Iterable[str] | None = None,
+    repeat: int = 3,
+    measure_memory: bool = True,
+) -> list[BenchmarkResult]:
+    """Time registered operations on synthetic tables of several sizes.
+
+    Every operation runs on its own copy of the input tables, copying is not timed.
+    The fastest of `repeat` runs is reported. Peak memory is measured in one more run
+    with tracemalloc, which slows the operation down and is therefore not timed.
+
+    Args:
+        scales: Numbers of rows of the synthetic tables.
+        spec: Shape of the synthetic tables, its number of rows is replaced by each scale.
+        operations: Names of the operations to benchmark, all registered ones if None.
+        repeat: Number of timed runs per operation and scale.
+        measure_memory: Whether to measure peak memory.
+
+    Returns:
+        list[BenchmarkResult]: Result of every operation at every scale.
+    """
+    spec = spec or SyntheticTableSpec()
+    selected = set(operations) if operations is not None else None
+    operation_types = [
+        op_type
+        for op_type in list_operation_types()
+        if selected is None or op_type.name in selected
+    ]
+
+    results = []
+    for rows in scales:
+        LOG.info(f"Generating synthetic table with {rows:,} rows")
+        df = generate_table(replace(spec, rows=rows))
+
+        for operation_type in operation_types:
+            result = _run_case(operation_type, df, repeat, measure_memory)
+            timing = f" in {result.seconds:.4f}s" if result.seconds is not None else ""
+            note = f" ({result.note})" if result.note else ""
+            LOG.info(f"{result.operation} @ {rows:,} rows: {result.status}{timing}{note}")
+            results.append(result)
+
+    return results
+
+
+def _run_case(
+    operation_type: type[Operation], df: pd.DataFrame, repeat: int, measure_memory: bool
+) -> BenchmarkResult:
+    """Benchmark one operation on a synthetic table."""
+    name = str(operation_type.name)
+    rows = len(df)
+    case = get_benchmark_case(name)
+
+    skip_reason = _skip_reason(name, case, df)
+    if case is None or skip_reason:
+        return BenchmarkResult(name, rows, "skipped", note=skip_reason)
+
+    try:
+        tables = case.tables(df)
+        operation = operation_type(model_dict=case.build_model(df))
+        operation.update_template_context({"parameters": {}})
+
+        timings = []
+        for _ in range(repeat):
+            tableset = _copy_tables(tables)
+            start_time = time.perf_counter()
+            operation.operate(tableset)
+            timings.append(time.perf_counter() - start_time)
+
+        peak_memory = _measure_peak_memory(operation, tables) if measure_memory else None
+    except Exception as e:
+        LOG.exception(f"Benchmark of {name} failed")
+        return BenchmarkResult(name, rows, "failed", note=f"{type(e).__name__}: {e}")
+
+    seconds = min(timings)
+    return BenchmarkResult(
+        operation=name,
+        rows=rows,
+        status="ok",
+        seconds=seconds,
+        rows_per_second=rows / seconds if seconds > 0 else None,
+        peak_memory_bytes=peak_memory,
+    )
+
+
+def _skip_reason(name: str, case: BenchmarkCase | None, df: pd.DataFrame) -> str | None:
+    if name in EXTERNAL_OPERATIONS:
+        return "requires an external service"
+    if case is None:
+        return "no benchmark case"
+    missing = [column for column in case.columns if column not in df.columns]
+    if missing:
+        return f"synthetic table has no columns {missing}"
+    if case.max_rows is not None and len(df) > case.max_rows:
+        return f"limited to {case.max_rows:,} rows"
+    return None
+
+
+def _copy_tables(tables: dict[str, pd.DataFrame]) -> Tableset:
+    return Tableset(Table(name, df.copy()) for name, df in tables.items())
+
+
+def _measure_peak_memory(operation: Operation, tables: dict[str, pd.DataFrame]) -> int:
+    tableset = _copy_tables(tables)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        operation.operate(tableset)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def compare_to_baseline(
+    results: Iterable[BenchmarkResult],
+    baseline: Iterable[BenchmarkResult],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.005,
+) -> list[Regression]:
+    """Find operations that got slower, use more memory or fail compared to a baseline.
+
+    Args:
+        results: Current results.
+        baseline: Results to compare against, matched by operation and number of rows.
+        tolerance: Allowed relative increase of time and memory, e.g. 0.25 for 25%.
+        min_seconds: Timings below this in the baseline are too noisy to compare.
+
+    Returns:
+        list[Regression]: Metrics that got worse by more than the tolerance.
+    """
+    baseline_map = {(result.operation, result.rows): result for result in baseline}
+
+    regressions = []
+    for result in results:
+        base = baseline_map.get((result.operation, result.rows))
+        if base is None or base.status != "ok":
+            continue
+
+        if result.status == "failed":
+            regressions.append(Regression(result.operation, result.rows, "failed", 0.0, 1.0))
+            continue
+
+        if result.seconds is not None and base.seconds is not None:
+            slower = result.seconds > base.seconds * (1 + tolerance)
+            if slower and base.seconds >= min_seconds:
+                regressions.append(
+                    Regression(
+                        result.operation, result.rows, "seconds", base.seconds, result.seconds
+                    )
+                )
+
+        if result.peak_memory_bytes is not None and base.peak_memory_bytes:
+            if result.peak_memory_bytes > base.peak_memory_bytes * (1 + tolerance):
+                regressions.append(
+                    Regression(
+                        result.operation,
+                        result.rows,
+                        "peak_memory_bytes",
+                        base.peak_memory_bytes,
+                        result.peak_memory_bytes,
+                    )
+                )
+
+    return regressions
+
+
+def save_results(results: Iterable[BenchmarkResult], path: str) -> None:
+    """Save benchmark results to a JSON file, e.g. to use them as a baseline."""
+    content = {
+        "datarush_version": __version__,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(content, f, indent=2)
+
+
+def load_results(path: str) -> list[BenchmarkResult]:
+    """Load benchmark results saved with `save_results`."""
+    with open(path, "r") as f:
+        content = json.load(f)
+    return [BenchmarkResult(**result) for result in content["results"]]
+
+
+def results_to_dataframe(results: Iterable[BenchmarkResult]) -> pd.DataFrame:
+    """Convert benchmark results to a table with one row per operation and scale."""
+    return pd.DataFrame([asdict(result) for result in results])
+
+
+def benchmark_from_command_line(config: DatarushConfig | None = None) -> None:
+    """Run benchmarks using command-line arguments.
+
+    Args:
+        config: Optional DatarushConfig to use, its custom operations are benchmarked too
+            when they have a registered benchmark case.
+    """
+    if not logging.getLogger().handlers:
+        setup_logging(level="INFO")
+
+    argparser = argparse.ArgumentParser(description="Datarush Operation Benchmarks")
+    argparser.add_argument(
+        "--rows",
+        type=lambda value: int(float(value)),
+        nargs="+",
+        default=None,
+        help="Numbers of rows of the synthetic tables, e.g. 1e4 1e6",
+    )
+    argparser.add_argument(
+        "--end-to-end",
+        action="store_true",
+        help="Run templates reading and writing S3 datasets against a local S3 emulator "
+        "instead of benchmarking single operations",
+    )
+    argparser.add_argument(
+        "--content-types",
+        nargs="+",
+        default=list(ContentType),
+        choices=list(ContentType),
+        type=ContentType,
+        help="Content types of the end-to-end datasets",
+    )
+    argparser.add_argument(
+        "--files", type=int, default=4, help="Objects per end-to-end source dataset"
+    )
+    argparser.add_argument(
+        "--operations", nargs="+", default=None, help="Operations to benchmark (default: all)"
+    )
+    argparser.add_argument(
+        "--columns",
+        nargs="+",
+        default=None,
+        choices=ALL_COLUMN_KINDS,
+        help="Column kinds of the synthetic tables (default: all, flat ones for --end-to-end)",
+    )
+    argparser.add_argument(
+        "--cardinality", type=int, default=1_000, help="Distinct values per column"
+    )
+    argparser.add_argument(
+        "--null-fraction", type=float, default=0.05, help="Fraction of missing values"
+    )
+    argparser.add_argument("--seed", type=int, default=0, help="Random seed")
+    argparser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    argparser.add_argument("--no-memory", action="store_true", help="Skip peak memory runs")
+    argparser.add_argument("--output", type=str, default=None, help="JSON file to save to")
+    argparser.add_argument(
+        "--baseline", type=str, default=None, help="JSON file with results to compare against"
+    )
+    argparser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative increase of time and memory over the baseline",
+    )
+    args, _ = argparser.parse_known_args()
+
+    setup(config)
+
+    if args.end_to_end:
+        # Imported here, the end-to-end benchmarks build on the results of this module
+        from datarush.benchmark.end_to_end import (
+            END_TO_END_COLUMN_KINDS,
+            END_TO_END_SCALES,
+            run_end_to_end_benchmarks,
+        )
+
+        spec = SyntheticTableSpec(
+            cardinality=args.cardinality,
+            null_fraction=args.null_fraction,
+            columns=tuple(args.columns or END_TO_END_COLUMN_KINDS),
+            seed=args.seed,
+        )
+        results = run_end_to_end_benchmarks(
+            scales=args.rows or END_TO_END_SCALES,
+            spec=spec,
+            content_types=args.content_types,
+            repeat=args.repeat,
+            files=args.files,
+            config=config,
+        )
+    else:
+        spec = SyntheticTableSpec(
+            cardinality=args.cardinality,
+            null_fraction=args.null_fraction,
+            columns=tuple(args.columns or ALL_COLUMN_KINDS),
+            seed=args.seed,
+        )
+        results = run_benchmarks(
+            scales=args.rows or DEFAULT_SCALES,
+            spec=spec,
+            operations=args.operations,
+            repeat=args.repeat,
+            measure_memory=not args.no_memory,
+        )
+
+    print(results_to_dataframe(results).to_string(index=False))
+
+    if args.output:
+        save_results(results, args.output)
+        LOG.info(f"Benchmark results saved to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(
+            results, load_results(args.baseline), tolerance=args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION: {regression.summary()}")
+        if regressions:
+            sys.exit(1)
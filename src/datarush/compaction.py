@@ -0,0 +1,90 @@
+"""Compaction of S3 datasets from the command line."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from datarush.config import DatarushConfig, get_datarush_config
+from datarush.core.plan import format_bytes
+from datarush.core.types import Compression, ContentType
+from datarush.run import setup
+from datarush.utils.logging import setup_logging
+from datarush.utils.s3_client import S3Dataset
+
+LOG = logging.getLogger(__name__)
+
+
+def compact_from_command_line(config: DatarushConfig | None = None) -> None:
+    """Compact the partitions of an S3 dataset using command-line arguments.
+
+    Args:
+        config: Optional DatarushConfig to use. If not provided, the default configuration is loaded from environment variables.
+    """
+    if not logging.getLogger().handlers:
+        setup_logging(level="INFO")
+
+    argparser = argparse.ArgumentParser(description="Datarush S3 Dataset Compaction")
+    argparser.add_argument("--bucket", type=str, required=True, help="Bucket of the dataset")
+    argparser.add_argument("--path", type=str, required=True, help="Path of the dataset")
+    argparser.add_argument(
+        "--content-type",
+        type=ContentType,
+        choices=list(ContentType),
+        required=True,
+        help="Content type of the dataset objects",
+    )
+    argparser.add_argument(
+        "--min-files",
+        type=int,
+        default=10,
+        help="Compact partitions with more objects than this",
+    )
+    argparser.add_argument(
+        "--target-size-mb",
+        type=int,
+        default=128,
+        help="Size of the compacted objects in MB",
+    )
+    argparser.add_argument(
+        "--sort-by",
+        type=str,
+        nargs="+",
+        default=[],
+        help="Columns to sort the records of each partition by",
+    )
+    argparser.add_argument(
+        "--workers", type=int, default=4, help="Number of partitions compacted at the same time"
+    )
+    argparser.add_argument(
+        "--compression",
+        type=Compression,
+        choices=list(Compression),
+        default=Compression.NONE,
+        help="Compression of the compacted CSV, JSON and JSONL objects",
+    )
+    args, _ = argparser.parse_known_args()
+
+    setup(config)
+
+    dataset = S3Dataset(
+        bucket=args.bucket,
+        prefix=args.path,
+        content_type=args.content_type,
+        config=get_datarush_config().s3,
+        compression=args.compression,
+    )
+    compactions = dataset.compact(
+        min_files=args.min_files,
+        target_file_size=args.target_size_mb * 1024**2,
+        sort_by=args.sort_by,
+        max_workers=args.workers,
+    )
+
+    for compaction in compactions:
+        print(
+            f"{compaction.folder or '.'}: {compaction.files_before} -> "
+            f"{compaction.files_after} objects, {format_bytes(compaction.bytes_before)} -> "
+            f"{format_bytes(compaction.bytes_after)}"
+        )
+    print(f"Compacted {len(compactions)} partitions")
@@ -97,6 +97,8 @@ class TemplateStoreConfig(BaseConfig):
     """Template Manager Configuration."""
 
     store_type: TemplateStoreType = EnvVar("TEMPLATE_STORE_TYPE")
+    list_cache_ttl: float = EnvVar("TEMPLATE_STORE_LIST_CACHE_TTL", default=30.0)
+    catalog_check_interval: float = EnvVar("TEMPLATE_STORE_CATALOG_CHECK_INTERVAL", default=300.0)
 
     @property
     def s3(self) -> S3TemplateStoreConfig:
@@ -113,6 +115,51 @@ class TemplateStoreConfig(BaseConfig):
         return FilesystemTemplateStoreConfig.fromenv()
 
 
+################################
+###### STATE STORE CONFIG ######
+################################
+
+
+class StateStoreType(StrEnum):
+    """State Store Type."""
+
+    S3 = "S3"
+    FILESYSTEM = "FILESYSTEM"
+
+
+class S3StateStoreConfig(BaseConfig):
+    """S3 based state store config."""
+
+    bucket: str = EnvVar("STATE_STORE_S3_BUCKET")
+    prefix: str = EnvVar("STATE_STORE_S3_PREFIX", default="datarush")
+
+
+class FilesystemStateStoreConfig(BaseConfig):
+    """File system based state store config."""
+
+    path: str = EnvVar("STATE_STORE_FILESYSTEM_PATH", default=".")
+
+
+class StateStoreConfig(BaseConfig):
+    """State store configuration, where operations keep state between runs."""
+
+    store_type: StateStoreType = EnvVar("STATE_STORE_TYPE", default=StateStoreType.FILESYSTEM)
+
+    @property
+    def s3(self) -> S3StateStoreConfig:
+        """S3 state store config."""
+        if self.store_type != StateStoreType.S3:
+            raise ValueError("State store type is not S3")
+        return S3StateStoreConfig.fromenv()
+
+    @property
+    def filesystem(self) -> FilesystemStateStoreConfig:
+        """File system state store config."""
+        if self.store_type != StateStoreType.FILESYSTEM:
+            raise ValueError("State store type is not FILESYSTEM")
+        return FilesystemStateStoreConfig.fromenv()
+
+
 ################################
 ###### APPLICATION CONFIG ######
 ################################
@@ -157,6 +204,11 @@ class DatarushConfig:
         """Get template store configuration."""
         return TemplateStoreConfig.fromenv()
 
+    @cached_property
+    def state_store(self) -> StateStoreConfig:
+        """Get state store configuration."""
+        return StateStoreConfig.fromenv()
+
     @cached_property
     def logging(self) -> LoggingConfig:
         """Get logging configuration."""
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import contextvars
 import hashlib
 import json
 import logging
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from typing import Any, Iterable, Iterator, Type, get_type_hints
 
 import pandas as pd
+from pydantic import BaseModel
 
-from datarush.core.types import BaseOperationModel, ParameterSpec
+from datarush.core.plan import DataflowPlan, TableLiveness, analyze_liveness, explain_operations
+from datarush.core.types import BaseOperationModel, OutputTableStr, ParameterSpec, TableStr
 from datarush.exceptions import UnknownTableError
 from datarush.utils.jinja2 import model_validate_jinja2
 from datarush.utils.logging import OperationLogger
+from datarush.utils.profiling import OperationProfile, RunProfile, RunProfiler
+from datarush.utils.type_utils import types_are_equal
 
 LOG = logging.getLogger(__name__)
 
@@ -85,6 +93,18 @@ class Operation[T: BaseOperationModel](ABC):
 
     is_enabled: bool = True
     advanced_mode: bool = False
+    # Rows are processed independently, so the operation could run on chunks of a table
+    chunk_safe: bool = False
+    # The operation only drops rows, so reading less data upstream could replace it
+    filters_rows: bool = False
+    # The operation creates tables whose names depend on the data
+    creates_dynamic_tables: bool = False
+    # The operation affects something outside the dataflow, so it runs even if no later
+    # operation reads its output tables. Inferred by `may_have_side_effects` if None
+    has_side_effects: bool | None = None
+    # The operation only reads data from outside the dataflow into its output tables and
+    # never reads the tableset, so a run may start it ahead of its turn
+    prefetchable: bool = False
 
     def __init__(self, model_dict: dict[str, Any], advanced_mode: bool = False) -> None:
         """Initialize operation with model dictionary and mode."""
@@ -121,6 +141,56 @@ class Operation[T: BaseOperationModel](ABC):
         """Update the template context for Jinja2 rendering."""
         self._template_context = context
 
+    def input_tables(self) -> list[str]:
+        """Get names of the tables the operation reads, resolved from its parameters."""
+        return _table_field_values(self.model, TableStr)
+
+    def output_tables(self) -> list[str]:
+        """Get names of the tables the operation creates or modifies.
+
+        These are the tables named in `OutputTableStr` fields. Operations without such
+        fields modify their input tables in place.
+        """
+        if any(
+            _is_table_field(field.annotation, OutputTableStr)
+            for field in self.schema().model_fields.values()
+        ):
+            return _table_field_values(self.model, OutputTableStr)
+        return self.input_tables()
+
+    def dropped_tables(self) -> list[str]:
+        """Get names of the tables the operation removes."""
+        return []
+
+    def may_have_side_effects(self) -> bool:
+        """Check whether the operation may affect something outside the dataflow.
+
+        Unless `has_side_effects` is set, operations without `OutputTableStr` fields are
+        assumed to have side effects, since they may be sinks writing their input tables out.
+        """
+        if self.has_side_effects is not None:
+            return self.has_side_effects
+        return not any(
+            _is_table_field(field.annotation, OutputTableStr)
+            for field in self.schema().model_fields.values()
+        )
+
+    def reads_full_source(self) -> bool:
+        """Check whether the operation reads a whole source without filtering it."""
+        return False
+
+    def estimate_read_bytes(self) -> int | None:
+        """Estimate bytes the operation reads from outside the dataflow, None if unknown."""
+        return None
+
+    def commit(self) -> None:
+        """Persist the state the operation keeps between runs, once a whole run succeeded.
+
+        Operations remembering what they processed, like incremental reads, prepare their
+        new state in `operate` and store it here, so that a failed run is processed again.
+        """
+        pass
+
     def input_hash(self) -> str:
         key_data = {
             "class": self.__class__.__name__,
@@ -172,6 +242,7 @@ class Dataflow:
         self._parameters = parameters or []
         self._parameters_values: dict[str, Any] = {}
         self._operations = operations or []
+        self._profile: RunProfile | None = None
 
     @property
     def current_tableset(self) -> Tableset:
@@ -188,6 +259,11 @@ class Dataflow:
         """Get operations."""
         return self._operations
 
+    @property
+    def profile(self) -> RunProfile | None:
+        """Get the profile of the last run or None if it was not profiled."""
+        return self._profile
+
     def set_parameter_value(self, name: str, value: Any) -> None:
         """Set parameter value."""
         if name not in [p.name for p in self.parameters]:
@@ -203,26 +279,256 @@ class Dataflow:
         """Get the current context for the dataflow."""
         return {"parameters": self._parameters_values}
 
-    def run(self) -> None:
-        """Run dataflow by executing all enabled operations."""
-        self._current_tableset = Tableset([])
-        LOG.debug("Initialized empty tableset")
+    def explain(self, estimate: bool = True) -> DataflowPlan:
+        """Describe what running the dataflow would do without running it.
 
+        Tables each operation reads and writes are resolved from the operation parameters,
+        using the current parameter values.
+
+        Args:
+            estimate: Whether to estimate the data read by sources from their storage,
+                e.g. by listing S3 objects.
+
+        Returns:
+            DataflowPlan: Table dependencies, stages, estimated data volumes and warnings.
+        """
+        context = self.get_current_context()
+        for operation in self.operations:
+            operation.update_template_context(context)
+        return explain_operations(
+            self.operations, cache_hits=self._cache_hits(), estimate=estimate
+        )
+
+    def _analyze_liveness(self, keep_tables: Iterable[str]) -> TableLiveness | None:
+        """Analyze table liveness of a run, None if the tables of an operation are unknown."""
+        context = self.get_current_context()
+        for operation in self.operations:
+            operation.update_template_context(context)
+        try:
+            return analyze_liveness(self.operations, keep_tables)
+        except Exception as e:
+            LOG.warning(f"Keeping all tables, cannot resolve tables of operations: {e}")
+            return None
+
+    def _release_tables(self, live: set[str]) -> None:
+        """Drop the tables of the current tableset that are not live."""
+        for name in list(self._current_tableset):
+            if name not in live:
+                LOG.debug(f"Releasing table '{name}', no later operation reads it")
+                del self._current_tableset[name]
+
+    def _cache_hits(self) -> set[int]:
+        """Get indices of operations whose results a run would take from a cache."""
+        return set()
+
+    def _prefetch_candidates(self, liveness: TableLiveness | None) -> list[int]:
+        """Get indices of the sources a run can read ahead of their turn.
+
+        Sources after an operation that may write outside the dataflow, e.g. a sink writing
+        the objects a later source reads, wait for their turn.
+        """
+        indices = []
         for i, operation in enumerate(self.operations, 1):
-            if not operation.is_enabled:
-                LOG.debug(
-                    f"Skipping disabled operation {i}/{len(self.operations)}: {operation.title}"
-                )
+            if not operation.is_enabled or (liveness is not None and i in liveness.unused):
                 continue
+            if operation.prefetchable:
+                indices.append(i)
+            elif _writes_outside_dataflow(operation):
+                break
+        return indices
+
+    def _start_prefetch(
+        self, executor: ThreadPoolExecutor, workers: int, liveness: TableLiveness | None
+    ) -> _SourcePrefetch:
+        """Start reading sources ahead of their turn, in the order of the operations."""
+        context = self.get_current_context()
+        for operation in self.operations:
+            operation.update_template_context(context)
+        return _SourcePrefetch(
+            executor, self.operations, self._prefetch_candidates(liveness), workers
+        )
+
+    def run(
+        self,
+        profile: bool = False,
+        release_tables: bool = False,
+        keep_tables: Iterable[str] = (),
+        prefetch_workers: int = 0,
+    ) -> None:
+        """Run dataflow by executing all enabled operations.
+
+        Args:
+            profile: Whether to record time, memory and table sizes of each operation,
+                available afterwards as `profile`.
+            release_tables: Whether to drop tables as soon as no later operation reads them
+                and to skip operations whose output tables are never read, to lower peak
+                memory. Tables are only known from `TableStr` and `OutputTableStr` fields of
+                the operations, the tableset left after the run only has `keep_tables`.
+            keep_tables: Tables never dropped when releasing tables.
+            prefetch_workers: Number of sources read ahead of their turn, so that the run
+                waits for about the slowest source instead of all of them. At most this many
+                sources are read or held in memory until their turn at the same time.
+                Sources after an operation that may write outside the dataflow are not read
+                ahead. No source is read ahead if 0 or when profiling, since the time of a
+                source would then overlap other operations.
+
+        Operations commit their state, e.g. watermarks of incremental reads, after all
+        operations succeeded.
+        """
+        self._current_tableset = Tableset([])
+        LOG.debug("Initialized empty tableset")
 
-            LOG.info(f"Executing operation {i}/{len(self.operations)}: {operation.title}")
+        profiler = RunProfiler(lambda: self._current_tableset) if profile else None
+        self._profile = None
 
-            context = self.get_current_context()
-            operation.update_template_context(context)
+        liveness = self._analyze_liveness(keep_tables) if release_tables else None
+        executed: list[Operation] = []
+
+        executor = (
+            ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="prefetch")
+            if prefetch_workers > 0 and profiler is None
+            else None
+        )
+
+        try:
+            prefetch = (
+                self._start_prefetch(executor, prefetch_workers, liveness)
+                if executor is not None
+                else None
+            )
+
+            for i, operation in enumerate(self.operations, 1):
+                if not operation.is_enabled:
+                    LOG.debug(
+                        f"Skipping disabled operation {i}/{len(self.operations)}: {operation.title}"
+                    )
+                    continue
+
+                if liveness is not None and i in liveness.unused:
+                    LOG.info(
+                        f"Skipping operation {i}/{len(self.operations)}: {operation.title}, "
+                        "no later operation reads its output tables"
+                    )
+                    continue
+
+                LOG.info(f"Executing operation {i}/{len(self.operations)}: {operation.title}")
+
+                context = self.get_current_context()
+                operation.update_template_context(context)
+
+                with (
+                    OperationLogger(operation.name, operation.title, LOG),
+                    _profile_operation(profiler, i, operation),
+                ):
+                    tables = prefetch.take(i) if prefetch is not None else None
+                    if tables is not None:
+                        for name in tables:
+                            self._current_tableset[name] = tables[name]
+                    else:
+                        self._current_tableset = operation.operate(self._current_tableset)
+                executed.append(operation)
+
+                if liveness is not None:
+                    self._release_tables(liveness.live_after[i])
+
+                # Log tableset state after operation
+                table_names = list(self._current_tableset)
+                LOG.debug(f"Tableset after operation {i}: {table_names}")
+
+            for operation in executed:
+                operation.commit()
+        finally:
+            if executor is not None:
+                # Sources still waiting are not started after a failure
+                executor.shutdown(cancel_futures=True)
+            if profiler is not None:
+                self._profile = profiler.finish()
+
+
+class _SourcePrefetch:
+    """Sources of a run read ahead of their turn, a few at a time.
+
+    Tables read ahead are held in memory until their turn, so the next source is only
+    submitted once the run takes the table of a previous one.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        operations: list[Operation],
+        candidates: list[int],
+        window: int,
+    ) -> None:
+        """Submit the first sources.
+
+        Args:
+            executor: Executor reading the sources.
+            operations: Operations of the run.
+            candidates: Indices of the sources that can be read ahead, in order.
+            window: Number of sources being read or waiting for their turn at most.
+        """
+        self._executor = executor
+        self._operations = operations
+        self._pending = deque(candidates)
+        self._window = window
+        self._futures: dict[int, Future[Tableset]] = {}
+        self._fill()
+
+    def take(self, index: int) -> Tableset | None:
+        """Wait for the tables of a source, None if it was not read ahead."""
+        future = self._futures.pop(index, None)
+        if future is None:
+            if index in self._pending:
+                self._pending.remove(index)
+            return None
+        tables = future.result()
+        self._fill()
+        return tables
+
+    def _fill(self) -> None:
+        while self._pending and len(self._futures) < self._window:
+            index = self._pending.popleft()
+            operation = self._operations[index - 1]
+            LOG.info(f"Prefetching operation {index}/{len(self._operations)}: {operation.title}")
+            # Sources take their configuration, e.g. the S3 client, from the calling context,
+            # which worker threads do not inherit
+            self._futures[index] = self._executor.submit(
+                contextvars.copy_context().run, operation.operate, Tableset([])
+            )
+
+
+def _writes_outside_dataflow(operation: Operation) -> bool:
+    """Check whether an operation may write outside the dataflow.
+
+    Operations that may have side effects, like sinks without `OutputTableStr` fields, are
+    assumed to write somewhere else, as are operations without output tables and operations
+    whose tables cannot be resolved.
+    """
+    if operation.may_have_side_effects():
+        return True
+    try:
+        return not operation.output_tables()
+    except Exception:
+        return True
+
+
+def _is_table_field(annotation: Any, table_type: type[str]) -> bool:
+    return annotation is table_type or types_are_equal(annotation, list[table_type])  # type: ignore
+
+
+def _table_field_values(model: BaseModel, table_type: type[str]) -> list[str]:
+    """Get the table names of all fields of a table string type."""
+    tables: list[str] = []
+    for name, field in type(model).model_fields.items():
+        value = getattr(model, name)
+        if not value or not _is_table_field(field.annotation, table_type):
+            continue
+        tables.extend([value] if isinstance(value, str) else value)
+    return tables
 
-            with OperationLogger(operation.name, operation.title, LOG):
-                self._current_tableset = operation.operate(self._current_tableset)
 
-            # Log tableset state after operation
-            table_names = list(self._current_tableset)
-            LOG.debug(f"Tableset after operation {i}: {table_names}")
+def _profile_operation(
+    profiler: RunProfiler | None, index: int, operation: Operation
+) -> AbstractContextManager[OperationProfile | None]:
+    """Profile an operation if profiling is enabled."""
+    return profiler.operation(index, operation) if profiler is not None else nullcontext()
@@ -3,11 +3,12 @@
 from typing import Type
 
 from datarush.core.dataflow import Operation
-from datarush.core.operations.sinks import s3_dataset_sink, s3_sink
+from datarush.core.operations.sinks import compact_s3_dataset, s3_dataset_sink, s3_sink
 from datarush.core.operations.sources import (
     local_file_source,
     s3_dataset_source,
     s3_object_source,
+    s3_objects_source,
     send_http_request,
 )
 from datarush.core.operations.transformations import (
@@ -81,6 +82,7 @@ for _op_type in [
     send_http_request.SendHttpRequest,
     local_file_source.LocalFileSource,
     s3_object_source.S3ObjectSource,
+    s3_objects_source.S3ObjectsSource,
     s3_dataset_source.S3DatasetSource,
     # Transformation
     deduplicate_column_values.DeduplicateColumnValues,
@@ -123,5 +125,6 @@ for _op_type in [
     # Sink
     s3_sink.S3ObjectSink,
     s3_dataset_sink.S3DatasetSink,
+    compact_s3_dataset.CompactS3Dataset,
 ]:
     register_operation_type(_op_type)  # type: ignore
@@ -0,0 +1,95 @@
+"""S3 dataset compaction operation."""
+
+from __future__ import annotations
+
+import logging
+
+from pydantic import Field
+
+from datarush.config import get_datarush_config
+from datarush.core.dataflow import Operation, Tableset
+from datarush.core.types import BaseOperationModel, Compression, ContentType
+from datarush.utils.s3_client import S3Dataset
+
+LOG = logging.getLogger(__name__)
+
+
+class CompactS3DatasetModel(BaseOperationModel):
+    """Pydantic model for S3 dataset compaction operation."""
+
+    bucket: str = Field(title="Bucket")
+    path: str = Field(title="Dataset path")
+    content_type: ContentType = Field(title="Content type")
+    min_files: int = Field(
+        title="Minimum files",
+        default=10,
+        description="Compact partitions with more objects than this",
+    )
+    target_file_size_mb: int = Field(
+        title="Target file size (MB)",
+        default=128,
+        description="Size of the compacted objects",
+    )
+    sort_by: list[str] = Field(
+        title="Sort by",
+        default_factory=list,
+        description="Columns to sort the records of each partition by, so that Parquet "
+        "row group statistics skip more data",
+    )
+    max_workers: int = Field(
+        title="Max Workers",
+        default=4,
+        description="Number of partitions compacted at the same time",
+    )
+    compression: Compression = Field(
+        title="Compression",
+        default=Compression.NONE,
+        description="Compression of the compacted objects, only for CSV, JSON and JSONL",
+    )
+
+
+class CompactS3Dataset(Operation):
+    """Operation that merges small objects of S3 dataset partitions."""
+
+    name = "compact_s3_dataset"
+    title = "Compact S3 Dataset"
+    description = "Rewrite partitions of an S3 dataset made of many small objects"
+    model: CompactS3DatasetModel
+    has_side_effects = True
+
+    def summary(self) -> str:
+        """Return a short summary of the operation."""
+        path = f"{self.model.bucket}/{self.model.path.strip('/')}"
+        return (
+            f"Compact partitions of S3 dataset {path} with more than "
+            f"{self.model.min_files} objects"
+        )
+
+    def estimate_read_bytes(self) -> int | None:
+        """Sum the sizes of the objects of the partitions to compact."""
+        candidates = self._dataset(self.model).compaction_candidates(self.model.min_files)
+        return sum(int(obj["Size"]) for objects in candidates.values() for obj in objects)
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Compact the dataset and return unmodified tableset."""
+        model = self.model
+        compactions = self._dataset(model).compact(
+            min_files=model.min_files,
+            target_file_size=model.target_file_size_mb * 1024**2,
+            sort_by=model.sort_by,
+            max_workers=model.max_workers,
+        )
+        LOG.info(
+            f"Compacted {sum(c.files_before for c in compactions)} objects of "
+            f"{len(compactions)} partitions into {sum(c.files_after for c in compactions)}"
+        )
+        return tableset
+
+    def _dataset(self, model: CompactS3DatasetModel) -> S3Dataset:
+        return S3Dataset(
+            bucket=model.bucket,
+            prefix=model.path,
+            content_type=model.content_type,
+            config=get_datarush_config().s3,
+            compression=model.compression,
+        )
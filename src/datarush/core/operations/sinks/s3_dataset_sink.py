@@ -6,7 +6,15 @@ from pydantic import Field
 
 from datarush.config import get_datarush_config
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, ContentType, TableStr
+from datarush.core.types import (
+    BaseOperationModel,
+    ColumnStr,
+    Compression,
+    ContentType,
+    ParquetCompression,
+    TableStr,
+)
+from datarush.utils.misc import ParquetOptions
 from datarush.utils.s3_client import DatasetWriteMode, S3Dataset
 
 
@@ -24,7 +32,45 @@ class S3DatasetSinkModel(BaseOperationModel):
     unique_ids: list[ColumnStr] = Field(
         title="Unique IDs",
         default=None,  # type: ignore
-        description="List of columns to use as unique IDs for the dataset records deduplication. Only relevant for append mode.",
+        description="List of columns to use as unique IDs for the dataset records deduplication in append mode, or to match existing records in upsert mode.",
+    )
+    compression: Compression = Field(
+        title="Compression",
+        default=Compression.NONE,
+        description="Compression of the dataset objects, only for CSV, JSON and JSONL",
+    )
+    sort_by: list[ColumnStr] = Field(
+        title="Sort by",
+        default_factory=list,
+        description="Columns to sort the records by before writing, so that Parquet row group "
+        "statistics skip more data when filtering on them",
+    )
+    parquet_compression: ParquetCompression = Field(
+        title="Parquet compression",
+        default=ParquetCompression.SNAPPY,
+        description="Compression codec of the Parquet column chunks",
+    )
+    row_group_size: int = Field(
+        title="Row group size",
+        default=0,
+        description="Maximum number of rows of a Parquet row group, the pyarrow default if 0",
+    )
+    dictionary_encoding: bool = Field(
+        title="Dictionary encoding",
+        default=True,
+        description="Dictionary-encode the Parquet columns",
+    )
+    max_rows_by_file: int = Field(
+        title="Max rows by file",
+        default=0,
+        description="Maximum number of rows of each Parquet object, unlimited if 0",
+    )
+    manifest: bool = Field(
+        title="Manifest",
+        default=False,
+        description="Keep a manifest of the dataset objects with their row counts and column "
+        "statistics, so that reads skip listing and objects that cannot match their row "
+        "filter. An existing manifest is always kept up to date.",
     )
 
 
@@ -35,6 +81,7 @@ class S3DatasetSink(Operation):
     title = "Write S3 Dataset"
     description = "Write table as S3 dataset"
     model: S3DatasetSinkModel
+    has_side_effects = True
 
     def summary(self) -> str:
         """Return a short summary of the operation."""
@@ -44,17 +91,31 @@ class S3DatasetSink(Operation):
             f" as {self.model.content_type.value}"
         )
 
+    def output_tables(self) -> list[str]:
+        """Get names of the tables the operation modifies, it only writes its table out."""
+        return []
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Write table to S3 dataset and return unmodified tableset."""
+        model = self.model
         dataset = S3Dataset(
-            bucket=self.model.bucket,
-            prefix=self.model.path,
-            content_type=self.model.content_type,
-            partition_columns=self.model.partition_columns,
-            unique_ids=self.model.unique_ids,
-            write_mode=self.model.mode,
+            bucket=model.bucket,
+            prefix=model.path,
+            content_type=model.content_type,
+            partition_columns=model.partition_columns,
+            unique_ids=model.unique_ids,
+            write_mode=model.mode,
             config=get_datarush_config().s3,
+            compression=model.compression,
+            parquet_options=ParquetOptions(
+                compression=model.parquet_compression,
+                row_group_size=model.row_group_size or None,
+                use_dictionary=model.dictionary_encoding,
+                max_rows_by_file=model.max_rows_by_file or None,
+            ),
+            sort_by=model.sort_by,
+            manifest=model.manifest,
         )
-        df = tableset.get_df(self.model.table)
+        df = tableset.get_df(model.table)
         dataset.write(df)
         return tableset
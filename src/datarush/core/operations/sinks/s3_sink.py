@@ -5,9 +5,16 @@ from __future__ import annotations
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ContentType, TableStr
-from datarush.utils.misc import to_file
-from datarush.utils.s3_client import S3Client
+from datarush.core.types import (
+    BaseOperationModel,
+    ColumnStr,
+    Compression,
+    ContentType,
+    ParquetCompression,
+    TableStr,
+)
+from datarush.utils.misc import ParquetOptions, to_file
+from datarush.utils.s3_client import get_s3_client
 
 
 class S3SinkModel(BaseOperationModel):
@@ -17,6 +24,32 @@ class S3SinkModel(BaseOperationModel):
     object_key: str = Field(title="Object Key")
     content_type: ContentType = Field(title="Content Type")
     table: TableStr = Field(title="Table to write")
+    compression: Compression = Field(
+        title="Compression",
+        default=Compression.NONE,
+        description="Compression of the object, only for CSV, JSON and JSONL",
+    )
+    sort_by: list[ColumnStr] = Field(
+        title="Sort by",
+        default_factory=list,
+        description="Columns to sort the records by before writing, so that Parquet row group "
+        "statistics skip more data when filtering on them",
+    )
+    parquet_compression: ParquetCompression = Field(
+        title="Parquet compression",
+        default=ParquetCompression.SNAPPY,
+        description="Compression codec of the Parquet column chunks",
+    )
+    row_group_size: int = Field(
+        title="Row group size",
+        default=0,
+        description="Maximum number of rows of a Parquet row group, the pyarrow default if 0",
+    )
+    dictionary_encoding: bool = Field(
+        title="Dictionary encoding",
+        default=True,
+        description="Dictionary-encode the Parquet columns",
+    )
 
 
 class S3ObjectSink(Operation):
@@ -26,6 +59,7 @@ class S3ObjectSink(Operation):
     title = "Write S3 Object"
     description = "S3 Object Sink"
     model: S3SinkModel
+    has_side_effects = True
 
     def summary(self) -> str:
         """Return a short summary of the operation."""
@@ -34,9 +68,21 @@ class S3ObjectSink(Operation):
             f" as {self.model.content_type.value}"
         )
 
+    def output_tables(self) -> list[str]:
+        """Get names of the tables the operation modifies, it only writes its table out."""
+        return []
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Write table to S3 and return unmodified tableset."""
-        df = tableset.get_df(self.model.table)
-        file = to_file(df, self.model.content_type)
-        S3Client().put_object(self.model.bucket, self.model.object_key, file)
+        model = self.model
+        df = tableset.get_df(model.table)
+        if model.sort_by:
+            df = df.sort_values(model.sort_by, kind="stable", ignore_index=True)
+        parquet_options = ParquetOptions(
+            compression=model.parquet_compression,
+            row_group_size=model.row_group_size or None,
+            use_dictionary=model.dictionary_encoding,
+        )
+        file = to_file(df, model.content_type, model.compression, parquet_options)
+        get_s3_client().put_object(model.bucket, model.object_key, file)
         return tableset
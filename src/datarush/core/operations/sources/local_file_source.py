@@ -7,8 +7,8 @@ from io import BytesIO
 from pydantic import BaseModel, Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import ContentType
-from datarush.utils.misc import read_file
+from datarush.core.types import ContentType, OutputTableStr, StringMap
+from datarush.utils.misc import DtypeBackend, Engine, read_file
 
 
 class LocalFileModel(BaseModel):
@@ -16,7 +16,29 @@ class LocalFileModel(BaseModel):
 
     content_type: ContentType = Field(title="Content Type")
     file: bytes = Field(title="File")
-    table_name: str = Field(title="Table Name", default="local_table")
+    table_name: OutputTableStr = Field(title="Table Name", default=OutputTableStr("local_table"))
+    engine: Engine = Field(
+        title="Engine",
+        default="c",
+        description="Parser of CSV and JSON Lines files, pyarrow parses on all cores",
+    )
+    dtype_backend: DtypeBackend = Field(
+        title="Data Type Backend",
+        default="numpy",
+        description="Data types of the table, pyarrow stores strings as Arrow arrays using "
+        "much less memory than numpy objects",
+    )
+    dtypes: StringMap = Field(
+        title="Column Data Types",
+        default_factory=StringMap,
+        description="Data types of columns, e.g. `int64` or `string[pyarrow]`, "
+        "skipping type inference for them",
+    )
+    columns: list[str] = Field(
+        title="Columns",
+        default_factory=list,
+        description="Columns to read, all columns if empty",
+    )
 
 
 class LocalFileSource(Operation):
@@ -26,13 +48,25 @@ class LocalFileSource(Operation):
     title = "Local File"
     description = "Local File Source"
     model: LocalFileModel
+    prefetchable = True
 
     def summary(self) -> str:
         """Provide operation summary."""
         return f"Load local file as `{self.model.table_name}` table"
 
+    def estimate_read_bytes(self) -> int | None:
+        """Get the size of the file."""
+        return len(self.model.file)
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
-        df = read_file(BytesIO(self.model.file), self.model.content_type)
+        df = read_file(
+            BytesIO(self.model.file),
+            self.model.content_type,
+            engine=self.model.engine,
+            dtype_backend=self.model.dtype_backend,
+            dtypes=self.model.dtypes,
+            columns=self.model.columns,
+        )
         tableset.set_df(self.model.table_name, df)
         return tableset
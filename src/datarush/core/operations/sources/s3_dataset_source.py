@@ -2,21 +2,37 @@
 
 from __future__ import annotations
 
+import logging
 import re
-from typing import Callable
+from typing import Any, Callable
 
 import pandas as pd
 from pydantic import BaseModel, Field
 
 from datarush.config import get_datarush_config
 from datarush.core.dataflow import Operation, Tableset
+from datarush.core.state import get_state_store
 from datarush.core.types import (
     ConditionOperator,
     ContentType,
+    OutputTableStr,
     PartitionFilter,
     PartitionFilterGroup,
+    RowConditionGroup,
 )
-from datarush.utils.s3_client import DatasetDoesNotExistError, S3Dataset
+from datarush.exceptions import IncrementalReadError
+from datarush.utils.s3_client import (
+    COMPACTION_LOG_NAME,
+    CompactionLog,
+    DatasetDoesNotExistError,
+    S3Client,
+    S3Dataset,
+    get_s3_client,
+    is_data_key,
+    partition_values,
+)
+
+LOG = logging.getLogger(__name__)
 
 
 class S3DatasetSourceModel(BaseModel):
@@ -25,17 +41,34 @@ class S3DatasetSourceModel(BaseModel):
     bucket: str = Field(title="Bucket")
     path: str = Field(title="Dataset Path")
     content_type: ContentType = Field(title="Content Type")
-    table_name: str = Field(title="Table Name", default="s3_table")
+    table_name: OutputTableStr = Field(title="Table Name", default=OutputTableStr("s3_table"))
     partition_filter: PartitionFilterGroup = Field(
         title="Partition Filter",
         default=None,  # type: ignore
         description="Filter partitions by conditions",
     )
+    row_filter: RowConditionGroup = Field(
+        title="Row Filter",
+        default=None,  # type: ignore
+        description="Keep only the rows matching conditions, objects the dataset manifest "
+        "shows cannot match are not read",
+    )
     error_on_empty: bool = Field(
         title="Error on empty",
         default=True,
         description="Raise an error if the dataset is empty",
     )
+    incremental: bool = Field(
+        title="Incremental",
+        default=False,
+        description="Read only the objects added or changed since the last successful run",
+    )
+    state_key: str = Field(
+        title="State Key",
+        default="",
+        description="Key the objects already read are stored under in the state store, "
+        "based on the bucket and path of the dataset if empty",
+    )
 
 
 class S3DatasetSource(Operation):
@@ -45,34 +78,273 @@ class S3DatasetSource(Operation):
     title = "Read S3 Dataset"
     description = "Download dataset from S3"
     model: S3DatasetSourceModel
+    prefetchable = True
 
     def summary(self) -> str:
         """Provide operation summary."""
         return f"Load S3 dataset as `{self.model.table_name}` table"
 
+    def initialize(self) -> None:
+        """Initialize operation."""
+        # State of an incremental read, stored once the run succeeded
+        self._pending_state: tuple[str, dict[str, Any]] | None = None
+
+    def reads_full_source(self) -> bool:
+        """Check whether the whole dataset is read, without filtering its partitions."""
+        model = self.model
+        return not model.incremental and not (
+            model.partition_filter and model.partition_filter.filters
+        )
+
+    def estimate_read_bytes(self) -> int | None:
+        """Sum the sizes of the objects in the partitions the filter keeps.
+
+        Incremental reads only count the objects added or changed since the last run.
+        """
+        model = self.model
+        s3 = get_s3_client()
+        objects = _list_dataset_objects(s3, model)
+        if model.incremental:
+            keys = set(_keys_to_read(s3, model, objects, _read_processed_objects(model)))
+            objects = [obj for obj in objects if obj["Key"] in keys]
+        return sum(int(obj["Size"]) for obj in objects)
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
+        model = self.model
         dataset = S3Dataset(
-            bucket=self.model.bucket,
-            prefix=self.model.path,
-            content_type=self.model.content_type,
+            bucket=model.bucket,
+            prefix=model.path,
+            content_type=model.content_type,
             config=get_datarush_config().s3,
         )
+        if model.incremental:
+            df = self._read_incremental(dataset, model)
+            tableset.set_df(model.table_name, df)
+            return tableset
+
+        # Datasets with a manifest are not listed, neither to prune partitions
+        manifest = dataset.read_manifest()
+        partition_filter = model.partition_filter
+        partition_prefixes = None
+        if partition_filter and manifest is None:
+            partition_prefixes = _prune_partitions(
+                get_s3_client(),
+                model.bucket,
+                model.path.strip("/") + "/",
+                partition_filter,
+            )
         try:
             df = dataset.read(
+                partition_prefixes=partition_prefixes,
+                row_filter=model.row_filter,
+                manifest=manifest,
                 partition_filter=(
-                    _make_partitions_filter(self.model.partition_filter)
-                    if self.model.partition_filter
-                    else None
+                    _make_partitions_filter(partition_filter) if partition_filter else None
                 ),
             )
         except DatasetDoesNotExistError:
-            if self.model.error_on_empty:
+            if model.error_on_empty:
                 raise
             df = pd.DataFrame()
-        tableset.set_df(self.model.table_name, df)
+        tableset.set_df(model.table_name, df)
         return tableset
 
+    def commit(self) -> None:
+        """Store the objects an incremental read processed."""
+        if self._pending_state is None:
+            return
+        state_key, state = self._pending_state
+        get_state_store().write_state(state_key, state)
+        LOG.info(f"Stored {len(state['objects'])} processed objects under state `{state_key}`")
+        self._pending_state = None
+
+    def _read_incremental(self, dataset: S3Dataset, model: S3DatasetSourceModel) -> pd.DataFrame:
+        """Read the objects of the dataset whose keys or ETags are not in the stored state."""
+        s3 = get_s3_client()
+        listed = _list_dataset_objects(s3, model)
+        objects = {obj["Key"]: obj["ETag"] for obj in listed if is_data_key(obj["Key"])}
+        keys = _keys_to_read(s3, model, listed, _read_processed_objects(model))
+        LOG.info(
+            f"Reading {len(keys)} new or changed objects of {len(objects)} "
+            f"in {model.bucket}/{model.path}"
+        )
+        # The state only keeps the listed objects, so it does not grow with deleted objects
+        self._pending_state = (_state_key(model), {"objects": objects})
+
+        if not keys:
+            if not objects and model.error_on_empty:
+                raise DatasetDoesNotExistError(
+                    f"Dataset does not exist at {model.bucket}/{model.path}"
+                )
+            return pd.DataFrame()
+        return dataset.read_objects(keys, row_filter=model.row_filter)
+
+
+def _list_dataset_objects(s3: S3Client, model: S3DatasetSourceModel) -> list[dict[str, Any]]:
+    """List the objects of the dataset in the partitions the filter keeps."""
+    root = model.path.strip("/") + "/"
+    group = model.partition_filter
+    partition_filter = None
+    prefixes = [root]
+    if group and group.filters:
+        partition_filter = _make_partitions_filter(group)
+        partition_prefixes = _prune_partitions(s3, model.bucket, root, group)
+        if partition_prefixes is not None:
+            prefixes = [f"{root}{prefix}/" for prefix in partition_prefixes]
+
+    objects = []
+    for prefix in prefixes:
+        for obj in s3.list_objects(model.bucket, prefix):
+            if not obj["Key"].startswith(prefix):
+                # Listing strips the trailing slash, so other folders may share the prefix
+                continue
+            if partition_filter is not None and not partition_filter(
+                partition_values(obj["Key"].removeprefix(root))
+            ):
+                continue
+            objects.append(obj)
+    return objects
+
+
+def _keys_to_read(
+    s3: S3Client,
+    model: S3DatasetSourceModel,
+    listed: list[dict[str, Any]],
+    processed: dict[str, str],
+) -> list[str]:
+    """Get the keys of the data objects an incremental read has not processed yet.
+
+    Objects written by a compaction are skipped if their records were already read from the
+    objects they replaced, according to the compaction log of their partition folder.
+
+    Raises:
+        IncrementalReadError: If compacted objects mix records already read with new ones.
+    """
+    objects = {obj["Key"]: obj["ETag"] for obj in listed if is_data_key(obj["Key"])}
+    logs = {
+        obj["Key"].rsplit("/", 1)[0]
+        for obj in listed
+        if obj["Key"].rsplit("/", 1)[-1] == COMPACTION_LOG_NAME
+    }
+    # Objects still listed are read by this run if they were not processed before
+    done = {**processed, **objects}
+
+    keys = []
+    folder_logs: dict[str, CompactionLog | None] = {}
+    for key in sorted(key for key, etag in objects.items() if processed.get(key) != etag):
+        folder = key.rsplit("/", 1)[0]
+        if folder in logs and folder not in folder_logs:
+            folder_logs[folder] = _read_compaction_log(s3, model.bucket, folder)
+        log = folder_logs.get(folder)
+        if log is None or key not in log.objects:
+            keys.append(key)
+            continue
+
+        read = log.processed_by(done)
+        if read is None:
+            raise IncrementalReadError(
+                f"Objects of {model.bucket}/{folder} were compacted after only some of the "
+                f"objects they replaced were read, reset the state `{_state_key(model)}` to "
+                "read the dataset again"
+            )
+        if not read:
+            keys.append(key)
+    return keys
+
+
+def _read_compaction_log(s3: S3Client, bucket: str, folder: str) -> CompactionLog | None:
+    """Read the compaction log of a partition folder, None if it cannot be parsed."""
+    try:
+        return CompactionLog.from_json(
+            s3.get_object(bucket, f"{folder}/{COMPACTION_LOG_NAME}").getvalue()
+        )
+    except ValueError as e:
+        # Reading the compacted objects again is safer than missing records
+        LOG.warning(f"Ignoring compaction log of {bucket}/{folder}: {e}")
+        return None
+
+
+def _state_key(model: S3DatasetSourceModel) -> str:
+    return model.state_key or f"{S3DatasetSource.name}/{model.bucket}/{model.path.strip('/')}"
+
+
+def _read_processed_objects(model: S3DatasetSourceModel) -> dict[str, str]:
+    """Get the ETags of the objects processed by the last run, by their keys."""
+    state = get_state_store().read_state(_state_key(model)) or {}
+    return dict(state.get("objects", {}))
+
+
+def _prune_partitions(
+    s3: S3Client, bucket: str, root: str, group: PartitionFilterGroup
+) -> list[str] | None:
+    """Find the partition folders a filter keeps without listing the whole dataset.
+
+    The partition columns are taken from the first data object of the dataset. Folders of
+    columns filtered by equality are built from the filter values, while folders of other
+    columns are listed one level at a time and kept if their values match the conditions,
+    down to the last filtered column.
+
+    Args:
+        s3: S3 client.
+        bucket: Bucket of the dataset.
+        root: Prefix of the dataset, ending with a slash.
+        group: Partition filter.
+
+    Returns:
+        list[str] | None: Partition folders relative to the dataset, e.g. `year=2025/month=10`,
+            None if the filter cannot prune folders, e.g. if its conditions are combined with
+            `or` or it filters columns the dataset is not partitioned by.
+    """
+    if not group.filters or group.combine != "and":
+        return None
+
+    key = s3.first_data_key(bucket, root)
+    if key is None:
+        return None
+    layout = list(partition_values(key.removeprefix(root)))
+
+    conditions: dict[str, list[PartitionFilter]] = {}
+    for condition in group.filters:
+        conditions.setdefault(condition.column, []).append(condition)
+    if not set(conditions) <= set(layout):
+        return None
+
+    depth = max(layout.index(column) for column in conditions) + 1
+    prefixes = [""]
+    for column in layout[:depth]:
+        column_conditions = conditions.get(column, [])
+        equal_values = _equal_values(column_conditions)
+
+        if equal_values is not None:
+            candidates = [
+                f"{prefix}{column}={value}/" for prefix in prefixes for value in equal_values
+            ]
+        else:
+            candidates = [
+                folder.removeprefix(root)
+                for prefix in prefixes
+                for folder in s3.list_prefixes(bucket, f"{root}{prefix}")
+            ]
+
+        prefixes = []
+        for candidate in candidates:
+            name, _, value = candidate.rstrip("/").rsplit("/", 1)[-1].partition("=")
+            if name == column and all(_matches(cond, value) for cond in column_conditions):
+                prefixes.append(candidate)
+
+    LOG.debug(f"Partition filter keeps {len(prefixes)} folders of {bucket}/{root}")
+    return [prefix.rstrip("/") for prefix in prefixes]
+
+
+def _equal_values(conditions: list[PartitionFilter]) -> list[str] | None:
+    """Get the values allowed by equality conditions, None if there is no such condition."""
+    values: set[str] | None = None
+    for condition in conditions:
+        if condition.operator == ConditionOperator.EQ and not condition.negate:
+            values = {condition.value} if values is None else values & {condition.value}
+    return sorted(values) if values is not None else None
+
 
 def _make_partitions_filter(
     group: PartitionFilterGroup,
@@ -84,27 +356,31 @@ def _make_partitions_filter(
         val = partition.get(cond.column)
         if val is None:
             raise ValueError(f"Partition `{cond.column}` does not exist")
-
-        result = False
-        op = cond.operator
-
-        if op == ConditionOperator.EQ:
-            result = val == cond.value
-        elif op == ConditionOperator.LT:
-            result = val < cond.value
-        elif op == ConditionOperator.LTE:
-            result = val <= cond.value
-        elif op == ConditionOperator.GT:
-            result = val > cond.value
-        elif op == ConditionOperator.GTE:
-            result = val >= cond.value
-        elif op == ConditionOperator.REGEX:
-            result = re.fullmatch(cond.value, val) is not None
-
-        return not result if cond.negate else result
+        return _matches(cond, val)
 
     def _filter(partition: dict) -> bool:
         results = (_evaluate(f, partition) for f in filters)
         return all(results) if combine == "and" else any(results)
 
     return _filter
+
+
+def _matches(cond: PartitionFilter, val: str) -> bool:
+    """Check whether a partition value satisfies a condition."""
+    result = False
+    op = cond.operator
+
+    if op == ConditionOperator.EQ:
+        result = val == cond.value
+    elif op == ConditionOperator.LT:
+        result = val < cond.value
+    elif op == ConditionOperator.LTE:
+        result = val <= cond.value
+    elif op == ConditionOperator.GT:
+        result = val > cond.value
+    elif op == ConditionOperator.GTE:
+        result = val >= cond.value
+    elif op == ConditionOperator.REGEX:
+        result = re.fullmatch(cond.value, val) is not None
+
+    return not result if cond.negate else result
@@ -5,9 +5,9 @@ from __future__ import annotations
 from pydantic import BaseModel, Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import ContentType
-from datarush.utils.misc import read_file
-from datarush.utils.s3_client import S3Client
+from datarush.core.types import ContentType, OutputTableStr, StringMap
+from datarush.utils.misc import DtypeBackend, Engine, read_file
+from datarush.utils.s3_client import get_s3_client
 
 
 class S3SourceModel(BaseModel):
@@ -16,7 +16,29 @@ class S3SourceModel(BaseModel):
     bucket: str = Field(title="Bucket")
     object_key: str = Field(title="Object Key")
     content_type: ContentType = Field(title="Content Type")
-    table_name: str = Field(title="Table Name", default="s3_table")
+    table_name: OutputTableStr = Field(title="Table Name", default=OutputTableStr("s3_table"))
+    engine: Engine = Field(
+        title="Engine",
+        default="c",
+        description="Parser of CSV and JSON Lines files, pyarrow parses on all cores",
+    )
+    dtype_backend: DtypeBackend = Field(
+        title="Data Type Backend",
+        default="numpy",
+        description="Data types of the table, pyarrow stores strings as Arrow arrays using "
+        "much less memory than numpy objects",
+    )
+    dtypes: StringMap = Field(
+        title="Column Data Types",
+        default_factory=StringMap,
+        description="Data types of columns, e.g. `int64` or `string[pyarrow]`, "
+        "skipping type inference for them",
+    )
+    columns: list[str] = Field(
+        title="Columns",
+        default_factory=list,
+        description="Columns to read, all columns if empty",
+    )
 
 
 class S3ObjectSource(Operation):
@@ -26,14 +48,28 @@ class S3ObjectSource(Operation):
     title = "Read S3 Object"
     description = "S3 Object Source"
     model: S3SourceModel
+    prefetchable = True
 
     def summary(self) -> str:
         """Provide operation summary."""
         return f"Load S3 object as `{self.model.table_name}` table"
 
+    def estimate_read_bytes(self) -> int | None:
+        """Get the size of the S3 object."""
+        key = self.model.object_key
+        objects = get_s3_client().list_objects(self.model.bucket, key)
+        return next((obj["Size"] for obj in objects if obj["Key"] == key), None)
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
-        obj = S3Client().get_object(self.model.bucket, self.model.object_key)
-        df = read_file(obj, self.model.content_type)
+        obj = get_s3_client().get_object(self.model.bucket, self.model.object_key)
+        df = read_file(
+            obj,
+            self.model.content_type,
+            engine=self.model.engine,
+            dtype_backend=self.model.dtype_backend,
+            dtypes=self.model.dtypes,
+            columns=self.model.columns,
+        )
         tableset.set_df(self.model.table_name, df)
         return tableset
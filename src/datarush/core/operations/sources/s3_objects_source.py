@@ -0,0 +1,177 @@
+"""S3 multi-object source operation."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Iterator, Literal
+
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from datarush.core.dataflow import Operation, Tableset
+from datarush.core.types import ContentType, OutputTableStr, StringMap
+from datarush.utils.misc import DtypeBackend, Engine, read_file
+from datarush.utils.s3_client import S3Client, get_s3_client
+
+LOG = logging.getLogger(__name__)
+
+
+class S3ObjectsSourceModel(BaseModel):
+    """S3 multi-object source model."""
+
+    bucket: str = Field(title="Bucket")
+    prefix: str = Field(title="Prefix", description="Prefix of the object keys to list")
+    pattern: str = Field(
+        title="Pattern",
+        default="*",
+        description="Pattern the object keys must match after the prefix",
+    )
+    pattern_type: Literal["glob", "regex"] = Field(
+        title="Pattern Type",
+        default="glob",
+        description="Whether the pattern is a glob, e.g. `2024-*.csv`, or a regular expression",
+    )
+    content_type: ContentType = Field(title="Content Type")
+    table_name: OutputTableStr = Field(title="Table Name", default=OutputTableStr("s3_table"))
+    source_key_column: str = Field(
+        title="Source Key Column",
+        default="",
+        description="Column to store the key of the object each row comes from, none if empty",
+    )
+    max_workers: int = Field(
+        title="Max Workers",
+        default=8,
+        description="Number of objects downloaded and parsed at the same time",
+    )
+    error_on_empty: bool = Field(
+        title="Error on empty",
+        default=True,
+        description="Raise an error if no object matches",
+    )
+    engine: Engine = Field(
+        title="Engine",
+        default="c",
+        description="Parser of CSV and JSON Lines files, pyarrow parses on all cores",
+    )
+    dtype_backend: DtypeBackend = Field(
+        title="Data Type Backend",
+        default="numpy",
+        description="Data types of the table, pyarrow stores strings as Arrow arrays using "
+        "much less memory than numpy objects",
+    )
+    dtypes: StringMap = Field(
+        title="Column Data Types",
+        default_factory=StringMap,
+        description="Data types of columns, e.g. `int64` or `string[pyarrow]`, "
+        "skipping type inference for them",
+    )
+    columns: list[str] = Field(
+        title="Columns",
+        default_factory=list,
+        description="Columns to read, all columns if empty",
+    )
+
+
+class S3ObjectsSource(Operation):
+    """S3 multi-object source operation."""
+
+    name = "read_s3_objects"
+    title = "Read S3 Objects"
+    description = "Read all S3 objects matching a pattern into one table"
+    model: S3ObjectsSourceModel
+    prefetchable = True
+
+    def summary(self) -> str:
+        """Provide operation summary."""
+        path = f"{self.model.bucket}/{self.model.prefix}"
+        return (
+            f"Load S3 objects under {path} matching `{self.model.pattern}` "
+            f"as `{self.model.table_name}` table"
+        )
+
+    def estimate_read_bytes(self) -> int | None:
+        """Sum the sizes of the matching objects."""
+        objects = _list_matching_objects(get_s3_client(), self.model)
+        return sum(int(obj["Size"]) for obj in objects)
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        model = self.model
+        # The S3 client is taken from the configuration of the calling context, which
+        # worker threads do not inherit
+        s3 = get_s3_client()
+        keys = [obj["Key"] for obj in _list_matching_objects(s3, model)]
+        LOG.info(f"Reading {len(keys)} objects from {model.bucket}/{model.prefix}")
+
+        if not keys:
+            if model.error_on_empty:
+                raise ValueError(
+                    f"No object under {model.bucket}/{model.prefix} matches `{model.pattern}`"
+                )
+            tableset.set_df(model.table_name, pd.DataFrame())
+            return tableset
+
+        # Every parsed table is held until the concat, which copies them into the result,
+        # so the read peaks at about twice the size of the table
+        frames = list(_read_objects(s3, model, keys))
+        tableset.set_df(model.table_name, pd.concat(frames, ignore_index=True))
+        return tableset
+
+
+def _list_matching_objects(s3: S3Client, model: S3ObjectsSourceModel) -> list[dict[str, Any]]:
+    """List the objects under the prefix whose keys match the pattern, sorted by key."""
+    prefix = model.prefix.lstrip("/")
+    if model.pattern_type == "glob":
+        regex = re.compile(fnmatch.translate(model.pattern))
+    else:
+        regex = re.compile(model.pattern)
+
+    objects = []
+    for obj in s3.list_objects(model.bucket, prefix):
+        key = obj["Key"]
+        # Folder markers are skipped
+        if not key.startswith(prefix) or key.endswith("/"):
+            continue
+        if regex.fullmatch(key.removeprefix(prefix).lstrip("/")):
+            objects.append(obj)
+    return sorted(objects, key=lambda obj: obj["Key"])
+
+
+def _read_objects(
+    s3: S3Client, model: S3ObjectsSourceModel, keys: list[str]
+) -> Iterator[pd.DataFrame]:
+    """Download and parse objects concurrently, yielding tables in the order of the keys.
+
+    At most `max_workers` objects are in flight ahead of the table being yielded, which
+    bounds the downloaded objects held in memory, not the parsed tables the caller keeps.
+    """
+    max_workers = max(model.max_workers, 1)
+    remaining = iter(keys)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future[pd.DataFrame]] = deque(
+            executor.submit(_read_object, s3, model, key) for key in islice(remaining, max_workers)
+        )
+        while pending:
+            df = pending.popleft().result()
+            for key in islice(remaining, 1):
+                pending.append(executor.submit(_read_object, s3, model, key))
+            yield df
+
+
+def _read_object(s3: S3Client, model: S3ObjectsSourceModel, key: str) -> pd.DataFrame:
+    df = read_file(
+        s3.get_object(model.bucket, key),
+        model.content_type,
+        engine=model.engine,
+        dtype_backend=model.dtype_backend,
+        dtypes=model.dtypes,
+        columns=model.columns,
+    )
+    if model.source_key_column:
+        df[model.source_key_column] = key
+    return df
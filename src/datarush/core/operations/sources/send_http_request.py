@@ -7,7 +7,7 @@ import requests
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, StringMap, TextStr
+from datarush.core.types import BaseOperationModel, OutputTableStr, StringMap, TextStr
 
 
 class SendHttpRequestModel(BaseOperationModel):
@@ -33,7 +33,9 @@ class SendHttpRequestModel(BaseOperationModel):
         description="How to parse the response body into a dataframe",
         default="json",
     )
-    output_table: str = Field(title="Output Table", description="Table to store response data")
+    output_table: OutputTableStr = Field(
+        title="Output Table", description="Table to store response data"
+    )
 
 
 class SendHttpRequest(Operation):
@@ -43,6 +45,7 @@ class SendHttpRequest(Operation):
     title = "Send HTTP Request"
     description = "Send an HTTP request and parse the response into a table"
     model: SendHttpRequestModel
+    has_side_effects = True
 
     def summary(self) -> str:
         """Return a summary of the operation."""
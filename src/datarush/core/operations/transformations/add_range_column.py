@@ -24,6 +24,7 @@ class AddRangeColumn(Operation):
     title = "Add Range Column"
     description = "Add a column generated from a Python-style range into the table"
     model: AddRangeColumnModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -27,6 +27,8 @@ class AssertHasColumns(Operation):
     title = "Assert Has Columns"
     description = "Assert that a table contains specified columns"
     model: AssertHasColumnsModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Return a summary of the operation."""
@@ -38,6 +40,10 @@ class AssertHasColumns(Operation):
             f"{', '.join(f'**{col}**' for col in self.model.columns)}{suffix}"
         )
 
+    def output_tables(self) -> list[str]:
+        """Get names of the tables the operation modifies, it only checks its table."""
+        return []
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Check that the specified table has the required columns."""
         df = tableset.get_df(self.model.table)
@@ -34,6 +34,8 @@ class AsType(Operation):
     title = "Cast Column Type"
     description = "Change the data type of a column using pandas astype"
     model: AstypeModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
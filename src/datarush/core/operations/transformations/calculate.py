@@ -28,6 +28,8 @@ class Calculate(Operation):
     title = "Calculate"
     description = "Compute new column using a math expression involving existing columns"
     model: CalculateModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -37,6 +37,8 @@ class CalculateHash(Operation):
     title = "Calculate Hash"
     description = "Combine values from multiple columns and calculate a deterministic hash"
     model: CalculateHashModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
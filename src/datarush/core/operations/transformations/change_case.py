@@ -33,6 +33,8 @@ class ChangeCase(Operation):
     title = "Change Case"
     description = "Change the case of string values in specified columns"
     model: ChangeCaseModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
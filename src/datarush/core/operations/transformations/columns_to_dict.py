@@ -32,6 +32,8 @@ class ColumnsToDict(Operation):
     title = "Columns to Dict"
     description = "Combine several columns into a dictionary"
     model: ColumnsToDictModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -6,14 +6,16 @@ import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, TableStr
+from datarush.core.types import BaseOperationModel, OutputTableStr, TableStr
 
 
 class ConcatenateTablesModel(BaseOperationModel):
     """Model for ConcatenateTables."""
 
     tables: list[TableStr] = Field(title="Tables", description="Tables to concatenate")
-    output_table: str = Field(title="Output Table", description="Name of the resulting table")
+    output_table: OutputTableStr = Field(
+        title="Output Table", description="Name of the resulting table"
+    )
     how: Literal["rows", "columns"] = Field(
         title="How to Concatenate", description="Concatenate by rows or columns", default="rows"
     )
@@ -41,6 +43,12 @@ class ConcatenateTables(Operation):
             f"by {how} into `{self.model.output_table}`{drop}"
         )
 
+    def dropped_tables(self) -> list[str]:
+        """Get names of the tables the operation removes."""
+        if not self.model.drop:
+            return []
+        return [table for table in self.model.tables if table != self.model.output_table]
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run the concatenate operation."""
         dfs = [tableset.get_df(name) for name in self.model.tables]
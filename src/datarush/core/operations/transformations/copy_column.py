@@ -21,6 +21,8 @@ class CopyColumn(Operation):
     title = "Copy Column"
     description = "Create a copy of a column under a new name in the same table"
     model: CopyColumnModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -3,14 +3,16 @@
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, TableStr
+from datarush.core.types import BaseOperationModel, OutputTableStr, TableStr
 
 
 class CopyTableModel(BaseOperationModel):
     """Model for Copy Table operation."""
 
     source_table: TableStr = Field(title="Source Table", description="Table to copy")
-    target_table: str = Field(title="Target Table", description="Name of the new copied table")
+    target_table: OutputTableStr = Field(
+        title="Target Table", description="Name of the new copied table"
+    )
 
 
 class CopyTable(Operation):
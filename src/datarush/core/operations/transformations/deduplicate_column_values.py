@@ -25,6 +25,8 @@ class DeduplicateColumnValues(Operation):
     title = "Deduplicate Column Values"
     description = "Remove duplicates from each list-like cell in the specified column"
     model: DeduplicateColumnValuesModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide summary."""
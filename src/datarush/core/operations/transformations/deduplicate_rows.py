@@ -30,6 +30,7 @@ class DeduplicateRows(Operation):
     title = "Deduplicate Rows"
     description = "Remove duplicate rows from a table based on selected columns"
     model: DeduplicateRowsModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
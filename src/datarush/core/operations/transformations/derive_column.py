@@ -25,6 +25,8 @@ class DeriveColumn(Operation):
     title = "Derive Column"
     description = "Create a new column by rendering a Jinja2 template for each row"
     model: DeriveColumnModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
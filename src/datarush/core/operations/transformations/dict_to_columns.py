@@ -1,5 +1,7 @@
 """Dict to Columns operation."""
 
+from typing import Any
+
 import pandas as pd
 from pydantic import Field
 
@@ -20,6 +22,16 @@ class DictToColumnsModel(BaseOperationModel):
         description="Whether to drop the original dictionary column",
         default=False,
     )
+    keys: list[str] = Field(
+        title="Keys",
+        description="Dictionary keys to expand. If empty, all keys are expanded.",
+        default_factory=list,
+    )
+    max_level: int = Field(
+        title="Nesting Depth",
+        description="Levels of nested dictionaries to flatten (0 keeps nested dictionaries as values)",
+        default=0,
+    )
 
 
 class DictToColumns(Operation):
@@ -29,11 +41,13 @@ class DictToColumns(Operation):
     title = "Dict to Columns"
     description = "Expand dictionary column into multiple columns"
     model: DictToColumnsModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
+        keys = f" keys {', '.join(self.model.keys)} of" if self.model.keys else ""
         return (
-            f"Expand column **{self.model.column}** in `{self.model.table}` "
+            f"Expand{keys} column **{self.model.column}** in `{self.model.table}` "
             f"into separate columns "
             f"({'drop source' if self.model.drop else 'keep source'})"
         )
@@ -43,12 +57,18 @@ class DictToColumns(Operation):
         df = tableset.get_df(self.model.table)
         dict_col = df[self.model.column]
 
-        if not all(isinstance(val, dict) or pd.isna(val) for val in dict_col):
-            raise ValueError(f"All values in `{self.model.column}` must be dicts or null")
+        keys = self.model.keys
+        records = []
+        for val, is_null in zip(dict_col, dict_col.isna()):
+            if isinstance(val, dict):
+                records.append({k: val[k] for k in keys if k in val} if keys else val)
+            elif is_null:
+                records.append({})
+            else:
+                raise ValueError(f"All values in `{self.model.column}` must be dicts or null")
 
-        # Create a DataFrame from dicts, using column_key = colname_keyname
-        expanded = dict_col.apply(lambda d: {} if pd.isna(d) else d).apply(pd.Series)
-        expanded.columns = [f"{self.model.column}_{key}" for key in expanded.columns]
+        expanded = expand_dicts(records, prefix=self.model.column, max_level=self.model.max_level)
+        expanded.index = df.index
 
         df = pd.concat([df, expanded], axis=1)
 
@@ -57,3 +77,24 @@ class DictToColumns(Operation):
 
         tableset.set_df(self.model.table, df)
         return tableset
+
+
+def expand_dicts(
+    records: list[dict[str, Any]], prefix: str, max_level: int | None = None
+) -> pd.DataFrame:
+    """Expand dictionaries into a DataFrame with one `<prefix>_<key>` column per key.
+
+    Args:
+        records: Dictionaries to expand, one per row.
+        prefix: Prefix for the resulting column names.
+        max_level: Levels of nested dictionaries to flatten, None flattens all of them.
+    Returns:
+        pd.DataFrame: DataFrame with a default index and one row per record.
+    """
+    if max_level == 0:
+        # Building the frame from the list of dicts avoids json_normalize's nesting checks
+        expanded = pd.DataFrame(records, index=pd.RangeIndex(len(records)))
+    else:
+        expanded = pd.json_normalize(records, sep="_", max_level=max_level)
+    expanded.columns = [f"{prefix}_{key}" for key in expanded.columns]
+    return expanded
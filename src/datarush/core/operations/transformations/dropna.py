@@ -21,6 +21,8 @@ class DropNaValues(Operation):
     title = "Drop NA"
     description = "Drop all rows with NA values"
     model: DropnaModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
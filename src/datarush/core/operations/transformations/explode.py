@@ -20,6 +20,8 @@ class Explode(Operation):
     title = "Explode Columns"
     description = "Explode one or more list-like columns into multiple rows"
     model: ExplodeModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
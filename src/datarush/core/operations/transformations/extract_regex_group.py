@@ -3,10 +3,14 @@
 import re
 from typing import Literal
 
+import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, TableStr
+from datarush.core.types import BaseOperationModel, ColumnStr, StringMap, TableStr
+
+# Global inline flags, e.g. `(?i)`, which must stay at the start of a pattern
+_INLINE_FLAGS = re.compile(r"(?:\(\?[aiLmsux]+\))*")
 
 
 class ExtractRegexGroupModel(BaseOperationModel):
@@ -27,6 +31,11 @@ class ExtractRegexGroupModel(BaseOperationModel):
         title="Target Column",
         description="Column to store extracted values",
     )
+    extra_groups: StringMap = Field(
+        title="Extra Groups (group -> column)",
+        description="Additional capture groups to extract in the same pass: {group: target_column}",
+        default_factory=StringMap,
+    )
     on_missing: Literal["null", "error"] = Field(
         title="Missing Behavior",
         description="What to do if regex doesn't match",
@@ -39,37 +48,74 @@ class ExtractRegexGroup(Operation):
 
     name = "extract_regex_group"
     title = "Extract Regex Group"
-    description = "Extract a named or numbered group from a column using regex"
+    description = "Extract named or numbered groups from a column using regex"
     model: ExtractRegexGroupModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
+        groups = {self.model.group: self.model.target_column, **self.model.extra_groups}
+        if len(groups) == 1:
+            return (
+                f"Extract group **{self.model.group}** from column **{self.model.column}** "
+                f"using regex into **{self.model.target_column}** in `{self.model.table}`"
+            )
+
+        mappings = [f"**{group}** → **{target}**" for group, target in groups.items()]
         return (
-            f"Extract group **{self.model.group}** from column **{self.model.column}** "
-            f"using regex into **{self.model.target_column}** in `{self.model.table}`"
+            f"Extract groups from column **{self.model.column}** using regex "
+            f"in `{self.model.table}`: {', '.join(mappings)}"
         )
 
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
         df = tableset.get_df(self.model.table)
-        pattern = re.compile(self.model.regex)
-        group_key = int(self.model.group) if self.model.group.isdigit() else self.model.group
+        groups = {self.model.group: self.model.target_column, **self.model.extra_groups}
         missing = self.model.on_missing
 
-        def extract(value: str) -> str | None:
-            match = pattern.search(str(value))
-            if match:
-                try:
-                    return match.group(group_key)
-                except (IndexError, KeyError):
-                    if missing == "error":
-                        raise ValueError(f"Group '{group_key}' not found in regex match.")
-                    return None
-            else:
-                if missing == "error":
-                    raise ValueError(f"No match for value: {value}")
-                return None
-
-        df[self.model.target_column] = df[self.model.column].apply(extract)
+        # str.extract only returns capture groups, so the whole match becomes group 1
+        regex = self.model.regex
+        offset = 0
+        if "0" in groups:
+            flags = _INLINE_FLAGS.match(regex).group()  # type: ignore
+            regex, offset = f"{flags}({regex[len(flags):]})", 1
+        pattern = re.compile(regex)
+
+        # Map each group to the position of its column in the str.extract result
+        positions: dict[str, int | None] = {}
+        for group in groups:
+            index = int(group) + offset if group.isdigit() else pattern.groupindex.get(group)
+            positions[group] = index - 1 if index and index <= pattern.groups else None
+
+            if positions[group] is None and missing == "error":
+                raise ValueError(f"Group '{group}' not found in regex match.")
+
+        series = df[self.model.column]
+        if not pd.api.types.is_string_dtype(series):
+            series = series.astype(str)
+
+        # str.extract refuses patterns without groups, all requested groups are missing then
+        extracted = (
+            series.str.extract(pattern, expand=True)
+            if pattern.groups
+            else pd.DataFrame(index=df.index)
+        )
+
+        if missing == "error":
+            requested = [pos for pos in positions.values() if pos is not None]
+            missing_mask = extracted.iloc[:, requested].isna().any(axis=1)
+            if missing_mask.any():
+                value = df[self.model.column][missing_mask].iloc[0]
+                raise ValueError(f"No match for value: {value}")
+
+        for group, target_column in groups.items():
+            position = positions[group]
+            if position is None:
+                df[target_column] = None
+                continue
+            values = extracted.iloc[:, position].astype(object)
+            df[target_column] = values.where(values.notna(), None)
+
         tableset.set_df(self.model.table, df)
         return tableset
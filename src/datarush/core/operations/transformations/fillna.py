@@ -47,6 +47,7 @@ class FillNa(Operation):
     title = "Fill NA"
     description = "Fill missing values in selected columns using various methods"
     model: FillnaModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -24,6 +24,9 @@ class FilterByColumn(Operation):
     title = "Filter Rows"
     description = "Filter table rows by column value"
     model: FilterRowModel
+    chunk_safe = True
+    filters_rows = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
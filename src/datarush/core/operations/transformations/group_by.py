@@ -5,7 +5,7 @@ from typing import Literal
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, TableStr
+from datarush.core.types import BaseOperationModel, ColumnStr, OutputTableStr, TableStr
 
 
 class GroupByModel(BaseOperationModel):
@@ -21,8 +21,10 @@ class GroupByModel(BaseOperationModel):
         description="Function to apply on grouped column",
         default="count",
     )
-    output_table: str = Field(
-        title="Output Table", description="Name of resulting table", default="grouped_table"
+    output_table: OutputTableStr = Field(
+        title="Output Table",
+        description="Name of resulting table",
+        default=OutputTableStr("grouped_table"),
     )
 
 
@@ -5,7 +5,13 @@ from typing import Annotated, Literal
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, ColumnStrMeta, TableStr
+from datarush.core.types import (
+    BaseOperationModel,
+    ColumnStr,
+    ColumnStrMeta,
+    OutputTableStr,
+    TableStr,
+)
 
 
 class JoinModel(BaseOperationModel):
@@ -38,10 +44,10 @@ class JoinModel(BaseOperationModel):
         description="Type of join to perform",
         default="inner",
     )
-    output_table: str = Field(
+    output_table: OutputTableStr = Field(
         title="Output Table",
         description="Name of resulting table",
-        default="joined_table",
+        default=OutputTableStr("joined_table"),
     )
 
 
@@ -4,7 +4,7 @@ import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, TableStr
+from datarush.core.types import BaseOperationModel, ColumnStr, OutputTableStr, TableStr
 
 
 class MeltModel(BaseOperationModel):
@@ -21,8 +21,10 @@ class MeltModel(BaseOperationModel):
     value_name: str = Field(
         title="Value Name", description="Name of the value column", default="value"
     )
-    output_table: str = Field(
-        title="Output Table", description="Name of resulting table", default="melted_table"
+    output_table: OutputTableStr = Field(
+        title="Output Table",
+        description="Name of resulting table",
+        default=OutputTableStr("melted_table"),
     )
 
 
@@ -1,5 +1,6 @@
 """Normalize empty values operation."""
 
+import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
@@ -29,6 +30,8 @@ class NormalizeEmptyValues(Operation):
     title = "Normalize Empty Values"
     description = "Convert all empty-like values to null (None/NaN) for consistency"
     model: NormalizeEmptyValuesModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -46,16 +49,21 @@ class NormalizeEmptyValues(Operation):
         df = tableset.get_df(self.model.table)
         target_columns = self.model.columns or df.columns.tolist()
 
-        for col in target_columns:
-            if col in df.columns:
-                empty_value_mask = df[col].isna()
+        # Only text columns can hold empty-like strings, other dtypes already use NaN for nulls
+        text_columns = [col for col in target_columns if col in df.columns and _is_text(df[col])]
 
-                empty_values = ["", *self.model.custom_empty_values]
-                for custom_value in empty_values:
-                    empty_value_mask |= df[col].astype(str) == custom_value
-
-                # Apply the mask
-                df.loc[empty_value_mask, col] = None
+        if text_columns:
+            empty_values = {"", *self.model.custom_empty_values}
+            text_df = df[text_columns]
+            empty_value_mask = text_df.isna() | text_df.isin(empty_values)
+            df[text_columns] = text_df.mask(empty_value_mask, None)
 
         tableset.set_df(self.model.table, df)
         return tableset
+
+
+def _is_text(series: pd.Series) -> bool:
+    """Check whether a column can hold strings."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return True
+    return bool(pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series))
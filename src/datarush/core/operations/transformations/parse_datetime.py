@@ -49,6 +49,8 @@ class ParseDatetime(Operation):
     title = "Parse Datetime"
     description = "Parse datetime strings in a column using dateparser with configurable settings"
     model: ParseDatetimeModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
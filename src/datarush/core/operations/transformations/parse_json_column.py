@@ -1,13 +1,21 @@
 """Parse JSON column operation."""
 
 import json
-from typing import Literal
+from typing import Any, Literal
 
+import numpy as np
+import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
+from datarush.core.operations.transformations.dict_to_columns import expand_dicts
 from datarush.core.types import BaseOperationModel, ColumnStr, TableStr
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 class ParseJSONColumnModel(BaseOperationModel):
     """Parse JSON column model."""
@@ -17,6 +25,14 @@ class ParseJSONColumnModel(BaseOperationModel):
     on_error: Literal["null", "error"] = Field(
         title="On Error", description="What to do if JSON parsing fails", default="error"
     )
+    flatten: bool = Field(
+        title="Flatten",
+        description=(
+            "Expand parsed JSON objects straight into columns named `<column>_<key>` "
+            "instead of keeping dictionaries in the source column"
+        ),
+        default=False,
+    )
 
 
 class ParseJSONColumn(Operation):
@@ -26,27 +42,114 @@ class ParseJSONColumn(Operation):
     title = "Parse JSON Column"
     description = "Convert stringified JSON column into actual dictionaries"
     model: ParseJSONColumnModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
+        flatten = " into flattened columns" if self.model.flatten else ""
         return (
-            f"Parse column **{self.model.column}** as JSON in `{self.model.table}` "
+            f"Parse column **{self.model.column}** as JSON{flatten} in `{self.model.table}` "
             f"(on_error = {self.model.on_error})"
         )
 
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
         df = tableset.get_df(self.model.table)
+        column = self.model.column
         on_error = self.model.on_error
 
         def safe_parse(val: str) -> dict | list | None:
             try:
-                return json.loads(val)  # type: ignore
-            except (TypeError, json.JSONDecodeError):
+                return _loads(val)  # type: ignore
+            except (TypeError, ValueError):
                 if on_error == "error":
                     raise ValueError(f"Failed to parse JSON value: {val}")
                 return None
 
-        df[self.model.column] = df[self.model.column].apply(safe_parse)
+        if not self.model.flatten and _holds_containers(df[column]):
+            # Shared dicts and lists would alias between rows, so parse every row on its own
+            df[column] = [safe_parse(val) for val in df[column]]
+            tableset.set_df(self.model.table, df)
+            return tableset
+
+        # Parse every distinct payload once, repeated payloads are very common in event data
+        try:
+            codes, uniques = pd.factorize(df[column])
+        except TypeError:
+            # Unhashable values, e.g. already parsed dicts, cannot be deduplicated
+            codes, uniques = np.arange(len(df)), df[column].to_numpy()
+
+        missing = codes == -1
+        if missing.any():
+            # Missing values are not valid JSON, so they follow the on_error behavior
+            safe_parse(df[column][missing].iloc[0])
+
+        parsed = [safe_parse(val) for val in uniques]
+
+        if self.model.flatten:
+            if on_error == "error":
+                for val, obj in zip(uniques, parsed):
+                    if not isinstance(obj, dict):
+                        raise ValueError(f"JSON value is not an object: {val}")
+
+            records = [obj if isinstance(obj, dict) else {} for obj in parsed]
+            if missing.any():
+                # Code -1 of missing values picks this trailing empty record in take()
+                records.append({})
+            expanded = expand_dicts(records, prefix=column).take(codes)
+            expanded.index = df.index
+
+            df = pd.concat([df.drop(columns=[column]), expanded], axis=1)
+        else:
+            df[column] = _spread_parsed(parsed, uniques, codes)
+
         tableset.set_df(self.model.table, df)
         return tableset
+
+
+def _loads(value: str | bytes) -> Any:
+    """Parse JSON with orjson when available, falling back to the standard library.
+
+    orjson is stricter than the json module (e.g. it rejects NaN literals and big integers),
+    so values it refuses are retried with json to keep the results identical.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(value)
+        except (TypeError, ValueError):
+            pass
+    return json.loads(value)
+
+
+def _holds_containers(values: pd.Series) -> bool:
+    """Tell whether the first present payload is a JSON object or array."""
+    first = values.first_valid_index()
+    if first is None:
+        return False
+    value = values[first]
+    return isinstance(value, str) and value.lstrip()[:1] in ("{", "[")
+
+
+def _spread_parsed(parsed: list[Any], uniques: Any, codes: np.ndarray) -> np.ndarray:
+    """Give every row the parsed value of its payload, None for missing values.
+
+    Scalars are shared by the rows repeating a payload. Rows repeating a dictionary or list
+    parse their payload again, so that changing one cell in place leaves the other rows
+    intact, which is cheaper with orjson than a deep copy.
+    """
+    # The trailing None is taken by code -1 of missing values
+    table = np.empty(len(parsed) + 1, dtype=object)
+    for i, obj in enumerate(parsed):
+        table[i] = obj
+    values = table.take(codes)
+
+    mutable = np.fromiter((isinstance(obj, (dict, list)) for obj in parsed), bool, len(parsed))
+    if not mutable.any():
+        return values
+
+    repeated = np.append(mutable, False)[codes]
+    _, first_rows = np.unique(codes, return_index=True)
+    repeated[first_rows] = False
+    for row in np.flatnonzero(repeated):
+        values[row] = _loads(uniques[codes[row]])
+    return values
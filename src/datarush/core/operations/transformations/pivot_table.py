@@ -5,7 +5,7 @@ from typing import Literal
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, TableStr
+from datarush.core.types import BaseOperationModel, ColumnStr, OutputTableStr, TableStr
 
 
 class PivotTableModel(BaseOperationModel):
@@ -18,8 +18,10 @@ class PivotTableModel(BaseOperationModel):
     aggfunc: Literal["sum", "mean", "count", "min", "max"] = Field(
         title="Aggregation Function", default="sum"
     )
-    output_table: str = Field(
-        title="Output Table", description="Name of resulting table", default="pivot_table"
+    output_table: OutputTableStr = Field(
+        title="Output Table",
+        description="Name of resulting table",
+        default=OutputTableStr("pivot_table"),
     )
 
 
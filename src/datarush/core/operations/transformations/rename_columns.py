@@ -24,6 +24,8 @@ class RenameColumns(Operation):
     title = "Rename Columns"
     description = "Rename columns using a mapping of old names to new names"
     model: RenameColumnsModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
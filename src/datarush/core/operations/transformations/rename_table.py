@@ -3,14 +3,14 @@
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
-from datarush.core.types import BaseOperationModel, TableStr
+from datarush.core.types import BaseOperationModel, OutputTableStr, TableStr
 
 
 class RenameTableModel(BaseOperationModel):
     """Rename table model."""
 
     table: TableStr = Field(title="Current Table", description="Current table name")
-    new_name: str = Field(title="New Name", description="New name for the table")
+    new_name: OutputTableStr = Field(title="New Name", description="New name for the table")
 
 
 class RenameTable(Operation):
@@ -25,6 +25,10 @@ class RenameTable(Operation):
         """Provide operation summary."""
         return f"Rename `{self.model.table}` to `{self.model.new_name}`"
 
+    def dropped_tables(self) -> list[str]:
+        """Get names of the tables the operation removes."""
+        return [self.model.table]
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
         df = tableset.get_df(self.model.table)
@@ -34,6 +34,8 @@ class Replace(Operation):
     title = "Replace"
     description = "Replace values or regex patterns in selected columns"
     model: ReplaceModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
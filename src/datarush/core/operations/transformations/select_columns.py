@@ -20,6 +20,8 @@ class SelectColumns(Operation):
     title = "Select Columns"
     description = "Select columns to keep from table"
     model: SelectColumnModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
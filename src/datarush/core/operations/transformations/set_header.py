@@ -20,6 +20,7 @@ class SetHeader(Operation):
     title = "Set Header"
     description = "Replace the column headers with values from a specified row"
     model: SetHeaderModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
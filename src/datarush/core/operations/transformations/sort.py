@@ -1,5 +1,9 @@
 """Sort operation."""
 
+from typing import Literal
+
+import numpy as np
+import pandas as pd
 from pydantic import Field
 
 from datarush.core.dataflow import Operation, Tableset
@@ -16,6 +20,32 @@ class SortColumnModel(BaseOperationModel):
         description="Sort in ascending order",
         default=True,
     )
+    then_by: list[ColumnStr] = Field(
+        title="Then By",
+        description="Additional columns to sort by when values in previous columns are equal",
+        default_factory=list,
+    )
+    descending: list[ColumnStr] = Field(
+        title="Descending Columns",
+        description="Columns from 'Then By' to sort in descending order",
+        default_factory=list,
+    )
+    na_position: Literal["last", "first"] = Field(
+        title="NA Position",
+        description="Place missing values at the beginning or at the end",
+        default="last",
+    )
+    stable: bool = Field(
+        title="Stable",
+        description="Keep the original order of rows with equal sort keys",
+        default=False,
+    )
+    limit: int | None = Field(
+        title="Limit",
+        description="Keep only the first N rows after sorting. If empty, all rows are kept.",
+        default=None,
+        ge=1,
+    )
 
 
 class SortByColumn(Operation):
@@ -23,20 +53,96 @@ class SortByColumn(Operation):
 
     name = "sort"
     title = "Sort"
-    description = "Sort table by column"
+    description = "Sort table by one or more columns"
 
     model: SortColumnModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide summary."""
-        return (
-            f"Sort `{self.model.table}` by {self.model.column} in "
-            f"{'ascending' if self.model.ascending else 'descending'} order"
+        model = self.model
+        summary = (
+            f"Sort `{model.table}` by {model.column} in "
+            f"{'ascending' if model.ascending else 'descending'} order"
         )
+        if model.then_by:
+            then_by = ", ".join(
+                f"{col} ({'descending' if col in model.descending else 'ascending'})"
+                for col in model.then_by
+            )
+            summary += f", then by {then_by}"
+        if model.limit is not None:
+            summary += f" and keep the first {model.limit} rows"
+        return summary
 
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
-        table, column = self.model.table, self.model.column
-        df = tableset.get_df(table)
-        tableset.set_df(table, df.sort_values(by=column, ascending=self.model.ascending))
+        model = self.model
+        df = tableset.get_df(model.table)
+
+        columns: list[str] = [model.column, *model.then_by]
+        ascending = [model.ascending, *(col not in model.descending for col in model.then_by)]
+
+        if model.limit is not None and _can_select_partially(df, columns, ascending, model):
+            select = df.nsmallest if ascending[0] else df.nlargest
+            df = select(model.limit, columns=columns, keep="first")
+        else:
+            if not _is_sorted(df, columns, ascending):
+                df = df.sort_values(
+                    by=columns,
+                    ascending=ascending,
+                    na_position=model.na_position,
+                    kind="stable" if model.stable else "quicksort",
+                )
+            if model.limit is not None:
+                df = df.head(model.limit)
+
+        tableset.set_df(model.table, df)
         return tableset
+
+
+def _can_select_partially(
+    df: pd.DataFrame, columns: list[str], ascending: list[bool], model: SortColumnModel
+) -> bool:
+    """Check whether top-N rows can be selected with nlargest/nsmallest instead of a full sort.
+
+    Partial selection only supports a single direction for all keys, numeric columns
+    and always places missing values last.
+    """
+    if len(set(ascending)) > 1 or model.na_position != "last":
+        return False
+    return all(
+        pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+        for col in columns
+    )
+
+
+def _is_sorted(df: pd.DataFrame, columns: list[str], ascending: list[bool]) -> bool:
+    """Check in a single pass whether the table is already ordered by the given keys.
+
+    Tables with missing values in the sort keys are never considered sorted.
+    """
+    if len(df) < 2:
+        return True
+
+    # Rows are ordered if each pair of neighbours is ordered by the first key that differs
+    ordered = np.zeros(len(df) - 1, dtype=bool)
+    undecided = np.ones(len(df) - 1, dtype=bool)
+    try:
+        for col, asc in zip(columns, ascending):
+            series = df[col]
+            if series.isna().any():
+                return False
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Categoricals are ordered by their categories, not by their values
+                series = series.cat.codes
+            values = series.to_numpy()
+            prev, curr = values[:-1], values[1:]
+            in_order = prev < curr if asc else prev > curr
+            ordered |= undecided & in_order
+            undecided &= prev == curr
+    except TypeError:
+        # Values that cannot be compared with each other, e.g. mixed types
+        return False
+
+    return bool((ordered | undecided).all())
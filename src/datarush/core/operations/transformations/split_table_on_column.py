@@ -30,6 +30,8 @@ class SplitTableOnColumn(Operation):
     title = "Split Table On Column"
     description = "Split a table into multiple tables based on unique values in a column"
     model: SplitTableOnColumnModel
+    creates_dynamic_tables = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -40,6 +42,14 @@ class SplitTableOnColumn(Operation):
             f"({drop_original}, {drop_split})"
         )
 
+    def output_tables(self) -> list[str]:
+        """Get names of the tables the operation creates, they are named after the data."""
+        return []
+
+    def dropped_tables(self) -> list[str]:
+        """Get names of the tables the operation removes."""
+        return [self.model.table] if self.model.drop_original_table else []
+
     def operate(self, tableset: Tableset) -> Tableset:
         """Run operation."""
         df = tableset.get_df(self.model.table)
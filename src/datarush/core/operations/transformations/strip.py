@@ -38,6 +38,8 @@ class Strip(Operation):
         "Remove leading and trailing whitespace (or specified characters) from string values"
     )
     model: StripModel
+    chunk_safe = True
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -19,6 +19,7 @@ class Transpose(Operation):
     title = "Transpose Table"
     description = "Transpose a table in-place"
     model: TransposeModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
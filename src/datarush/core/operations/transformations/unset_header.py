@@ -20,6 +20,7 @@ class UnsetHeader(Operation):
     title = "Unset Header"
     description = "Move column names to first row and replace headers with default integers"
     model: UnsetHeaderModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
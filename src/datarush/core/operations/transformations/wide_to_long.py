@@ -34,6 +34,7 @@ class WideToLong(Operation):
     title = "Wide to Long"
     description = "Reshape table from wide format to long format using stubnames"
     model: WideToLongModel
+    has_side_effects = False
 
     def summary(self) -> str:
         """Provide operation summary."""
@@ -0,0 +1,359 @@
+"""Static plans of dataflow runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from datarush.core.dataflow import Operation
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class OperationPlan:
+    """What an operation would do in a dataflow run.
+
+    Attributes:
+        index: Position of the operation in the dataflow, starting at 1.
+        name: Name of the operation type.
+        title: Title of the operation type.
+        enabled: Whether the operation would run.
+        input_tables: Tables the operation reads, mapped to the operation creating them.
+        output_tables: Tables the operation creates or modifies.
+        dropped_tables: Tables the operation removes.
+        depends_on: Operations that have to run before this one.
+        stage: Operations of the same stage do not depend on each other and could run in
+            parallel.
+        chunk_safe: Whether the operation could run on chunks of its tables.
+        cache_hit: Whether the result would be taken from a cache.
+        read_bytes: Estimated bytes read from outside the dataflow, None if unknown.
+        input_bytes: Estimated stored size of the input tables, None if unknown.
+        error: Why the parameters of the operation could not be resolved.
+    """
+
+    index: int
+    name: str
+    title: str
+    enabled: bool = True
+    input_tables: dict[str, int | None] = field(default_factory=dict)
+    output_tables: list[str] = field(default_factory=list)
+    dropped_tables: list[str] = field(default_factory=list)
+    depends_on: list[int] = field(default_factory=list)
+    stage: int | None = None
+    chunk_safe: bool = False
+    cache_hit: bool = False
+    read_bytes: int | None = None
+    input_bytes: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class DataflowPlan:
+    """Static plan of a dataflow run, built without running any operation."""
+
+    operations: list[OperationPlan] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def read_bytes(self) -> int | None:
+        """Get the estimated bytes read by all sources, None if any estimate is unknown."""
+        sizes = [
+            op.read_bytes
+            for op in self.operations
+            if op.enabled and not op.input_tables and op.error is None
+        ]
+        if any(size is None for size in sizes):
+            return None
+        return sum(size for size in sizes if size is not None)
+
+    @property
+    def stages(self) -> int:
+        """Get the number of stages operations are grouped in."""
+        return max((op.stage for op in self.operations if op.stage is not None), default=0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the plan to a JSON serializable dictionary."""
+        return asdict(self)
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Convert the plan to JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the plan to a table with one row per operation."""
+        return pd.DataFrame(
+            [
+                {
+                    "index": op.index,
+                    "stage": op.stage,
+                    "operation": op.title,
+                    "reads": ", ".join(op.input_tables),
+                    "writes": ", ".join(op.output_tables),
+                    "drops": ", ".join(op.dropped_tables),
+                    "depends_on": ", ".join(str(index) for index in op.depends_on),
+                    "chunk_safe": op.chunk_safe,
+                    "cache_hit": op.cache_hit,
+                    "read_bytes": op.read_bytes,
+                    "input_bytes": op.input_bytes,
+                    "error": op.error,
+                }
+                for op in self.operations
+                if op.enabled
+            ],
+            columns=[
+                "index",
+                "stage",
+                "operation",
+                "reads",
+                "writes",
+                "drops",
+                "depends_on",
+                "chunk_safe",
+                "cache_hit",
+                "read_bytes",
+                "input_bytes",
+                "error",
+            ],
+        )
+
+    def to_text(self) -> str:
+        """Render the plan for the terminal."""
+        enabled = [op for op in self.operations if op.enabled]
+        lines = [
+            f"Plan of {len(enabled)} operations in {self.stages} stages, "
+            f"estimated read from sources: {format_bytes(self.read_bytes)}",
+            "",
+        ]
+
+        df = self.to_dataframe().drop(columns=["depends_on", "error"])
+        df["stage"] = df["stage"].map(lambda stage: "-" if pd.isna(stage) else int(stage))
+        df["read_bytes"] = [
+            format_bytes(op.read_bytes) if not op.input_tables else "" for op in enabled
+        ]
+        df["input_bytes"] = [
+            format_bytes(op.input_bytes) if op.input_tables else "" for op in enabled
+        ]
+        lines.append(df.to_string(index=False))
+
+        lines += ["", "Table dependencies:"]
+        for op in enabled:
+            inputs = [
+                f"`{table}` (#{source})" if source is not None else f"`{table}`"
+                for table, source in op.input_tables.items()
+            ]
+            outputs = [f"`{table}`" for table in op.output_tables]
+            lines.append(
+                f"  #{op.index} {op.title}: "
+                f"{', '.join(inputs) or '-'} -> {', '.join(outputs) or '-'}"
+            )
+
+        if self.warnings:
+            lines += ["", "Warnings:"]
+            lines += [f"  - {warning}" for warning in self.warnings]
+
+        return "\n".join(lines)
+
+
+def explain_operations(
+    operations: Iterable[Operation], cache_hits: Iterable[int] = (), estimate: bool = True
+) -> DataflowPlan:
+    """Build the plan of running operations in order.
+
+    Operations depend on the operations creating the tables they read, and on earlier
+    operations reading or writing the tables they modify. The estimated size of a table
+    is the size of the inputs of the operation writing it, so it is an upper bound for
+    operations dropping rows.
+
+    Args:
+        operations: Operations with their template context already set.
+        cache_hits: Indices of operations whose results would be taken from a cache.
+        estimate: Whether to estimate the data read by sources from their storage.
+
+    Returns:
+        DataflowPlan: Plan of the operations.
+    """
+    cache_hits = set(cache_hits)
+    plan = DataflowPlan()
+
+    writers: dict[str, int] = {}
+    readers: dict[str, list[int]] = {}
+    table_bytes: dict[str, int | None] = {}
+    stages: dict[int, int] = {}
+    full_reads: dict[str, int] = {}
+    # Last operation creating tables unknown to the plan, as its parameters cannot be
+    # resolved or it names tables after the data
+    barrier: int | None = None
+
+    for index, operation in enumerate(operations, 1):
+        op_plan = OperationPlan(
+            index=index,
+            name=operation.name,
+            title=operation.title,
+            enabled=operation.is_enabled,
+            chunk_safe=operation.chunk_safe,
+            cache_hit=index in cache_hits,
+        )
+        plan.operations.append(op_plan)
+        if not operation.is_enabled:
+            continue
+
+        try:
+            inputs = operation.input_tables()
+            outputs = operation.output_tables()
+            dropped = operation.dropped_tables()
+        except Exception as e:
+            op_plan.error = f"{type(e).__name__}: {e}"
+            plan.warnings.append(f"#{index} {operation.title}: cannot resolve tables ({e})")
+            op_plan.depends_on = sorted(stages)
+            op_plan.stage = max(stages.values(), default=0) + 1
+            stages[index] = op_plan.stage
+            barrier = index
+            continue
+
+        op_plan.input_tables = {table: writers.get(table) for table in inputs}
+        op_plan.output_tables = outputs
+        op_plan.dropped_tables = dropped
+
+        depends_on = {writers[table] for table in inputs if table in writers}
+        for table in [*outputs, *dropped]:
+            if table in writers:
+                depends_on.add(writers[table])
+            depends_on.update(readers.get(table, []))
+        for table in inputs:
+            if table in writers:
+                continue
+            if barrier is not None:
+                depends_on.add(barrier)
+            else:
+                plan.warnings.append(
+                    f"#{index} {operation.title} reads `{table}`, "
+                    "which no earlier operation creates"
+                )
+        depends_on.discard(index)
+        op_plan.depends_on = sorted(depends_on)
+        op_plan.stage = max((stages[dep] for dep in depends_on), default=0) + 1
+        stages[index] = op_plan.stage
+
+        if inputs:
+            sizes = [table_bytes.get(table) for table in inputs]
+            if all(size is not None for size in sizes):
+                op_plan.input_bytes = sum(size for size in sizes if size is not None)
+            output_bytes = op_plan.input_bytes
+        else:
+            op_plan.read_bytes = _estimate_read_bytes(operation) if estimate else None
+            output_bytes = op_plan.read_bytes
+
+        if operation.filters_rows:
+            for table in inputs:
+                if table in full_reads:
+                    source = full_reads.pop(table)
+                    plan.warnings.append(
+                        f"#{index} {operation.title} drops rows of `{table}` after "
+                        f"#{source} {plan.operations[source - 1].title} read all of it, "
+                        "filtering the source could avoid reading data that is dropped"
+                    )
+
+        for table in inputs:
+            readers.setdefault(table, []).append(index)
+        for table in dropped:
+            writers.pop(table, None)
+            readers.pop(table, None)
+            table_bytes.pop(table, None)
+            full_reads.pop(table, None)
+        for table in outputs:
+            writers[table] = index
+            readers[table] = []
+            table_bytes[table] = output_bytes
+            if not inputs and operation.reads_full_source():
+                full_reads[table] = index
+            elif table not in inputs:
+                full_reads.pop(table, None)
+
+        if operation.creates_dynamic_tables:
+            barrier = index
+
+    return plan
+
+
+@dataclass
+class TableLiveness:
+    """Tables a dataflow run still needs after each operation.
+
+    Attributes:
+        live_after: Tables read by later operations after each enabled operation, by the
+            index of the operation starting at 1.
+        unused: Indices of operations whose outputs no later operation reads.
+    """
+
+    live_after: dict[int, set[str]] = field(default_factory=dict)
+    unused: set[int] = field(default_factory=set)
+
+
+def analyze_liveness(
+    operations: Iterable[Operation], keep_tables: Iterable[str] = ()
+) -> TableLiveness:
+    """Find the tables each operation of a run leaves for later operations.
+
+    Operations are walked backwards: a table is live before an operation if the operation
+    reads it, or if it is live after the operation and the operation does not replace it.
+    Operations writing only dead tables are unused, unless they may have side effects or drop
+    tables, and the tables they read do not become live.
+
+    Args:
+        operations: Operations with their template context already set.
+        keep_tables: Tables to keep until the end of the run, e.g. its results.
+
+    Returns:
+        TableLiveness: Live tables after each enabled operation and the unused operations.
+
+    Raises:
+        Exception: If the tables of an operation cannot be resolved from its parameters.
+    """
+    liveness = TableLiveness()
+    live = set(keep_tables)
+
+    for index, operation in reversed(list(enumerate(operations, 1))):
+        if not operation.is_enabled:
+            continue
+
+        inputs = operation.input_tables()
+        outputs = operation.output_tables()
+        dropped = operation.dropped_tables()
+        liveness.live_after[index] = set(live)
+
+        removable = bool(outputs) and not dropped and not operation.may_have_side_effects()
+        if removable and not live.intersection(outputs):
+            liveness.unused.add(index)
+            continue
+
+        live.difference_update(outputs)
+        live.difference_update(dropped)
+        live.update(inputs)
+
+    return liveness
+
+
+def _estimate_read_bytes(operation: Operation) -> int | None:
+    try:
+        return operation.estimate_read_bytes()
+    except Exception as e:
+        LOG.warning(f"Cannot estimate data read by {operation.title}: {type(e).__name__}: {e}")
+        return None
+
+
+def format_bytes(size: int | None) -> str:
+    """Format a number of bytes for humans, `unknown` if it is None."""
+    if size is None:
+        return "unknown"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
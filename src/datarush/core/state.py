@@ -0,0 +1,130 @@
+"""State kept by operations between runs."""
+
+import abc
+import json
+import os
+import tempfile
+from io import BytesIO
+from typing import Any
+
+from datarush.config import (
+    FilesystemStateStoreConfig,
+    S3StateStoreConfig,
+    StateStoreConfig,
+    StateStoreType,
+    get_datarush_config,
+)
+from datarush.utils.s3_client import S3Client, get_s3_client
+
+_STATE_FOLDER = "state"
+_STATE_SUFFIX = ".json"
+
+
+class StateStore(abc.ABC):
+    """Abstract base class for state stores.
+
+    States are JSON serializable dictionaries stored under keys made of `/` separated
+    names, e.g. `read_s3_dataset/my-bucket/events`.
+    """
+
+    @abc.abstractmethod
+    def read_state(self, key: str) -> dict[str, Any] | None:
+        """Read a state, None if there is no state under the key."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write_state(self, key: str, state: dict[str, Any]) -> None:
+        """Write a state, replacing the state stored under the key."""
+        raise NotImplementedError
+
+
+class S3StateStore(StateStore):
+    """S3 based state store, keeping every state in its own object."""
+
+    def __init__(self, config: S3StateStoreConfig | None = None):
+        """Initialize the S3 state store."""
+        config = config or get_datarush_config().state_store.s3
+        self._s3: S3Client = get_s3_client()
+        self._bucket = config.bucket
+        self._prefix = config.prefix
+
+    def read_state(self, key: str) -> dict[str, Any] | None:
+        """Read a state from S3, None if there is no state under the key."""
+        obj = self._s3.find_object(self._bucket, self._object_key(key))
+        return _parse_state(obj.read(), key) if obj is not None else None
+
+    def write_state(self, key: str, state: dict[str, Any]) -> None:
+        """Write a state to S3, a single PUT replaces it atomically."""
+        body = BytesIO(json.dumps(state).encode("utf-8"))
+        self._s3.put_object(self._bucket, self._object_key(key), body)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self._prefix}/{_STATE_FOLDER}/{_validate_key(key)}{_STATE_SUFFIX}"
+
+
+class FilesystemStateStore(StateStore):
+    """File system based state store, keeping every state in its own file."""
+
+    def __init__(self, config: FilesystemStateStoreConfig | None = None):
+        """Initialize the filesystem state store."""
+        config = config or get_datarush_config().state_store.filesystem
+        self._path = config.path
+
+    def read_state(self, key: str) -> dict[str, Any] | None:
+        """Read a state from the filesystem, None if there is no state under the key."""
+        try:
+            with open(self._file_path(key), "rb") as f:
+                return _parse_state(f.read(), key)
+        except FileNotFoundError:
+            return None
+
+    def write_state(self, key: str, state: dict[str, Any]) -> None:
+        """Write a state atomically by replacing its file with a complete new file."""
+        file_path = self._file_path(key)
+        folder = os.path.dirname(file_path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(file_path)}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _file_path(self, key: str) -> str:
+        return f"{self._path}/{_STATE_FOLDER}/{_validate_key(key)}{_STATE_SUFFIX}"
+
+
+def get_state_store(config: StateStoreConfig | None = None) -> StateStore:
+    """Get the configured state store."""
+    config = config or get_datarush_config().state_store
+
+    if config.store_type == StateStoreType.FILESYSTEM:
+        return FilesystemStateStore(config.filesystem)
+    elif config.store_type == StateStoreType.S3:
+        return S3StateStore(config.s3)
+    raise ValueError(f"Unknown state store type: {config.store_type}")
+
+
+def _validate_key(key: str) -> str:
+    """Check that a state key cannot point outside of the state folder."""
+    names = key.split("/")
+    if any(name in ("", ".", "..") for name in names):
+        raise ValueError(f"Invalid state key `{key}`, it must be made of `/` separated names")
+    return key
+
+
+def _parse_state(content: bytes, key: str) -> dict[str, Any]:
+    """Parse a stored state.
+
+    An unreadable state is an error rather than a missing one, since operations starting
+    over without their state could, for example, read all of a dataset again.
+    """
+    try:
+        state = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"State `{key}` is not valid JSON: {e}") from e
+    if not isinstance(state, dict):
+        raise ValueError(f"State `{key}` is not a JSON object")
+    return state
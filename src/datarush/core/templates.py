@@ -1,15 +1,26 @@
 """Dataflow template management."""
 
 import abc
+import copy
 import json
+import logging
 import os
+import random
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from functools import cache
 from io import BytesIO
-from typing import Any, TypedDict, cast
+from typing import Any, Callable, Iterator, NotRequired, TypedDict, cast
 
 from datarush.config import (
     FilesystemTemplateStoreConfig,
+    S3Config,
     S3TemplateStoreConfig,
+    TemplateStoreConfig,
     TemplateStoreType,
     get_datarush_config,
 )
@@ -17,11 +28,26 @@ from datarush.core.dataflow import Dataflow, Operation
 from datarush.core.operations import get_operation_type_by_name
 from datarush.core.types import ParameterSpec
 from datarush.exceptions import TemplateAlreadyExistsError
-from datarush.utils.s3_client import S3Client
+from datarush.utils.s3_client import S3Client, get_s3_client
 from datarush.version import __version__
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
 _TEMPLATES_FOLDER = "templates"
 _TEMPLATE_FILE = "template.json"
+_CATALOG_FILE = "_catalog.json"
+_CATALOG_FORMAT_VERSION = 1
+_CATALOG_LOCK_FILE = ".catalog.lock"
+# Conditional catalog updates retried before giving up, with a random backoff of up to
+# this many seconds times the attempt number
+_CATALOG_SAVE_ATTEMPTS = 10
+_CATALOG_SAVE_BACKOFF = 0.05
+_TEMPLATE_PATH_PATTERN = re.compile(rf"^([^/]+)/version=([^/]+)/{re.escape(_TEMPLATE_FILE)}$")
 
 ParameterDict = TypedDict("ParameterDict", ParameterSpec.__annotations__)  # type: ignore
 
@@ -42,6 +68,27 @@ class TemplateDict(TypedDict):
     datarush_version: str
 
 
+class CatalogEntry(TypedDict):
+    """Template version entry of the template catalog."""
+
+    name: str
+    version: str
+    created_at: str
+    datarush_version: str
+    size: int
+    # ETag of the S3 template object, known once the catalog was rebuilt from a listing
+    etag: NotRequired[str]
+
+
+class CatalogDict(TypedDict):
+    """Template catalog, an index of all template versions in the template store."""
+
+    format_version: int
+    # When the entries were last compared with the templates in the store
+    checked_at: NotRequired[str]
+    entries: list[CatalogEntry]
+
+
 class TemplateManager(abc.ABC):
     """Abstract base class for template managers."""
 
@@ -67,25 +114,38 @@ class TemplateManager(abc.ABC):
 
 
 class S3TemplateManager(TemplateManager):
-    """S3 based template manager."""
-
-    def __init__(self, config: S3TemplateStoreConfig | None = None):
-        """Initialize the S3 template manager."""
+    """S3 based template manager.
+
+    Listings are answered from a catalog object maintained next to the templates, so they
+    need a single GET instead of listing every object in the store. The catalog is updated
+    with conditional PUTs, so that concurrent saves do not drop each other's entries. Only
+    saving templates and `rebuild_catalog` write to the store, listings only read from it.
+    """
+
+    def __init__(self, config: S3TemplateStoreConfig | None = None, check_interval: float = 300.0):
+        """Initialize the S3 template manager.
+
+        Args:
+            config: Location of the template store.
+            check_interval: Seconds after which the catalog is compared with a listing of
+                the template objects, to pick up templates written by other means.
+        """
         config = config or get_datarush_config().template_store.s3
-        self._s3 = S3Client()
+        self._s3: S3Client = get_s3_client()
         self._bucket = config.bucket
         self._prefix = config.prefix
+        self._check_interval = check_interval
+        # ETag of the stored catalog last brought up to date in memory, the catalog it was
+        # brought up to and when
+        self._refreshed: tuple[str | None, CatalogDict, float] | None = None
 
     def list_templates(self) -> list[str]:
         """List all templates in the S3 template store."""
-        return self._s3.list_folders(self._bucket, f"{self._prefix}/{_TEMPLATES_FOLDER}")
+        return _catalog_templates(self.read_catalog())
 
     def list_template_versions(self, template_name: str) -> list[str]:
         """List all versions of a template in the S3 template store."""
-        raw_versions = self._s3.list_folders(
-            self._bucket, f"{self._prefix}/{_TEMPLATES_FOLDER}/{template_name}"
-        )
-        return [v.replace("version=", "") for v in raw_versions if v.startswith("version=")]
+        return _catalog_versions(self.read_catalog(), template_name)
 
     def read_template(self, template_name: str, version: str) -> TemplateDict:
         """Read a template from the S3 template store."""
@@ -94,50 +154,152 @@ class S3TemplateManager(TemplateManager):
         return cast(TemplateDict, json.load(obj))
 
     def write_template(self, template: TemplateDict, template_name: str, version: str) -> None:
-        """Write a template to the S3 template store."""
+        """Write a template to the S3 template store and add it to the catalog."""
         key = f"{self._prefix}/{_TEMPLATES_FOLDER}/{template_name}/version={version}/{_TEMPLATE_FILE}"
         if self._s3.list_object_keys(self._bucket, key):
             raise TemplateAlreadyExistsError(f"Template version {version} already exists")
 
-        buffer = BytesIO(json.dumps(template).encode("utf-8"))
-        self._s3.put_object(self._bucket, key, buffer)
+        body = json.dumps(template).encode("utf-8")
+        self._s3.put_object(self._bucket, key, BytesIO(body))
+
+        entry = _catalog_entry(template, template_name, version, size=len(body))
+        for attempt in range(_CATALOG_SAVE_ATTEMPTS):
+            catalog, etag = self._load_catalog()
+            if catalog is None:
+                # The scan already includes the new template version
+                self.rebuild_catalog()
+                return
+            if self._save_catalog(_add_catalog_entry(catalog, entry), etag):
+                return
+            _backoff(attempt)
+
+        LOG.warning("Template catalog kept changing while adding a template, rebuilding it")
+        self.rebuild_catalog()
+
+    def read_catalog(self) -> CatalogDict:
+        """Read the template catalog, bringing it up to date if it is missing or stale.
+
+        A catalog that is missing, unreadable or due for a check is brought up to date in
+        memory from a listing of the store, without saving it, so that listing templates
+        never writes to the store and works with read-only credentials.
+        """
+        catalog, etag = self._load_catalog()
+        if catalog is not None and not _check_due(catalog, self._check_interval):
+            return catalog
+
+        if self._refreshed is not None:
+            refreshed_etag, refreshed, refreshed_at = self._refreshed
+            # Reused until the stored catalog changes or the next check is due
+            if refreshed_etag == etag and time.monotonic() - refreshed_at < self._check_interval:
+                return refreshed
+
+        updated = self._update_catalog(catalog)
+        if catalog is None or _catalog_keys(updated) != _catalog_keys(catalog):
+            LOG.info("Template catalog does not match the template store")
+        self._refreshed = (etag, updated, time.monotonic())
+        return updated
+
+    def rebuild_catalog(self) -> CatalogDict:
+        """Rebuild the template catalog from a listing of the S3 template store and save it.
+
+        Only templates missing from the catalog, or whose object changed since, are read.
+        The listing is compared again if another process changed the catalog meanwhile.
+        """
+        LOG.info(f"Rebuilding template catalog in s3://{self._bucket}/{self._prefix}")
+
+        for attempt in range(_CATALOG_SAVE_ATTEMPTS):
+            stored, etag = self._load_catalog()
+            catalog = _mark_checked(self._update_catalog(stored))
+            # An empty store is cheap to scan, listing it should not write to it
+            if not catalog["entries"] or self._save_catalog(catalog, etag):
+                return catalog
+            _backoff(attempt)
+
+        LOG.warning("Template catalog kept changing while rebuilding it, not saving it")
+        return catalog
+
+    def _update_catalog(self, catalog: CatalogDict | None) -> CatalogDict:
+        """Build a catalog of the listed template objects, reusing the entries still valid.
+
+        Entries are matched with the listing by name and version, then by the ETag of the
+        object, or its size for entries without one, so that unchanged templates are not
+        read again.
+        """
+        known: dict[tuple[str, str], CatalogEntry] = {}
+        if catalog is not None:
+            known = {(entry["name"], entry["version"]): entry for entry in catalog["entries"]}
+
+        entries = []
+        for template_name, version, obj in self._template_objects():
+            entry = known.get((template_name, version))
+            if entry is None or not _entry_matches(entry, obj):
+                template = self.read_template(template_name, version)
+                entry = _catalog_entry(template, template_name, version, size=obj["Size"])
+                entry["created_at"] = obj["LastModified"].astimezone(timezone.utc).isoformat()
+            entry = entry.copy()
+            entry["etag"] = obj["ETag"]
+            entries.append(entry)
+        return _new_catalog(entries)
+
+    def _template_objects(self) -> list[tuple[str, str, dict[str, Any]]]:
+        """List the name, version and object of every template version, without reading them."""
+        templates_prefix = f"{self._prefix}/{_TEMPLATES_FOLDER}/"
+        objects = []
+        for obj in self._s3.list_objects(self._bucket, templates_prefix):
+            match = _TEMPLATE_PATH_PATTERN.match(obj["Key"].removeprefix(templates_prefix))
+            if match is not None:
+                objects.append((match.group(1), match.group(2), obj))
+        return objects
+
+    def _load_catalog(self) -> tuple[CatalogDict | None, str | None]:
+        """Load the template catalog and its ETag, no catalog if it is missing or unreadable."""
+        key = f"{self._prefix}/{_TEMPLATES_FOLDER}/{_CATALOG_FILE}"
+        found = self._s3.find_object_with_etag(self._bucket, key)
+        if found is None:
+            return None, None
+        obj, etag = found
+        return _parse_catalog(obj.read()), etag
+
+    def _save_catalog(self, catalog: CatalogDict, etag: str | None) -> bool:
+        """Save the template catalog if it was not changed since it was loaded with an ETag.
+
+        A single PUT replaces the catalog atomically. Returns False if another process
+        changed the catalog, which then has to be loaded again.
+        """
+        key = f"{self._prefix}/{_TEMPLATES_FOLDER}/{_CATALOG_FILE}"
+        body = BytesIO(json.dumps(catalog).encode("utf-8"))
+        return self._s3.put_object_if_unchanged(self._bucket, key, body, etag)
 
 
 class FilesystemTemplateManager(TemplateManager):
-    """File system based template manager."""
-
-    def __init__(self, config: FilesystemTemplateStoreConfig | None = None):
-        """Initialize the filesystem template manager."""
+    """File system based template manager.
+
+    Listings are answered from a catalog file maintained next to the templates, so they
+    do not need to walk the template folders. Processes update the catalog one at a time,
+    holding a lock file where the operating system supports it.
+    """
+
+    def __init__(
+        self, config: FilesystemTemplateStoreConfig | None = None, check_interval: float = 300.0
+    ):
+        """Initialize the filesystem template manager.
+
+        Args:
+            config: Location of the template store.
+            check_interval: Seconds after which the catalog is compared with the template
+                folders, to pick up templates written by other means.
+        """
         config = config or get_datarush_config().template_store.filesystem
         self._path = config.path
+        self._check_interval = check_interval
 
     def list_templates(self) -> list[str]:
         """List all templates in the filesystem template store."""
-        templates_path = f"{self._path}/{_TEMPLATES_FOLDER}"
-
-        if not os.path.exists(templates_path):
-            os.makedirs(templates_path, exist_ok=True)
-            return []
-
-        return [
-            folder
-            for folder in os.listdir(templates_path)
-            if os.path.isdir(os.path.join(templates_path, folder))
-        ]
+        return _catalog_templates(self.read_catalog())
 
     def list_template_versions(self, template_name: str) -> list[str]:
         """List all versions of a template in the filesystem template store."""
-        template_path = f"{self._path}/{_TEMPLATES_FOLDER}/{template_name}"
-
-        if not os.path.exists(template_path):
-            os.makedirs(template_path, exist_ok=True)
-            return []
-
-        return [
-            folder.replace("version=", "")
-            for folder in os.listdir(template_path)
-            if os.path.isdir(os.path.join(template_path, folder))
-        ]
+        return _catalog_versions(self.read_catalog(), template_name)
 
     def read_template(self, template_name: str, version: str) -> TemplateDict:
         """Read a template from the filesystem."""
@@ -148,7 +310,7 @@ class FilesystemTemplateManager(TemplateManager):
             return cast(TemplateDict, json.load(f))
 
     def write_template(self, template: TemplateDict, template_name: str, version: str) -> None:
-        """Write a template to the filesystem."""
+        """Write a template to the filesystem and add it to the catalog."""
         template_path = f"{self._path}/{_TEMPLATES_FOLDER}/{template_name}/version={version}"
         os.makedirs(template_path, exist_ok=True)
 
@@ -158,18 +320,227 @@ class FilesystemTemplateManager(TemplateManager):
         with open(f"{template_path}/{_TEMPLATE_FILE}", "w") as f:
             json.dump(template, f, indent=4)
 
+        size = os.path.getsize(f"{template_path}/{_TEMPLATE_FILE}")
+        entry = _catalog_entry(template, template_name, version, size=size)
+        with self._catalog_lock():
+            catalog = self._load_catalog()
+            if catalog is None:
+                # The scan already includes the new template version
+                self._rebuild_catalog()
+                return
+            self._save_catalog(_add_catalog_entry(catalog, entry))
+
+    def read_catalog(self) -> CatalogDict:
+        """Read the template catalog, rebuilding it if it is missing, unreadable or stale."""
+        catalog = self._load_catalog()
+        if catalog is not None and not _check_due(catalog, self._check_interval):
+            return catalog
+        if not os.path.isdir(f"{self._path}/{_TEMPLATES_FOLDER}"):
+            # Nothing was saved yet, listing the store should not write to it
+            return _new_catalog([])
+
+        with self._catalog_lock():
+            # Another process may have rebuilt or checked the catalog meanwhile
+            catalog = self._load_catalog()
+            if catalog is None:
+                return self._rebuild_catalog()
+            if _check_due(catalog, self._check_interval):
+                listed = {(name, version) for name, version, _ in self._template_files()}
+                if listed != _catalog_keys(catalog):
+                    LOG.info("Template catalog does not match the template store")
+                    return self._rebuild_catalog()
+                self._save_catalog(_mark_checked(catalog))
+            return catalog
+
+    def rebuild_catalog(self) -> CatalogDict:
+        """Rebuild the template catalog from a full scan of the template folders."""
+        with self._catalog_lock():
+            return self._rebuild_catalog()
+
+    def _rebuild_catalog(self) -> CatalogDict:
+        """Rebuild the template catalog, holding the catalog lock."""
+        LOG.info(f"Rebuilding template catalog in {self._path}/{_TEMPLATES_FOLDER}")
+
+        entries = []
+        for template_name, version, file_path in self._template_files():
+            template = self.read_template(template_name, version)
+            stat = os.stat(file_path)
+            entry = _catalog_entry(template, template_name, version, size=stat.st_size)
+            entry["created_at"] = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+            entries.append(entry)
+
+        catalog = _mark_checked(_new_catalog(entries))
+        if entries:
+            # An empty store is cheap to scan, listing it should not write to it
+            self._save_catalog(catalog)
+        return catalog
+
+    def _template_files(self) -> list[tuple[str, str, str]]:
+        """List the name, version and file of every template version, without reading them."""
+        templates_path = f"{self._path}/{_TEMPLATES_FOLDER}"
+        os.makedirs(templates_path, exist_ok=True)
+
+        files = []
+        for template_name in os.listdir(templates_path):
+            template_path = os.path.join(templates_path, template_name)
+            if not os.path.isdir(template_path):
+                continue
+            for folder in os.listdir(template_path):
+                file_path = os.path.join(template_path, folder, _TEMPLATE_FILE)
+                if folder.startswith("version=") and os.path.isfile(file_path):
+                    files.append((template_name, folder.removeprefix("version="), file_path))
+        return files
+
+    @contextmanager
+    def _catalog_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the catalog, shared by all processes using the store."""
+        templates_path = f"{self._path}/{_TEMPLATES_FOLDER}"
+        os.makedirs(templates_path, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{templates_path}/{_CATALOG_LOCK_FILE}", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_catalog(self) -> CatalogDict | None:
+        """Load the template catalog, None if it is missing or unreadable."""
+        try:
+            with open(f"{self._path}/{_TEMPLATES_FOLDER}/{_CATALOG_FILE}", "rb") as f:
+                return _parse_catalog(f.read())
+        except FileNotFoundError:
+            return None
+
+    def _save_catalog(self, catalog: CatalogDict) -> None:
+        """Save the template catalog atomically by replacing it with a complete new file."""
+        templates_path = f"{self._path}/{_TEMPLATES_FOLDER}"
+        fd, tmp_path = tempfile.mkstemp(dir=templates_path, prefix=f".{_CATALOG_FILE}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(catalog, f)
+            os.replace(tmp_path, f"{templates_path}/{_CATALOG_FILE}")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class CachingTemplateManager(TemplateManager):
+    """Template manager caching reads and listings of another template manager.
+
+    Template versions are immutable, so templates are read from the store only once per
+    name and version. Listings can change when templates are written elsewhere, so they
+    are cached for `list_ttl` seconds and refreshed immediately after writes.
+    """
+
+    def __init__(self, manager: TemplateManager, list_ttl: float = 30.0) -> None:
+        """Initialize the caching template manager."""
+        self._manager = manager
+        self._list_ttl = list_ttl
+        self._templates: dict[tuple[str, str], TemplateDict] = {}
+        self._listings: dict[tuple[str, ...], tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def list_templates(self) -> list[str]:
+        """List all templates in the template store."""
+        return self._cached_listing(("templates",), self._manager.list_templates)
+
+    def list_template_versions(self, template_name: str) -> list[str]:
+        """List all versions of a template in the template store."""
+        return self._cached_listing(
+            ("versions", template_name),
+            lambda: self._manager.list_template_versions(template_name),
+        )
+
+    def read_template(self, template_name: str, version: str) -> TemplateDict:
+        """Read a template from the cache or from the template store."""
+        key = (template_name, version)
+        with self._lock:
+            template = self._templates.get(key)
+
+        if template is None:
+            template = self._manager.read_template(template_name, version)
+            with self._lock:
+                self._templates[key] = template
+
+        # Callers may modify the template, keep the cached one intact
+        return copy.deepcopy(template)
+
+    def write_template(self, template: TemplateDict, template_name: str, version: str) -> None:
+        """Write a template to the template store and refresh the listings."""
+        self._manager.write_template(template, template_name, version)
+        self.clear_listings()
+
+    def clear_listings(self) -> None:
+        """Forget cached listings so they are read from the store on the next call."""
+        with self._lock:
+            self._listings.clear()
+
+    def _cached_listing(
+        self, key: tuple[str, ...], list_func: Callable[[], list[str]]
+    ) -> list[str]:
+        """Get a listing from the cache if it has not expired, otherwise from the store."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(key)
+
+        if cached is not None and now - cached[0] < self._list_ttl:
+            listing = cached[1]
+        else:
+            listing = list_func()
+            with self._lock:
+                self._listings[key] = (now, listing)
+
+        return list(listing)
+
 
-@cache
 def get_template_manager() -> TemplateManager:
-    """Get the configured template manager."""
-    config = get_datarush_config().template_store
+    """Get the template manager of the configured template store.
+
+    Managers are shared by all callers using the same template store and cache template
+    reads and listings.
+    """
+    config = get_datarush_config()
+    store_config = config.template_store
+
+    if store_config.store_type == TemplateStoreType.FILESYSTEM:
+        return _get_cached_template_manager(store_config, store_config.filesystem, None)
+    elif store_config.store_type == TemplateStoreType.S3:
+        return _get_cached_template_manager(store_config, store_config.s3, config.s3)
+    raise ValueError(f"Unknown template store type: {store_config.store_type}")
+
 
-    if config.store_type == TemplateStoreType.FILESYSTEM:
-        return FilesystemTemplateManager(config.filesystem)
-    elif config.store_type == TemplateStoreType.S3:
-        return S3TemplateManager(config.s3)
+def clear_template_managers() -> None:
+    """Forget the shared template managers, e.g. in a forked process that must build its own."""
+    _get_cached_template_manager.cache_clear()
+
+
+@cache
+def _get_cached_template_manager(
+    store_config: TemplateStoreConfig,
+    location: FilesystemTemplateStoreConfig | S3TemplateStoreConfig,
+    s3_config: S3Config | None,
+) -> TemplateManager:
+    """Build a template manager, the S3 configuration is part of the key of S3 stores."""
+    manager: TemplateManager
+    check_interval = store_config.catalog_check_interval
+    if isinstance(location, FilesystemTemplateStoreConfig):
+        manager = FilesystemTemplateManager(location, check_interval)
     else:
-        raise ValueError(f"Unknown template store type: {config.store_type}")
+        manager = S3TemplateManager(location, check_interval)
+    return CachingTemplateManager(manager, list_ttl=store_config.list_cache_ttl)
+
+
+def read_dataflow(template_name: str, version: str) -> Dataflow:
+    """Read a template from the configured template store and convert it to a dataflow.
+
+    Dataflows hold run state, so a new one is built on every call. Building it from the
+    cached template is cheap compared to reading the template from the store.
+    """
+    return template_to_dataflow(get_template_manager().read_template(template_name, version))
 
 
 def template_to_dataflow(template: TemplateDict) -> Dataflow:
@@ -202,3 +573,98 @@ def dataflow_to_template(dataflow: Dataflow) -> TemplateDict:
     ]
 
     return {"parameters": parameters, "operations": operations, "datarush_version": __version__}
+
+
+def _catalog_entry(
+    template: TemplateDict, template_name: str, version: str, size: int
+) -> CatalogEntry:
+    """Create a catalog entry for a template version written now."""
+    return {
+        "name": template_name,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "datarush_version": template.get("datarush_version", ""),
+        "size": size,
+    }
+
+
+def _new_catalog(entries: list[CatalogEntry]) -> CatalogDict:
+    """Create a template catalog with entries ordered by name and creation time."""
+    entries = sorted(entries, key=lambda entry: (entry["name"], entry["created_at"]))
+    return {"format_version": _CATALOG_FORMAT_VERSION, "entries": entries}
+
+
+def _add_catalog_entry(catalog: CatalogDict, entry: CatalogEntry) -> CatalogDict:
+    """Add an entry to the catalog, replacing an existing entry of the same version."""
+    entries = [
+        existing
+        for existing in catalog["entries"]
+        if (existing["name"], existing["version"]) != (entry["name"], entry["version"])
+    ]
+    updated = _new_catalog([*entries, entry])
+    if "checked_at" in catalog:
+        updated["checked_at"] = catalog["checked_at"]
+    return updated
+
+
+def _backoff(attempt: int) -> None:
+    """Wait before retrying a conditional catalog update, so that writers spread out."""
+    time.sleep(random.uniform(0, _CATALOG_SAVE_BACKOFF * (attempt + 1)))
+
+
+def _mark_checked(catalog: CatalogDict) -> CatalogDict:
+    """Record that the catalog entries were just compared with the template store."""
+    catalog["checked_at"] = datetime.now(timezone.utc).isoformat()
+    return catalog
+
+
+def _entry_matches(entry: CatalogEntry, obj: dict[str, Any]) -> bool:
+    """Check whether a catalog entry still describes a listed S3 template object."""
+    if "etag" in entry:
+        return entry["etag"] == str(obj["ETag"])
+    return entry["size"] == int(obj["Size"])
+
+
+def _check_due(catalog: CatalogDict, interval: float) -> bool:
+    """Check whether the catalog has to be compared with the template store again.
+
+    Catalogs never checked, e.g. written by older versions, are checked right away.
+    """
+    checked_at = catalog.get("checked_at")
+    if not checked_at:
+        return True
+    try:
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(checked_at)
+    except (TypeError, ValueError):
+        return True
+    return age.total_seconds() >= interval
+
+
+def _catalog_keys(catalog: CatalogDict) -> set[tuple[str, str]]:
+    """Get the name and version of every template version in the catalog."""
+    return {(entry["name"], entry["version"]) for entry in catalog["entries"]}
+
+
+def _parse_catalog(content: bytes) -> CatalogDict | None:
+    """Parse a stored template catalog, None if it is unreadable or has an unknown format."""
+    try:
+        catalog = json.loads(content)
+    except ValueError:
+        LOG.warning("Template catalog is not valid JSON")
+        return None
+
+    if not isinstance(catalog, dict) or catalog.get("format_version") != _CATALOG_FORMAT_VERSION:
+        LOG.warning("Template catalog has an unknown format")
+        return None
+
+    return cast(CatalogDict, catalog)
+
+
+def _catalog_templates(catalog: CatalogDict) -> list[str]:
+    """List template names in the catalog."""
+    return list(dict.fromkeys(entry["name"] for entry in catalog["entries"]))
+
+
+def _catalog_versions(catalog: CatalogDict, template_name: str) -> list[str]:
+    """List versions of a template in the catalog, oldest first."""
+    return [entry["version"] for entry in catalog["entries"] if entry["name"] == template_name]
@@ -17,16 +17,51 @@ class ContentType(StrEnum):
 
     CSV = "CSV"
     JSON = "JSON"
+    JSONL = "JSONL"
     PARQUET = "PARQUET"
+    ARROW = "ARROW"
 
     def extension(self) -> list[str]:
         """Get file extensions associated with the content type."""
         return {
             ContentType.CSV: [".csv"],
             ContentType.JSON: [".json"],
+            ContentType.JSONL: [".jsonl", ".ndjson"],
             ContentType.PARQUET: [".parquet"],
+            ContentType.ARROW: [".arrow", ".feather"],
         }[self]
 
+    def supports_compression(self) -> bool:
+        """Check whether files of the content type can be compressed as a whole."""
+        return self in (ContentType.CSV, ContentType.JSON, ContentType.JSONL)
+
+
+class Compression(StrEnum):
+    """Enum representing compressions of text files."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    BZ2 = "bz2"
+
+    def extension(self) -> str:
+        """Get the file extension added by the compression."""
+        return {
+            Compression.NONE: "",
+            Compression.GZIP: ".gz",
+            Compression.ZSTD: ".zst",
+            Compression.BZ2: ".bz2",
+        }[self]
+
+
+class ParquetCompression(StrEnum):
+    """Enum representing compression codecs of Parquet column chunks."""
+
+    SNAPPY = "snappy"
+    ZSTD = "zstd"
+    GZIP = "gzip"
+    NONE = "none"
+
 
 class ValueType(StrEnum):
     """Input parameters types."""
@@ -73,6 +108,19 @@ class TableStr(str):
         )
 
 
+class OutputTableStr(str):
+    """Special string type to mark field that takes the name of a table the operation writes."""
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        """Get custom schema for Pydantic validation."""
+        return core_schema.no_info_after_validator_function(
+            lambda v: OutputTableStr(v), core_schema.str_schema()
+        )
+
+
 class ColumnStr(str):
     """Special string type to mark field that takes column name as input."""
 
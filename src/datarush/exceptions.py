@@ -20,6 +20,14 @@ class TemplateAlreadyExistsError(DataRushError):
     """Template already exists error."""
 
 
+class QueueFullError(DataRushError):
+    """Run queue is full error."""
+
+
+class IncrementalReadError(DataRushError):
+    """Incremental read cannot tell which records were already read error."""
+
+
 class OperationError(DataRushError):
     """Operation errors."""
 
@@ -1,14 +1,30 @@
 """Functions for executing DataRush templates."""
 
+from __future__ import annotations
+
 import argparse
+import json
 import logging
-from typing import Any
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Iterable
 
 from datarush.config import DatarushConfig, set_datarush_config
+from datarush.core.dataflow import Dataflow
 from datarush.core.operations import register_operation_type
-from datarush.core.templates import get_template_manager, template_to_dataflow
+from datarush.core.templates import (
+    TemplateDict,
+    clear_template_managers,
+    get_template_manager,
+    template_to_dataflow,
+)
 from datarush.core.types import ParameterSpec
 from datarush.utils.logging import DataflowLogger, setup_logging
+from datarush.utils.profiling import RunProfile
+from datarush.utils.s3_client import clear_s3_clients
 from datarush.utils.type_utils import convert_to_type
 
 LOG = logging.getLogger(__name__)
@@ -19,7 +35,10 @@ def run_template(
     version: str,
     parameters: dict[str, Any] | None = None,
     config: DatarushConfig | None = None,
-) -> None:
+    profile: bool = False,
+    release_tables: bool = False,
+    prefetch_workers: int = 0,
+) -> RunProfile | None:
     """Run a template by its name and version.
 
     Args:
@@ -27,6 +46,14 @@ def run_template(
         version: Version of the template to run.
         parameters: Optional dictionary of parameter values to set for the template.
         config: Optional DatarushConfig to use. If not provided, the default configuration is loaded from environment variables.
+        profile: Whether to profile time, memory and table sizes of each operation.
+        release_tables: Whether to drop tables once no later operation reads them and to
+            skip operations whose output tables are never read.
+        prefetch_workers: Number of sources read at the same time ahead of their turn, none
+            if 0.
+
+    Returns:
+        RunProfile | None: Profile of the run if profiling was requested.
     """
     # Setup logging if not already configured
     if not logging.getLogger().handlers:
@@ -34,7 +61,7 @@ def run_template(
 
     LOG.info(f"Starting template execution: {name} {version}")
 
-    _setup(config)
+    setup(config)
 
     LOG.info(f"Loading template: {name} {version}")
     template = get_template_manager().read_template(name, version)
@@ -51,7 +78,97 @@ def run_template(
         LOG.debug(f"Parameters set: {list(parameter_values.keys())}")
 
     with DataflowLogger(name, version, LOG):
-        dataflow.run()
+        dataflow.run(
+            profile=profile, release_tables=release_tables, prefetch_workers=prefetch_workers
+        )
+
+    return dataflow.profile
+
+
+@dataclass
+class RunResult:
+    """Outcome of a single template run within a batch."""
+
+    parameters: dict[str, Any]
+    succeeded: bool
+    duration: float
+    error: str | None = None
+
+
+def run_template_batch(
+    name: str,
+    version: str,
+    parameter_sets: Iterable[dict[str, Any]],
+    config: DatarushConfig | None = None,
+    max_workers: int = 1,
+    release_tables: bool = False,
+    prefetch_workers: int = 0,
+) -> list[RunResult]:
+    """Run a template once for each of the given parameter sets.
+
+    The template is loaded and converted to a dataflow once, then reused for every run.
+    With more than one worker the runs are spread over a process pool where each process
+    builds the dataflow once and reuses it, along with its S3 clients, for all its runs.
+    A failing run does not stop the batch, its error is reported in the results instead.
+
+    Args:
+        name: Name of the template to run.
+        version: Version of the template to run.
+        parameter_sets: Parameter values for each run.
+        config: Optional DatarushConfig to use. If not provided, the default configuration is loaded from environment variables.
+        max_workers: Number of processes to run the parameter sets in. Runs are executed in the current process if 1.
+        release_tables: Whether to drop tables once no later operation reads them and to
+            skip operations whose output tables are never read.
+        prefetch_workers: Number of sources each run reads at the same time ahead of their
+            turn, none if 0.
+
+    Returns:
+        list[RunResult]: Result of each run, in the order of the parameter sets.
+    """
+    # Setup logging if not already configured
+    if not logging.getLogger().handlers:
+        setup_logging(level="INFO")
+
+    setup(config)
+
+    parameter_sets = list(parameter_sets)
+    LOG.info(
+        f"Starting batch execution of {name} {version}: "
+        f"{len(parameter_sets)} runs, {max_workers} workers"
+    )
+
+    LOG.info(f"Loading template: {name} {version}")
+    template = get_template_manager().read_template(name, version)
+
+    with DataflowLogger(name, version, LOG):
+        if max_workers <= 1:
+            dataflow = template_to_dataflow(template)
+            results = [
+                run_parameter_set(dataflow, parameters, release_tables, prefetch_workers)
+                for parameters in parameter_sets
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_batch_worker,
+                initargs=(config, template),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        partial(
+                            _run_batch_item,
+                            release_tables=release_tables,
+                            prefetch_workers=prefetch_workers,
+                        ),
+                        parameter_sets,
+                    )
+                )
+
+    failed = [result for result in results if not result.succeeded]
+    LOG.info(
+        f"Batch execution finished: {len(results) - len(failed)} succeeded, {len(failed)} failed"
+    )
+    return results
 
 
 def run_template_from_command_line(config: DatarushConfig | None = None) -> None:
@@ -66,7 +183,7 @@ def run_template_from_command_line(config: DatarushConfig | None = None) -> None
 
     LOG.info("Starting DataRush template runner from command line")
 
-    _setup(config)
+    setup(config)
 
     argparser = argparse.ArgumentParser(description="Datarush Template Runner")
 
@@ -77,8 +194,69 @@ def run_template_from_command_line(config: DatarushConfig | None = None) -> None
         "--version", type=str, required=True, help="Version of the template to run"
     )
 
+    argparser.add_argument(
+        "--parameters-file",
+        type=str,
+        default=None,
+        help="JSON file with a list of parameter sets (or JSON Lines, one set per line) "
+        "to run the template once for each of them",
+    )
+    argparser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes to run parameter sets from --parameters-file in",
+    )
+
+    argparser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="JSON file to write time, memory and table sizes of each operation to",
+    )
+
+    argparser.add_argument(
+        "--release-tables",
+        action="store_true",
+        help="Drop tables once no later operation reads them and skip operations whose "
+        "output tables are never read, if all operations declare the tables they read",
+    )
+
+    argparser.add_argument(
+        "--prefetch-workers",
+        type=int,
+        default=0,
+        help="Number of sources read at the same time ahead of their turn, none if 0",
+    )
+
+    argparser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the tables, stages and estimated data volumes of the operations "
+        "instead of running the template",
+    )
+
     args, _ = argparser.parse_known_args()
 
+    if args.parameters_file:
+        if args.explain:
+            argparser.error("--explain cannot be combined with --parameters-file")
+        results = run_template_batch(
+            args.template,
+            args.version,
+            _read_parameter_sets(args.parameters_file),
+            config=config,
+            max_workers=args.workers,
+            release_tables=args.release_tables,
+            prefetch_workers=args.prefetch_workers,
+        )
+        for result in results:
+            status = "OK" if result.succeeded else f"FAILED: {result.error}"
+            print(f"{json.dumps(result.parameters)}\t{result.duration:.2f}s\t{status}")
+        if not all(result.succeeded for result in results):
+            sys.exit(1)
+        return
+
     LOG.info(f"Loading template: {args.template} {args.version}")
     template = get_template_manager().read_template(args.template, args.version)
     dataflow = template_to_dataflow(template)
@@ -99,8 +277,98 @@ def run_template_from_command_line(config: DatarushConfig | None = None) -> None
     dataflow.set_parameters_values(parameter_values)
     LOG.debug(f"Parameters set: {list(parameter_values.keys())}")
 
+    if args.explain:
+        print(dataflow.explain().to_text())
+        return
+
     with DataflowLogger(args.template, args.version, LOG):
-        dataflow.run()
+        dataflow.run(
+            profile=bool(args.profile),
+            release_tables=args.release_tables,
+            prefetch_workers=args.prefetch_workers,
+        )
+
+    if args.profile and dataflow.profile is not None:
+        with open(args.profile, "w") as f:
+            f.write(dataflow.profile.to_json())
+        LOG.info(f"Run profile written to {args.profile}")
+
+
+def _read_parameter_sets(path: str) -> list[dict[str, Any]]:
+    """Read parameter sets from a JSON list or a JSON Lines file."""
+    with open(path, "r") as f:
+        content = f.read()
+
+    try:
+        parameter_sets = json.loads(content)
+    except json.JSONDecodeError:
+        parameter_sets = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    if not isinstance(parameter_sets, list):
+        raise ValueError(f"Parameters file {path} must contain a list of parameter sets")
+    return parameter_sets
+
+
+def run_parameter_set(
+    dataflow: Dataflow,
+    parameters: dict[str, Any],
+    release_tables: bool = False,
+    prefetch_workers: int = 0,
+) -> RunResult:
+    """Run a dataflow with one parameter set and capture its outcome.
+
+    The dataflow can be reused for further parameter sets, e.g. by a batch or a server.
+    A failing run is reported in the result instead of raising.
+
+    Args:
+        dataflow: Dataflow of the template to run.
+        parameters: Parameter values of the run, converted to the types of the parameters.
+        release_tables: Whether to drop tables once no later operation reads them and to
+            skip operations whose output tables are never read.
+        prefetch_workers: Number of sources read at the same time ahead of their turn, none
+            if 0.
+
+    Returns:
+        RunResult: Outcome and duration of the run.
+    """
+    start_time = time.perf_counter()
+    try:
+        parameter_values = _parse_parameter_values_from_specs(dataflow.parameters, parameters)
+        dataflow.set_parameters_values(parameter_values)
+        dataflow.run(release_tables=release_tables, prefetch_workers=prefetch_workers)
+    except Exception as e:
+        LOG.exception(f"Run with parameters {parameters} failed")
+        return RunResult(
+            parameters=parameters,
+            succeeded=False,
+            duration=time.perf_counter() - start_time,
+            error=f"{type(e).__name__}: {e}",
+        )
+    return RunResult(
+        parameters=parameters, succeeded=True, duration=time.perf_counter() - start_time
+    )
+
+
+_worker_dataflow: Dataflow | None = None
+
+
+def _init_batch_worker(config: DatarushConfig | None, template: TemplateDict) -> None:
+    """Set up a batch worker process and build the dataflow it reuses for all its runs."""
+    global _worker_dataflow
+    # Forked workers inherit the clients of the parent process, whose connections must not
+    # be shared between processes
+    clear_s3_clients()
+    clear_template_managers()
+    setup(config)
+    _worker_dataflow = template_to_dataflow(template)
+
+
+def _run_batch_item(
+    parameters: dict[str, Any], release_tables: bool = False, prefetch_workers: int = 0
+) -> RunResult:
+    """Run one parameter set in a batch worker process."""
+    assert _worker_dataflow is not None, "Batch worker is not initialized"
+    return run_parameter_set(_worker_dataflow, parameters, release_tables, prefetch_workers)
 
 
 def _parse_parameter_values_from_specs(
@@ -124,8 +392,11 @@ def _parse_parameter_values_from_specs(
     return result
 
 
-def _setup(config: DatarushConfig | None = None) -> None:
-    """Initialize the Datarush configuration as contextvar and register operations."""
+def setup(config: DatarushConfig | None = None) -> None:
+    """Initialize the Datarush configuration as contextvar and register custom operations.
+
+    Entry points running templates call it once before running them.
+    """
     LOG.info("Setting up DataRush configuration")
 
     config = config or DatarushConfig()
@@ -0,0 +1,272 @@
+"""Long-lived worker server executing DataRush templates on request."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from datarush.config import DatarushConfig, get_datarush_config, set_datarush_config
+from datarush.core.templates import read_dataflow
+from datarush.exceptions import QueueFullError
+from datarush.run import run_parameter_set, setup
+from datarush.utils.logging import setup_logging
+
+LOG = logging.getLogger(__name__)
+
+
+class JobStatus(StrEnum):
+    """Status of a template run job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """Template run requested from the server."""
+
+    template: str
+    version: str
+    parameters: dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    duration: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert job to a JSON serializable dictionary."""
+        return asdict(self)
+
+
+class TemplateRunServer:
+    """Serve template runs over HTTP from a warm, long-lived process.
+
+    Imports, registered operations, loaded templates and S3 clients are kept for the lifetime
+    of the server, so runs skip the start-up cost of a new process. Submitted runs wait in
+    a bounded queue and at most `max_concurrency` of them are executed at the same time.
+
+    Endpoints:
+        POST /runs: Submit a run, body `{"template": ..., "version": ..., "parameters": {...}}`.
+        GET /runs/<id>: Get the status of a run.
+        GET /health: Get the server status.
+    """
+
+    def __init__(
+        self,
+        config: DatarushConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_concurrency: int = 4,
+        max_queue_size: int = 100,
+        max_finished_jobs: int = 1000,
+    ) -> None:
+        """Initialize the server, set up the configuration and register operations."""
+        setup(config)
+        self._config = get_datarush_config()
+        self._max_concurrency = max_concurrency
+        self._max_finished_jobs = max_finished_jobs
+
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=max_queue_size)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+
+        self._http = ThreadingHTTPServer((host, port), _make_request_handler(self))
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Get the host and port the server listens on."""
+        host, port = self._http.server_address[:2]
+        return str(host), int(port)
+
+    def submit(self, template: str, version: str, parameters: dict[str, Any]) -> Job:
+        """Queue a template run.
+
+        Raises:
+            QueueFullError: If the queue of pending runs is full.
+        """
+        job = Job(template=template, version=version, parameters=parameters)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"Run queue is full ({self._queue.maxsize} pending runs)")
+            self._jobs[job.id] = job
+            self._evict_finished_jobs()
+        LOG.info(f"Queued run {job.id}: {template} {version}")
+        return job
+
+    def get_job(self, job_id: str) -> Job | None:
+        """Get a run by its ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def health(self) -> dict[str, Any]:
+        """Get the server status."""
+        with self._lock:
+            running = sum(job.status == JobStatus.RUNNING for job in self._jobs.values())
+        return {
+            "status": "ok",
+            "queued": self._queue.qsize(),
+            "running": running,
+            "max_concurrency": self._max_concurrency,
+        }
+
+    def start(self) -> None:
+        """Start worker threads executing queued runs."""
+        for i in range(self._max_concurrency):
+            worker = threading.Thread(target=self._work, name=f"datarush-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def serve_forever(self) -> None:
+        """Start workers and handle HTTP requests until shutdown."""
+        self.start()
+        host, port = self.address
+        LOG.info(f"DataRush server listening on http://{host}:{port}")
+        try:
+            self._http.serve_forever()
+        finally:
+            self._http.server_close()
+
+    def shutdown(self) -> None:
+        """Stop handling requests and stop workers once they finish their current run."""
+        self._http.shutdown()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+
+    def _work(self) -> None:
+        """Execute queued runs until a stop signal is received."""
+        # Context variables are not inherited by threads
+        set_datarush_config(self._config)
+
+        while (job := self._queue.get()) is not None:
+            job.status = JobStatus.RUNNING
+            LOG.info(f"Starting run {job.id}: {job.template} {job.version}")
+            try:
+                dataflow = read_dataflow(job.template, job.version)
+                result = run_parameter_set(dataflow, job.parameters)
+                job.duration, job.error = result.duration, result.error
+                job.status = JobStatus.SUCCEEDED if result.succeeded else JobStatus.FAILED
+            except Exception as e:
+                LOG.exception(f"Run {job.id} failed")
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = JobStatus.FAILED
+            LOG.info(f"Finished run {job.id}: {job.status}")
+
+    def _evict_finished_jobs(self) -> None:
+        """Forget the oldest finished runs once there are too many of them."""
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+        ]
+        for job_id in finished[: max(0, len(finished) - self._max_finished_jobs)]:
+            del self._jobs[job_id]
+
+
+def _make_request_handler(server: TemplateRunServer) -> type[BaseHTTPRequestHandler]:
+    """Create an HTTP request handler bound to the given server."""
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        """HTTP request handler for the template run server."""
+
+        def do_GET(self) -> None:  # noqa: N802
+            """Handle run status and health requests."""
+            if self.path == "/health":
+                self._respond(HTTPStatus.OK, server.health())
+            elif self.path.startswith("/runs/"):
+                job = server.get_job(self.path.removeprefix("/runs/"))
+                if job is None:
+                    self._respond(HTTPStatus.NOT_FOUND, {"error": "Run not found"})
+                else:
+                    self._respond(HTTPStatus.OK, job.to_dict())
+            else:
+                self._respond(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            """Handle run submissions."""
+            if self.path != "/runs":
+                self._respond(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                template, version = body["template"], body["version"]
+                parameters = body.get("parameters") or {}
+            except (ValueError, KeyError, TypeError) as e:
+                self._respond(HTTPStatus.BAD_REQUEST, {"error": f"Invalid request: {e}"})
+                return
+
+            try:
+                job = server.submit(template, version, parameters)
+            except QueueFullError as e:
+                self._respond(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+                return
+
+            self._respond(HTTPStatus.ACCEPTED, job.to_dict())
+
+        def log_message(self, format: str, *args: Any) -> None:
+            """Log requests through the module logger instead of stderr."""
+            LOG.debug(format % args)
+
+        def _respond(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return RequestHandler
+
+
+def serve_from_command_line(config: DatarushConfig | None = None) -> None:
+    """Run the template run server using command-line arguments.
+
+    Args:
+        config: Optional DatarushConfig to use. If not provided, the default configuration is loaded from environment variables.
+    """
+    if not logging.getLogger().handlers:
+        setup_logging(level="INFO")
+
+    argparser = argparse.ArgumentParser(description="Datarush Template Run Server")
+    argparser.add_argument("--host", type=str, default="127.0.0.1", help="Host to listen on")
+    argparser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    argparser.add_argument(
+        "--concurrency", type=int, default=4, help="Maximum number of concurrent runs"
+    )
+    argparser.add_argument(
+        "--queue-size", type=int, default=100, help="Maximum number of pending runs"
+    )
+    args, _ = argparser.parse_known_args()
+
+    server = TemplateRunServer(
+        config=config,
+        host=args.host,
+        port=args.port,
+        max_concurrency=args.concurrency,
+        max_queue_size=args.queue_size,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOG.info("Shutting down DataRush server")
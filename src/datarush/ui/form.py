@@ -17,6 +17,7 @@ from datarush.core.dataflow import Operation, Tableset
 from datarush.core.types import (
     ColumnStr,
     ColumnStrMeta,
+    Compression,
     ContentType,
     PartitionFilter,
     PartitionFilterGroup,
@@ -230,7 +231,7 @@ def model_dict_from_streamlit[T: BaseModel](
 
         elif field.annotation is bytes:
             content_type: ContentType | None = model_dict.get("content_type")
-            extension = content_type.extension() if content_type else None
+            extension = _file_extensions(content_type) if content_type else None
             file = st.file_uploader("Choose File", type=extension, key=f"local_file_file_df_{key}")
             value = file.getvalue() if file else None
 
@@ -239,6 +240,11 @@ def model_dict_from_streamlit[T: BaseModel](
                 value=cast(bool, current_value if current_value is not None else default), **kwargs
             )
 
+        elif types_are_equal(field.annotation, int | None):  # type: ignore
+            value = st.number_input(
+                value=current_value if current_value is not None else default, step=1, **kwargs
+            )
+
         elif issubclass(field.annotation, str):  # type: ignore
             value = st.text_input(
                 value=current_value if current_value is not None else (default or ""), **kwargs
@@ -324,6 +330,18 @@ def model_dict_from_streamlit[T: BaseModel](
     return model_dict
 
 
+def _file_extensions(content_type: ContentType) -> list[str]:
+    """Get extensions of uploaded files, including compressed ones for text files."""
+    extensions = content_type.extension()
+    if not content_type.supports_compression():
+        return extensions
+    return [
+        f"{extension}{compression.extension()}"
+        for extension in extensions
+        for compression in Compression
+    ]
+
+
 def _get_relevant_columns(
     tableset: Tableset | None = None,
     column_meta: ColumnStrMeta | None = None,
@@ -22,13 +22,21 @@ def operations_page() -> None:
         show_operations()
         show_add_operation_ui()
 
-        if st.button("Run Operations"):
+        run_section, profile_section = st.columns([2, 2])
+        profile = profile_section.checkbox(
+            "Profile",
+            help="Record time, memory and table sizes of each operation (slows the run down)",
+        )
+
+        if run_section.button("Run Operations"):
             try:
-                get_dataflow().run()
+                get_dataflow().run(profile=profile)
                 st.rerun()
             except OperationError as e:
                 st.error(e.summary())
 
+        show_profile()
+
 
 def show_tables() -> None:
     """Display the currently loaded tables."""
@@ -77,6 +85,54 @@ def show_tables() -> None:
             st.code(str(table.df))
 
 
+def show_profile() -> None:
+    """Display the profile of the last run, if it was profiled."""
+    profile = get_dataflow().profile
+    if profile is None or not profile.operations:
+        return
+
+    with st.expander("Run Profile", expanded=True):
+        slowest = profile.slowest()
+        if slowest is not None:
+            st.write(
+                f"Total {profile.wall_time:.2f}s, slowest operation: "
+                f"**{slowest.index}. {slowest.title}** ({slowest.wall_time:.2f}s)"
+            )
+
+        st.dataframe(
+            profile.to_dataframe(),
+            hide_index=True,
+            column_config={
+                "index": "#",
+                "operation": "Operation",
+                "cache_hit": "Cached",
+                "wall_time_s": st.column_config.NumberColumn("Wall (s)", format="%.3f"),
+                "wall_time_share": st.column_config.ProgressColumn(
+                    "Share", min_value=0.0, max_value=1.0
+                ),
+                "cpu_time_s": st.column_config.NumberColumn("CPU (s)", format="%.3f"),
+                "peak_rss_mib": st.column_config.NumberColumn("Peak RSS (MiB)", format="%.1f"),
+                "traced_memory_delta_mib": st.column_config.NumberColumn(
+                    "Allocated (MiB)", format="%.1f"
+                ),
+                "traced_memory_peak_mib": st.column_config.NumberColumn(
+                    "Peak Allocated (MiB)", format="%.1f"
+                ),
+                "rows_in": "Rows In",
+                "rows_out": "Rows Out",
+                "memory_in_mib": st.column_config.NumberColumn("Memory In (MiB)", format="%.1f"),
+                "memory_out_mib": st.column_config.NumberColumn("Memory Out (MiB)", format="%.1f"),
+                "error": "Error",
+            },
+        )
+        st.download_button(
+            "Download JSON",
+            data=profile.to_json(),
+            file_name="datarush_profile.json",
+            mime="application/json",
+        )
+
+
 def show_operations() -> None:
     """Display and manage the list of operations."""
     st.subheader("Operations")
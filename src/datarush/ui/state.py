@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any, NamedTuple, cast
+from typing import Any, Iterable, NamedTuple, cast
 
 import streamlit as st
 
-from datarush.core.dataflow import Dataflow, Operation, Tableset
+from datarush.core.dataflow import Dataflow, Operation, Tableset, _profile_operation
 from datarush.core.types import ParameterSpec
 from datarush.exceptions import OperationError
+from datarush.utils.profiling import RunProfiler
 
 
 def get_dataflow() -> DataflowUI:
@@ -83,37 +84,68 @@ class DataflowUI(Dataflow):
 
         return self._operation_cache[operation_index].tableset
 
-    def run(self) -> None:
+    def run(
+        self,
+        profile: bool = False,
+        release_tables: bool = False,
+        keep_tables: Iterable[str] = (),
+        prefetch_workers: int = 0,
+    ) -> None:
         """Run dataflow with caching of operation results.
 
         This is useful for UI experience where some operations can be expensive to run.
+        Tables are never released, since the UI shows the tables after every operation, and
+        sources are never read ahead, since cached sources are not read at all.
         """
         self._current_tableset = Tableset([])
 
+        profiler = RunProfiler(lambda: self._current_tableset) if profile else None
+        self._profile = None
+
         cache_valid = True
 
+        try:
+            for idx, operation in enumerate(self.operations):
+                if not operation.is_enabled:
+                    continue
+
+                context = self.get_current_context()
+                operation.update_template_context(context)
+
+                input_hash = operation.input_hash()
+
+                cache_info = self._operation_cache.get(idx)
+
+                if cache_valid and cache_info and cache_info.cache == input_hash:
+                    self._current_tableset = cache_info.tableset.copy()
+                    if profiler is not None:
+                        profiler.cache_hit(idx + 1, operation)
+                else:
+                    try:
+                        with _profile_operation(profiler, idx + 1, operation):
+                            self._current_tableset = operation.operate(self._current_tableset)
+                        self._operation_cache[idx] = _CacheTuple(
+                            input_hash, self._current_tableset.copy()
+                        )
+                        cache_valid = False
+                    except Exception as e:
+                        raise OperationError(str(e), operation) from e
+        finally:
+            if profiler is not None:
+                self._profile = profiler.finish()
+
+    def _cache_hits(self) -> set[int]:
+        """Get indices of operations whose results a run would take from the cache."""
+        hits = set()
         for idx, operation in enumerate(self.operations):
             if not operation.is_enabled:
                 continue
-
-            context = self.get_current_context()
-            operation.update_template_context(context)
-
-            input_hash = operation.input_hash()
-
             cache_info = self._operation_cache.get(idx)
-
-            if cache_valid and cache_info and cache_info.cache == input_hash:
-                self._current_tableset = cache_info.tableset.copy()
-            else:
-                try:
-                    self._current_tableset = operation.operate(self._current_tableset)
-                    self._operation_cache[idx] = _CacheTuple(
-                        input_hash, self._current_tableset.copy()
-                    )
-                    cache_valid = False
-                except Exception as e:
-                    raise OperationError(str(e), operation) from e
+            if not cache_info or cache_info.cache != operation.input_hash():
+                # Operations after a cache miss run on new tables
+                break
+            hits.add(idx + 1)
+        return hits
 
     def _invalidate_cache_from(self, start_index: int) -> None:
         keys_to_delete = [i for i in self._operation_cache if i >= start_index]
@@ -2,18 +2,58 @@
 
 # flake8: noqa: D103
 
-from typing import Any
+import logging
+from typing import Any, Callable
 
-from jinja2 import Template
+from jinja2 import BaseLoader, BytecodeCache, Environment, FileSystemBytecodeCache
 from pydantic import BaseModel
 from pydantic_core import PydanticUndefined
 
 from datarush.utils.type_utils import convert_to_type
 
+LOG = logging.getLogger(__name__)
+
+_TEMPLATE_CACHE_SIZE = 1024
+_TEMPLATE_MARKERS = ("{{", "{%", "{#")
+
+
+class _SourceLoader(BaseLoader):
+    """Loader that treats the template name as the template source.
+
+    Loading string templates by name lets the environment keep compiled templates in its
+    LRU cache and lets the bytecode cache store them on disk, keyed by the source.
+    """
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        """Get the template source, which is the template name itself."""
+        return template, None, lambda: True
+
+
+def _create_bytecode_cache() -> BytecodeCache | None:
+    """Create a disk bytecode cache in the default temporary directory if it is available."""
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        LOG.warning(f"Jinja2 bytecode cache is disabled: {e}")
+        return None
+
+
+_ENVIRONMENT = Environment(
+    loader=_SourceLoader(),
+    cache_size=_TEMPLATE_CACHE_SIZE,
+    auto_reload=False,
+    bytecode_cache=_create_bytecode_cache(),
+)
+
 
 def render_jinja2_template(template_str: str, context: dict) -> str:
     """Render a Jinja2 template with the given context.
 
+    Compiled templates are cached process-wide, and strings without any Jinja2 markup
+    are returned without invoking Jinja2 at all.
+
     Args:
         template_str (str): The Jinja2 template string.
         context (dict): The context dictionary to render the template.
@@ -21,10 +61,21 @@ def render_jinja2_template(template_str: str, context: dict) -> str:
     Returns:
         str: The rendered template string.
     """
-    template = Template(template_str)
+    if _is_constant(template_str):
+        # Jinja2 drops a single trailing newline by default, keep the output identical
+        return template_str[:-1] if template_str.endswith("\n") else template_str
+
+    template = _ENVIRONMENT.get_template(template_str)
     return template.render(context)
 
 
+def _is_constant(template_str: str) -> bool:
+    """Check if a string renders to itself, i.e. it has no markup and no newlines to normalize."""
+    return "\r" not in template_str and not any(
+        marker in template_str for marker in _TEMPLATE_MARKERS
+    )
+
+
 def model_validate_jinja2[T: BaseModel](
     model_type: type[T], model_dict: dict[str, str], context: dict[str, Any]
 ) -> T:
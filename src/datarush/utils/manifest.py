@@ -0,0 +1,272 @@
+"""Manifests of S3 datasets, listing their objects with statistics of their columns."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from enum import StrEnum
+from typing import Any, Sequence
+
+import pandas as pd
+
+from datarush.core.types import ConditionOperator, RowCondition, RowConditionGroup
+from datarush.utils.type_utils import convert_to_type
+
+# Name of the manifest object at the root of a dataset, readers skip `_` prefixed objects
+MANIFEST_NAME = "_manifest.json"
+_MANIFEST_VERSION = 1
+
+
+class StatsKind(StrEnum):
+    """Kinds of values column statistics are compared as."""
+
+    NUMBER = "number"
+    STRING = "string"
+    BOOLEAN = "boolean"
+    DATETIME = "datetime"
+
+
+# Kinds of the values inferred by pandas, values of other kinds get no minimum and maximum
+_INFERRED_KINDS = {
+    "integer": StatsKind.NUMBER,
+    "floating": StatsKind.NUMBER,
+    "mixed-integer-float": StatsKind.NUMBER,
+    "string": StatsKind.STRING,
+    "boolean": StatsKind.BOOLEAN,
+    "datetime64": StatsKind.DATETIME,
+    "datetime": StatsKind.DATETIME,
+}
+
+
+@dataclass
+class ColumnStats:
+    """Statistics of a column of a dataset object.
+
+    Attributes:
+        null_count: Number of missing values.
+        kind: Kind of the values, None if they have no order, e.g. mixed types.
+        min: Smallest value, as stored in JSON, datetimes in ISO format.
+        max: Largest value, as stored in JSON, datetimes in ISO format.
+    """
+
+    null_count: int
+    kind: StatsKind | None = None
+    min: Any = None
+    max: Any = None
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> ColumnStats:
+        """Compute the statistics of the values of a column."""
+        null_count = int(series.isna().sum())
+        values = series.dropna()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+
+        kind = _INFERRED_KINDS.get(pd.api.types.infer_dtype(values, skipna=True))
+        if values.empty or kind is None:
+            return cls(null_count=null_count)
+        try:
+            low, high = values.min(), values.max()
+        except TypeError:
+            # Values of the same kind may still not be comparable, e.g. mixed time zones
+            return cls(null_count=null_count)
+        return cls(
+            null_count=null_count, kind=kind, min=_encode(low, kind), max=_encode(high, kind)
+        )
+
+    def may_match(self, condition: RowCondition, rows: int | None) -> bool:
+        """Check whether values with these statistics may satisfy a condition.
+
+        Conditions are evaluated like `filter_rows` does, so missing values never satisfy
+        a condition that is not negated. Only values of the same kind as the condition value
+        are compared, any other case may match.
+        """
+        if condition.negate or condition.operator == ConditionOperator.REGEX:
+            return True
+        if rows is not None and self.null_count >= rows:
+            return False
+        if self.kind is None:
+            return True
+
+        try:
+            value = convert_to_type(condition.value, condition.value_type.get_type())
+        except ValueError:
+            return True
+        if not _is_kind(value, self.kind):
+            return True
+
+        low, high = _decode(self.min, self.kind), _decode(self.max, self.kind)
+        if self.kind == StatsKind.DATETIME:
+            value = pd.Timestamp(value)
+        op = condition.operator
+        try:
+            if op == ConditionOperator.EQ:
+                return bool(low <= value <= high)
+            elif op == ConditionOperator.LT:
+                return bool(low < value)
+            elif op == ConditionOperator.LTE:
+                return bool(low <= value)
+            elif op == ConditionOperator.GT:
+                return bool(high > value)
+            elif op == ConditionOperator.GTE:
+                return bool(high >= value)
+        except TypeError:
+            # E.g. datetimes with and without time zone
+            return True
+        return True
+
+
+@dataclass
+class ManifestFile:
+    """Object of a dataset listed in its manifest.
+
+    Attributes:
+        path: Key of the object relative to the dataset, e.g. `year=2025/abc.csv`.
+        rows: Number of records, None if unknown.
+        columns: Statistics of the columns by their names, including partition columns,
+            empty for objects written without a manifest.
+    """
+
+    path: str
+    rows: int | None = None
+    columns: dict[str, ColumnStats] = field(default_factory=dict)
+
+    @property
+    def folder(self) -> str:
+        """Get the partition folder of the object, empty for objects outside of partitions."""
+        return self.path.rsplit("/", 1)[0] if "/" in self.path else ""
+
+    def may_match(self, group: RowConditionGroup) -> bool:
+        """Check whether records of the object may satisfy a group of conditions."""
+        if not group.conditions:
+            return True
+        results = (
+            (
+                self.columns[condition.column].may_match(condition, self.rows)
+                if condition.column in self.columns
+                else True
+            )
+            for condition in group.conditions
+        )
+        return all(results) if group.combine == "and" else any(results)
+
+
+@dataclass
+class DatasetManifest:
+    """Manifest of a dataset, listing its objects so that reads need not list them.
+
+    Attributes:
+        files: Objects of the dataset.
+    """
+
+    files: list[ManifestFile] = field(default_factory=list)
+
+    def remove_folders(self, folders: set[str]) -> None:
+        """Remove the objects of partition folders."""
+        self.files = [file for file in self.files if file.folder not in folders]
+
+    def remove_paths(self, paths: set[str]) -> None:
+        """Remove objects by their paths relative to the dataset."""
+        self.files = [file for file in self.files if file.path not in paths]
+
+    def columns(self) -> list[str]:
+        """Get the names of the columns of the objects with statistics."""
+        return list(dict.fromkeys(column for file in self.files for column in file.columns))
+
+    def to_json(self) -> bytes:
+        """Serialize the manifest to JSON."""
+        content = {
+            "version": _MANIFEST_VERSION,
+            "files": [
+                {
+                    "path": file.path,
+                    "rows": file.rows,
+                    "columns": {
+                        name: {
+                            "null_count": stats.null_count,
+                            "kind": stats.kind,
+                            "min": stats.min,
+                            "max": stats.max,
+                        }
+                        for name, stats in file.columns.items()
+                    },
+                }
+                for file in self.files
+            ],
+        }
+        return json.dumps(content).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, content: bytes) -> DatasetManifest:
+        """Parse a manifest, raising ValueError if it is not a valid manifest."""
+        try:
+            data = json.loads(content)
+            if data.get("version") != _MANIFEST_VERSION:
+                raise ValueError(f"Unsupported manifest version {data.get('version')}")
+            return cls(
+                files=[
+                    ManifestFile(
+                        path=file["path"],
+                        rows=file["rows"],
+                        columns={
+                            name: ColumnStats(
+                                null_count=stats["null_count"],
+                                kind=StatsKind(stats["kind"]) if stats["kind"] else None,
+                                min=stats["min"],
+                                max=stats["max"],
+                            )
+                            for name, stats in file["columns"].items()
+                        },
+                    )
+                    for file in data["files"]
+                ]
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid dataset manifest: {e}") from e
+
+
+def describe_objects(paths: Sequence[str], df: pd.DataFrame) -> list[ManifestFile]:
+    """Describe the objects the records of a frame were written to.
+
+    Records spread over several objects, e.g. capped by a number of rows per object, are
+    not known per object. Each object then gets the statistics of all the records, which
+    still bound its values, and no row count.
+
+    Args:
+        paths: Paths of the objects relative to the dataset.
+        df: Records of the objects.
+
+    Returns:
+        list[ManifestFile]: Manifest entries of the objects.
+    """
+    columns = {str(name): ColumnStats.from_series(df[name]) for name in df.columns}
+    rows = len(df) if len(paths) == 1 else None
+    return [ManifestFile(path=path, rows=rows, columns=columns) for path in paths]
+
+
+def _encode(value: Any, kind: StatsKind) -> Any:
+    """Convert a minimum or maximum to a JSON value."""
+    if kind == StatsKind.DATETIME:
+        return pd.Timestamp(value).isoformat()
+    if kind == StatsKind.BOOLEAN:
+        return bool(value)
+    if kind == StatsKind.NUMBER:
+        return value.item() if hasattr(value, "item") else value
+    return str(value)
+
+
+def _decode(value: Any, kind: StatsKind) -> Any:
+    """Convert a minimum or maximum stored in JSON to a value comparable to condition values."""
+    return pd.Timestamp(value) if kind == StatsKind.DATETIME else value
+
+
+def _is_kind(value: Any, kind: StatsKind) -> bool:
+    """Check whether a condition value is compared to values of a kind like pandas does."""
+    if kind == StatsKind.NUMBER:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if kind == StatsKind.STRING:
+        return isinstance(value, str)
+    if kind == StatsKind.BOOLEAN:
+        return isinstance(value, bool)
+    return isinstance(value, date)
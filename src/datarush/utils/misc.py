@@ -1,39 +1,193 @@
 """Miscellaneous utility functions."""
 
+from __future__ import annotations
+
+import bz2
+import gzip
+from dataclasses import dataclass
 from io import BytesIO
+from typing import Any, Literal
 
 import pandas as pd
 
-from datarush.core.types import ContentType
+from datarush.core.types import Compression, ContentType, ParquetCompression
+
+Engine = Literal["c", "pyarrow"]
+DtypeBackend = Literal["numpy", "numpy_nullable", "pyarrow"]
+
+
+@dataclass(frozen=True)
+class ParquetOptions:
+    """Layout of written Parquet files.
+
+    Attributes:
+        compression: Codec compressing the column chunks.
+        row_group_size: Maximum number of rows of a row group, the pyarrow default if None.
+        use_dictionary: Whether to dictionary-encode columns.
+        max_rows_by_file: Maximum number of rows of each object of a dataset, unlimited if
+            None. Single files are not split.
+    """
+
+    compression: ParquetCompression = ParquetCompression.SNAPPY
+    row_group_size: int | None = None
+    use_dictionary: bool = True
+    max_rows_by_file: int | None = None
+
+    @property
+    def codec(self) -> str | None:
+        """Get the codec name pyarrow expects, None for no compression."""
+        return None if self.compression == ParquetCompression.NONE else self.compression.value
+
+    def write_table_kwargs(self) -> dict[str, Any]:
+        """Get the options of `pyarrow.parquet.write_table` other than the compression."""
+        kwargs: dict[str, Any] = {"use_dictionary": self.use_dictionary}
+        if self.row_group_size:
+            kwargs["row_group_size"] = self.row_group_size
+        return kwargs
+
+
+# Leading bytes of compressed files
+_MAGIC_NUMBERS = {
+    Compression.GZIP: b"\x1f\x8b",
+    Compression.ZSTD: b"\x28\xb5\x2f\xfd",
+    Compression.BZ2: b"BZh",
+}
+# The bz2 magic number is followed by the block size, so that text starting with "BZh" is
+# not taken for bz2
+_BZ2_BLOCK_SIZES = b"123456789"
+
+
+def read_file(
+    file: BytesIO,
+    content_type: ContentType,
+    engine: Engine = "c",
+    dtype_backend: DtypeBackend = "numpy",
+    dtypes: dict[str, str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Read file content into a DataFrame based on content type.
 
+    Compressed CSV, JSON and JSON Lines files are detected from their content and
+    decompressed.
+
+    Args:
+        file: File content.
+        content_type: Format of the file.
+        engine: Parser of CSV and JSON Lines files, `pyarrow` parses on all cores.
+        dtype_backend: Data types of the DataFrame, `numpy` keeps pandas defaults with object
+            strings, `pyarrow` stores columns as Arrow arrays.
+        dtypes: Data types of columns, skipping type inference for them.
+        columns: Columns to read, all columns if empty.
+
+    Returns:
+        pd.DataFrame: Content of the file.
+    """
+    kwargs: dict[str, Any] = {}
+    if dtype_backend != "numpy":
+        kwargs["dtype_backend"] = dtype_backend
+
+    if content_type.supports_compression():
+        file = decompress(file)
 
-def read_file(file: BytesIO, content_type: ContentType) -> pd.DataFrame:
-    """Read file content into a DataFrame based on content type."""
     if content_type == ContentType.CSV:
-        return pd.read_csv(file)
+        return pd.read_csv(
+            file, engine=engine, dtype=dtypes or None, usecols=columns or None, **kwargs
+        )
     elif content_type == ContentType.JSON:
-        return pd.read_json(file)
+        # The pyarrow JSON parser only reads JSON Lines
+        df = pd.read_json(file, dtype=dtypes or True, **kwargs)
+    elif content_type == ContentType.JSONL:
+        if engine == "pyarrow":
+            # The pyarrow JSON parser infers all types, explicit types are conversions
+            df = pd.read_json(file, lines=True, engine="pyarrow", **kwargs)
+            df = df.astype(dtypes) if dtypes else df
+        else:
+            df = pd.read_json(file, lines=True, dtype=dtypes or True, **kwargs)
     elif content_type == ContentType.PARQUET:
-        return pd.read_parquet(file)
+        # Parquet files carry their schema, explicit types are conversions after reading
+        df = pd.read_parquet(file, columns=columns or None, **kwargs)
+        return df.astype(dtypes) if dtypes else df
+    elif content_type == ContentType.ARROW:
+        df = pd.read_feather(file, columns=columns or None, **kwargs)
+        return df.astype(dtypes) if dtypes else df
     else:
         raise ValueError(f"Unsupported content type: {content_type}")
 
+    return df[columns] if columns else df
+
+
+def to_file(
+    df: pd.DataFrame,
+    content_type: ContentType,
+    compression: Compression = Compression.NONE,
+    parquet_options: ParquetOptions | None = None,
+) -> BytesIO:
+    """Convert a DataFrame to a BytesIO file based on content type.
+
+    Args:
+        df: DataFrame to convert.
+        content_type: Format of the file.
+        compression: Compression of the whole file, only for CSV, JSON and JSON Lines.
+        parquet_options: Layout of Parquet files, pyarrow defaults with snappy if None.
+
+    Returns:
+        BytesIO: File content, positioned at its start.
+    """
+    if compression != Compression.NONE and not content_type.supports_compression():
+        raise ValueError(f"{content_type} files cannot be compressed with {compression}")
+    pandas_compression = compression.value if compression != Compression.NONE else None
 
-def to_file(df: pd.DataFrame, content_type: ContentType) -> BytesIO:
-    """Convert a DataFrame to a BytesIO file based on content type."""
     file = BytesIO()
     if content_type == ContentType.CSV:
-        df.to_csv(file, index=False)
+        df.to_csv(file, index=False, compression=pandas_compression)
     elif content_type == ContentType.JSON:
-        df.to_json(file, orient="records")
+        df.to_json(file, orient="records", compression=pandas_compression)
+    elif content_type == ContentType.JSONL:
+        df.to_json(file, orient="records", lines=True, compression=pandas_compression)
     elif content_type == ContentType.PARQUET:
-        df.to_parquet(file, index=False)
+        options = parquet_options or ParquetOptions()
+        df.to_parquet(file, index=False, compression=options.codec, **options.write_table_kwargs())
+    elif content_type == ContentType.ARROW:
+        # Arrow IPC files cannot store a pandas index
+        df.reset_index(drop=True).to_feather(file)
     else:
         raise ValueError(f"Unsupported content type: {content_type}")
     file.seek(0)
     return file
 
 
+def detect_compression(file: BytesIO) -> Compression:
+    """Detect the compression of a file from its leading bytes, keeping its position."""
+    position = file.tell()
+    head = file.read(4)
+    file.seek(position)
+    for compression, magic in _MAGIC_NUMBERS.items():
+        if not head.startswith(magic):
+            continue
+        if compression == Compression.BZ2 and (len(head) < 4 or head[3] not in _BZ2_BLOCK_SIZES):
+            continue
+        return compression
+    return Compression.NONE
+
+
+def decompress(file: BytesIO) -> BytesIO:
+    """Decompress a file if it is compressed, otherwise return it unchanged."""
+    compression = detect_compression(file)
+    if compression == Compression.GZIP:
+        return BytesIO(gzip.decompress(file.read()))
+    if compression == Compression.BZ2:
+        return BytesIO(bz2.decompress(file.read()))
+    if compression == Compression.ZSTD:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "Reading zstd files needs zstandard, install it with `pip install datarush[zstd]`"
+            ) from e
+        return BytesIO(zstandard.ZstdDecompressor().stream_reader(file).read())
+    return file
+
+
 def truncate(text: str, max_len: int) -> str:
     """Truncate text to a maximum length with ellipsis."""
     return text if len(text) <= max_len else text[: max_len - 3] + "..."
@@ -0,0 +1,274 @@
+"""Profiling of dataflow runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from datarush.core.dataflow import Operation, Tableset
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class TableProfile:
+    """Size of a table at a point of a dataflow run."""
+
+    rows: int
+    columns: int
+    memory_bytes: int
+
+
+@dataclass
+class OperationProfile:
+    """Resources used by a single operation of a dataflow run."""
+
+    index: int
+    name: str
+    title: str
+    cache_hit: bool = False
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_rss_bytes: int | None = None
+    traced_memory_delta_bytes: int = 0
+    traced_memory_peak_bytes: int = 0
+    input_tables: dict[str, TableProfile] = field(default_factory=dict)
+    output_tables: dict[str, TableProfile] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def input_rows(self) -> int:
+        """Get the total number of rows in the tables before the operation."""
+        return sum(table.rows for table in self.input_tables.values())
+
+    @property
+    def output_rows(self) -> int:
+        """Get the total number of rows in the tables after the operation."""
+        return sum(table.rows for table in self.output_tables.values())
+
+    @property
+    def input_memory_bytes(self) -> int:
+        """Get the total memory of the tables before the operation."""
+        return sum(table.memory_bytes for table in self.input_tables.values())
+
+    @property
+    def output_memory_bytes(self) -> int:
+        """Get the total memory of the tables after the operation."""
+        return sum(table.memory_bytes for table in self.output_tables.values())
+
+
+@dataclass
+class RunProfile:
+    """Per-operation resource usage of a dataflow run."""
+
+    started_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    wall_time: float = 0.0
+    operations: list[OperationProfile] = field(default_factory=list)
+
+    def slowest(self) -> OperationProfile | None:
+        """Get the operation that took the longest wall time."""
+        if not self.operations:
+            return None
+        return max(self.operations, key=lambda op: op.wall_time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the profile to a JSON serializable dictionary."""
+        return asdict(self)
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Convert the profile to JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the profile to a table with one row per operation."""
+        mib = 1024**2
+        return pd.DataFrame(
+            [
+                {
+                    "index": op.index,
+                    "operation": op.title,
+                    "cache_hit": op.cache_hit,
+                    "wall_time_s": op.wall_time,
+                    "wall_time_share": op.wall_time / self.wall_time if self.wall_time else 0.0,
+                    "cpu_time_s": op.cpu_time,
+                    "peak_rss_mib": (
+                        op.peak_rss_bytes / mib if op.peak_rss_bytes is not None else None
+                    ),
+                    "traced_memory_delta_mib": op.traced_memory_delta_bytes / mib,
+                    "traced_memory_peak_mib": op.traced_memory_peak_bytes / mib,
+                    "rows_in": op.input_rows,
+                    "rows_out": op.output_rows,
+                    "memory_in_mib": op.input_memory_bytes / mib,
+                    "memory_out_mib": op.output_memory_bytes / mib,
+                    "error": op.error,
+                }
+                for op in self.operations
+            ],
+            columns=[
+                "index",
+                "operation",
+                "cache_hit",
+                "wall_time_s",
+                "wall_time_share",
+                "cpu_time_s",
+                "peak_rss_mib",
+                "traced_memory_delta_mib",
+                "traced_memory_peak_mib",
+                "rows_in",
+                "rows_out",
+                "memory_in_mib",
+                "memory_out_mib",
+                "error",
+            ],
+        )
+
+
+class RunProfiler:
+    """Collect a RunProfile while a dataflow runs.
+
+    Profiling is not free: memory allocations are traced with tracemalloc and the deep memory
+    usage of the tables each operation reads and writes is measured, so it is only enabled on
+    request.
+    """
+
+    def __init__(self, get_tableset: Callable[[], Tableset]) -> None:
+        """Initialize the profiler.
+
+        Args:
+            get_tableset: Callable returning the current tableset of the dataflow.
+        """
+        self._get_tableset = get_tableset
+        self._profile = RunProfile()
+        # Latest measurement of every table, for operations whose results come from a cache
+        self._tables: dict[str, TableProfile] = {}
+        self._start_time = time.perf_counter()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def operation(self, index: int, operation: Operation) -> Iterator[OperationProfile]:
+        """Profile an operation executed within the context."""
+        record = self._new_record(index, operation)
+        record.input_tables = profile_tables(
+            self._get_tableset(), _resolve_tables(operation, operation.input_tables)
+        )
+
+        traced_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.wall_time = time.perf_counter() - wall_start
+            record.cpu_time = time.process_time() - cpu_start
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            record.traced_memory_delta_bytes = traced_after - traced_before
+            record.traced_memory_peak_bytes = traced_peak - traced_before
+            record.peak_rss_bytes = _peak_rss_bytes()
+            self._finish_record(record, operation)
+
+    def cache_hit(self, index: int, operation: Operation) -> None:
+        """Record an operation whose result was taken from a cache instead of executed."""
+        record = self._new_record(index, operation)
+        record.cache_hit = True
+        # The tableset already holds the cached results, so inputs are the last measurements
+        names = _resolve_tables(operation, operation.input_tables)
+        record.input_tables = {
+            name: table for name, table in self._tables.items() if names is None or name in names
+        }
+        self._finish_record(record, operation)
+
+    def finish(self) -> RunProfile:
+        """Stop profiling and get the collected profile."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._profile.wall_time = time.perf_counter() - self._start_time
+
+        slowest = self._profile.slowest()
+        if slowest is not None:
+            LOG.info(
+                f"Slowest operation: {slowest.title} ({slowest.name}) "
+                f"took {slowest.wall_time:.2f}s of {self._profile.wall_time:.2f}s"
+            )
+        return self._profile
+
+    def _new_record(self, index: int, operation: Operation) -> OperationProfile:
+        return OperationProfile(index=index, name=operation.name, title=operation.title)
+
+    def _finish_record(self, record: OperationProfile, operation: Operation) -> None:
+        names = _resolve_tables(operation, operation.output_tables)
+        if operation.creates_dynamic_tables:
+            names = None
+        record.output_tables = profile_tables(self._get_tableset(), names)
+        if names is None:
+            self._tables = dict(record.output_tables)
+        else:
+            self._tables.update(record.output_tables)
+        self._profile.operations.append(record)
+        LOG.debug(
+            f"Profiled operation {record.index}: {record.title} - wall {record.wall_time:.3f}s, "
+            f"cpu {record.cpu_time:.3f}s, rows {record.input_rows} -> {record.output_rows}"
+        )
+
+
+def profile_tables(
+    tableset: Tableset, names: Iterable[str] | None = None
+) -> dict[str, TableProfile]:
+    """Measure the size of the given tables of a tableset, of every table if None.
+
+    Tables missing from the tableset are left out.
+    """
+    profiles = {}
+    present = list(tableset)
+    for name in present if names is None else dict.fromkeys(names):
+        if name not in present:
+            continue
+        df = tableset.get_df(name)
+        profiles[name] = TableProfile(
+            rows=len(df),
+            columns=len(df.columns),
+            memory_bytes=int(df.memory_usage(deep=True).sum()),
+        )
+    return profiles
+
+
+def _resolve_tables(operation: Operation, get_tables: Callable[[], list[str]]) -> list[str] | None:
+    """Get the tables of an operation to profile, None to profile the whole tableset.
+
+    The whole tableset is profiled for operations that do not declare the tables they read
+    or write, and for operations whose tables cannot be resolved from their parameters.
+    """
+    try:
+        if not operation.input_tables() and not operation.output_tables():
+            return None
+        return get_tables()
+    except Exception:
+        return None
+
+
+def _peak_rss_bytes() -> int | None:
+    """Get the peak resident set size of the process, None where it is not available."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
@@ -1,25 +1,58 @@
 """S3 client wrapper for basic file and folder operations."""
 
+from __future__ import annotations
+
+import json
 import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import StrEnum
+from functools import cache
 from io import BytesIO
-from typing import Any, Sequence
+from typing import Any, Callable, Sequence
+from uuid import uuid4
 
 import awswrangler as wr
 import boto3
+import numpy as np
 import pandas as pd
 from botocore.client import Config
+from botocore.exceptions import ClientError
 
 from datarush.config import S3Config, get_datarush_config
-from datarush.core.types import ContentType
+from datarush.core.types import Compression, ContentType, RowConditionGroup
+from datarush.utils.conditions import match_conditions
+from datarush.utils.manifest import MANIFEST_NAME, DatasetManifest, ManifestFile, describe_objects
+from datarush.utils.misc import ParquetOptions, decompress, read_file, to_file
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of keys of a DeleteObjects request
+_DELETE_BATCH_SIZE = 1000
+# Keys listed per request when looking for the first data object of a dataset, a few
+# metadata objects may come before it
+_FIRST_KEY_PAGE_SIZE = 100
+
+# Object of a compacted partition folder listing the objects the compaction replaced
+COMPACTION_LOG_NAME = "_compaction.json"
+# Conditional manifest updates retried before giving up, with a random backoff of up to
+# this many seconds times the attempt number
+_MANIFEST_SAVE_ATTEMPTS = 10
+_MANIFEST_SAVE_BACKOFF = 0.05
+
 
 class DatasetDoesNotExistError(Exception):
     """Exception raised when a dataset does not exist."""
 
 
+class ManifestConflictError(Exception):
+    """Exception raised when concurrent writers keep changing a manifest being updated."""
+
+
 class S3Client:
     """S3 Client."""
 
@@ -46,16 +79,67 @@ class S3Client:
         LOG.debug(f"Successfully retrieved object: {bucket}/{key}")
         return BytesIO(obj["Body"].read())
 
+    def find_object(self, bucket: str, key: str) -> BytesIO | None:
+        """Retrieve an object from S3 as BytesIO, None if it does not exist."""
+        try:
+            return self.get_object(bucket, key)
+        except self._client.exceptions.NoSuchKey:
+            LOG.debug(f"Object does not exist: {bucket}/{key}")
+            return None
+
+    def find_object_with_etag(self, bucket: str, key: str) -> tuple[BytesIO, str] | None:
+        """Retrieve an object from S3 with its ETag, None if it does not exist."""
+        try:
+            obj = self._client.get_object(Bucket=bucket, Key=key)
+        except self._client.exceptions.NoSuchKey:
+            LOG.debug(f"Object does not exist: {bucket}/{key}")
+            return None
+        return BytesIO(obj["Body"].read()), obj["ETag"]
+
     def put_object(self, bucket: str, key: str, body: BytesIO) -> None:
         """Upload an object to S3."""
         LOG.debug(f"Uploading object to S3: {bucket}/{key}")
         self._client.put_object(Bucket=bucket, Key=key, Body=body)
         LOG.debug(f"Successfully uploaded object: {bucket}/{key}")
 
+    def put_object_if_unchanged(
+        self, bucket: str, key: str, body: BytesIO, etag: str | None
+    ) -> bool:
+        """Upload an object only if it still has an ETag, or does not exist if the ETag is None.
+
+        Returns:
+            bool: False, without uploading, if the object was changed in the meantime.
+        """
+        condition = {"IfMatch": etag} if etag is not None else {"IfNoneMatch": "*"}
+        try:
+            self._client.put_object(Bucket=bucket, Key=key, Body=body, **condition)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("PreconditionFailed", "ConditionalRequestConflict"):
+                LOG.debug(f"Object changed while uploading it: {bucket}/{key}")
+                return False
+            raise
+        return True
+
     def delete_object(self, bucket: str, key: str) -> None:
         """Delete an object from S3."""
         self._client.delete_object(Bucket=bucket, Key=key)
 
+    def delete_objects(self, bucket: str, keys: Sequence[str]) -> None:
+        """Delete objects from S3 in batches of up to 1000 keys per request."""
+        for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+            end = start + _DELETE_BATCH_SIZE
+            batch = keys[start:end]
+            response = self._client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            errors = response.get("Errors", [])
+            if errors:
+                raise RuntimeError(
+                    f"Cannot delete {len(errors)} objects from {bucket}, "
+                    f"e.g. {errors[0]['Key']}: {errors[0]['Message']}"
+                )
+
     def list_object_keys(self, bucket: str, prefix: str) -> list[str]:
         """List object keys under a prefix in an S3 bucket."""
         prefix = prefix.strip("/")
@@ -63,6 +147,47 @@ class S3Client:
         objects = response.get("Contents", [])
         return [obj["Key"] for obj in objects]
 
+    def list_objects(self, bucket: str, prefix: str) -> list[dict[str, Any]]:
+        """List all objects under a prefix with their size and last modified time.
+
+        Unlike `list_object_keys`, all result pages are read.
+        """
+        paginator = self._client.get_paginator("list_objects_v2")
+        return [
+            obj
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix.strip("/"))
+            for obj in page.get("Contents", [])
+        ]
+
+    def list_prefixes(self, bucket: str, prefix: str) -> list[str]:
+        """List the prefixes of the folders directly under a prefix ending with a slash.
+
+        Only one folder level is listed, using a delimiter, and all result pages are read.
+        """
+        paginator = self._client.get_paginator("list_objects_v2")
+        return [
+            common_prefix["Prefix"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/")
+            for common_prefix in page.get("CommonPrefixes", [])
+        ]
+
+    def first_data_key(self, bucket: str, prefix: str) -> str | None:
+        """Get the first key under a prefix of an object holding records, None if there is none.
+
+        Metadata objects, like the manifest or compaction logs of a dataset, are skipped, so
+        that the key tells the partition layout of the dataset.
+        """
+        paginator = self._client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket, Prefix=prefix, PaginationConfig={"PageSize": _FIRST_KEY_PAGE_SIZE}
+        )
+        for page in pages:
+            for obj in page.get("Contents", []):
+                key: str = obj["Key"]
+                if is_data_key(key):
+                    return key
+        return None
+
     def list_folders(self, bucket: str, prefix: str) -> list[str]:
         """List folder names under a prefix in an S3 bucket."""
         prefix = prefix.strip("/") + "/"
@@ -72,12 +197,135 @@ class S3Client:
         return list({key.split(prefix)[1].split("/")[0] for key in keys})
 
 
+def get_s3_client(config: S3Config | None = None) -> S3Client:
+    """Get an S3 client shared by all callers using the same configuration.
+
+    boto3 clients are thread-safe but slow to create, so one client is built per distinct
+    configuration and reused for the lifetime of the process.
+    """
+    return _get_cached_s3_client(config or get_datarush_config().s3)
+
+
+@cache
+def _get_cached_s3_client(config: S3Config) -> S3Client:
+    return S3Client(config)
+
+
+def clear_s3_clients() -> None:
+    """Forget the shared S3 clients, e.g. in a forked process that must build its own."""
+    _get_cached_s3_client.cache_clear()
+
+
+def partition_values(key: str) -> dict[str, str]:
+    """Get the partition values of a dataset object from its `column=value` folders."""
+    folders = key.split("/")[:-1]
+    return dict(folder.split("=", 1) for folder in folders if "=" in folder)
+
+
+def is_data_key(key: str) -> bool:
+    """Check whether a dataset object holds records, skipping folder markers and hidden files."""
+    name = key.rsplit("/", 1)[-1]
+    return bool(name) and not name.startswith(("_", "."))
+
+
 class DatasetWriteMode(StrEnum):
     """Write mode for S3 dataset sink."""
 
     OVERWRITE = "overwrite"
     OVERWRITE_PARTITIONS = "overwrite_partitions"
     APPEND = "append"
+    UPSERT = "upsert"
+
+
+@dataclass
+class PartitionCompaction:
+    """Compaction of the objects of a dataset partition.
+
+    Attributes:
+        folder: Partition folder relative to the dataset, e.g. `year=2025/month=10`.
+        files_before: Number of objects before compaction.
+        files_after: Number of objects after compaction.
+        bytes_before: Total size of the objects before compaction.
+        bytes_after: Total size of the objects after compaction.
+    """
+
+    folder: str
+    files_before: int
+    files_after: int
+    bytes_before: int
+    bytes_after: int
+
+
+@dataclass
+class CompactionLog:
+    """Objects written by the last compaction of a partition folder and what they replaced.
+
+    Incremental reads track objects by their keys and ETags, so they use the log to tell
+    whether the records of compacted objects were already read from the replaced objects.
+
+    Attributes:
+        objects: Keys of the objects written by the compaction.
+        replaced: ETags of the objects the compaction replaced, by their keys.
+        previous: Log of the earlier compaction which wrote some of the replaced objects.
+    """
+
+    objects: list[str]
+    replaced: dict[str, str]
+    previous: CompactionLog | None = None
+
+    def processed_by(self, processed: dict[str, str]) -> bool | None:
+        """Check whether a reader already read the records of the compacted objects.
+
+        Args:
+            processed: ETags of the objects the reader processed, by their keys.
+
+        Returns:
+            bool | None: True if it read all replaced objects, False if it read none of
+                them, None if it read only some, so that the compacted objects mix records
+                it read with records it did not.
+        """
+        done = []
+        for key, etag in self.replaced.items():
+            if processed.get(key) == etag:
+                done.append(True)
+            elif self.previous is not None and key in self.previous.objects:
+                previous = self.previous.processed_by(processed)
+                if previous is None:
+                    return None
+                done.append(previous)
+            else:
+                done.append(False)
+        if all(done):
+            return True
+        return False if not any(done) else None
+
+    def to_json(self) -> bytes:
+        """Serialize the log to JSON."""
+        return json.dumps(self._to_dict()).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, content: bytes) -> CompactionLog:
+        """Parse a log, raising ValueError if it is not a valid compaction log."""
+        try:
+            return cls._from_dict(json.loads(content))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid compaction log: {e}") from e
+
+    def _to_dict(self) -> dict[str, Any]:
+        return {
+            "objects": self.objects,
+            "replaced": self.replaced,
+            "previous": self.previous._to_dict() if self.previous is not None else None,
+        }
+
+    @classmethod
+    def _from_dict(cls, data: dict[str, Any]) -> CompactionLog:
+        previous = data["previous"]
+        return cls(
+            objects=list(data["objects"]),
+            replaced=dict(data["replaced"]),
+            previous=cls._from_dict(previous) if previous is not None else None,
+        )
 
 
 class S3Dataset:
@@ -92,10 +340,30 @@ class S3Dataset:
         unique_ids: Sequence[str] | None = None,
         write_mode: DatasetWriteMode = DatasetWriteMode.APPEND,
         config: S3Config | None = None,
+        compression: Compression = Compression.NONE,
+        parquet_options: ParquetOptions | None = None,
+        sort_by: Sequence[str] | None = None,
+        manifest: bool = False,
     ) -> None:
-        """Initialize the S3 dataset client with configuration."""
+        """Initialize the S3 dataset client with configuration.
+
+        Compression only applies to written CSV, JSON and JSON Lines objects, compressed
+        objects are recognized by their extension when reading. Parquet options only apply
+        to written Parquet objects, and written records are sorted by the `sort_by` columns.
+        With `manifest`, writes create a manifest of the dataset objects if there is none,
+        an existing manifest is always kept up to date.
+        """
+        if compression != Compression.NONE and not content_type.supports_compression():
+            raise ValueError(f"{content_type} datasets cannot be compressed with {compression}")
+
         self._content_type = content_type
-        self._path = f"s3://{bucket}/{prefix.strip('/')}"
+        self._compression = compression
+        self._parquet_options = parquet_options or ParquetOptions()
+        self._sort_by = list(sort_by or [])
+        self._keep_manifest = manifest
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+        self._path = f"s3://{bucket}/{self._prefix}"
         LOG.debug(f"Initializing S3 dataset client for path: {self._path}")
 
         self._write_mode = write_mode.value
@@ -120,33 +388,225 @@ class S3Dataset:
         wr.config.s3_endpoint_url = self._config.endpoint
         LOG.debug("S3 dataset client initialized successfully")
 
-    def read(self, **kwargs: Any) -> pd.DataFrame:
-        """Read a dataset from S3."""
+    def read(
+        self,
+        partition_prefixes: Sequence[str] | None = None,
+        row_filter: RowConditionGroup | None = None,
+        manifest: DatasetManifest | None = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Read a dataset from S3.
+
+        Datasets with a manifest are read from the objects it lists, without listing the
+        dataset, skipping objects whose column statistics cannot satisfy the row filter.
+
+        Args:
+            partition_prefixes: Partition folders to read, relative to the dataset, e.g.
+                `year=2025/month=10`. Only these folders are listed, all of the dataset is
+                read if None.
+            row_filter: Conditions the records must satisfy, all records are read if None.
+            manifest: Manifest of the dataset, read from S3 if None.
+            **kwargs: Arguments of the awswrangler reader, e.g. `partition_filter`.
+
+        Returns:
+            pd.DataFrame: Records of the dataset with its partition columns.
+        """
         LOG.info(f"Reading dataset from S3: {self._path} (content_type: {self._content_type})")
 
+        if manifest is None:
+            manifest = self.read_manifest()
+        try:
+            if manifest is not None:
+                df = self._read_manifest_files(manifest, partition_prefixes, row_filter, **kwargs)
+            elif partition_prefixes is None:
+                df = self._read_path(self._path, **kwargs)
+            else:
+                df = self._read_partitions(partition_prefixes, **kwargs)
+        except DatasetDoesNotExistError:
+            LOG.error(f"Dataset does not exist at {self._path}")
+            raise
+
+        df = _filter_records(df, row_filter)
+        LOG.info(f"Successfully read dataset with shape: {df.shape}")
+        return df
+
+    def read_manifest(self) -> DatasetManifest | None:
+        """Read the manifest of the dataset, None if it has none or it cannot be parsed."""
+        return self._read_manifest_with_etag()[0]
+
+    def _read_manifest_with_etag(self) -> tuple[DatasetManifest | None, str | None]:
+        """Read the manifest with the ETag to update it with, None for a missing manifest."""
+        found = get_s3_client(self._config).find_object_with_etag(
+            self._bucket, self._manifest_key()
+        )
+        if found is None:
+            return None, None
+        obj, etag = found
+        try:
+            return DatasetManifest.from_json(obj.read()), etag
+        except ValueError as e:
+            # Listing the dataset is slower but always complete
+            LOG.warning(f"Ignoring manifest of {self._path}: {e}")
+            return None, etag
+
+    def _commit_manifest(
+        self,
+        change: Callable[[DatasetManifest], None],
+        manifest: DatasetManifest,
+        etag: str | None,
+    ) -> None:
+        """Apply a change to the manifest and upload it if no other writer changed it meanwhile.
+
+        On a conflict the manifest is read again and the change applied to the new version,
+        so that concurrent writers do not drop each other's objects. A manifest that went
+        missing or unreadable meanwhile is rebuilt from a listing of the dataset.
+
+        Args:
+            change: Function updating the manifest in place, applied on every attempt.
+            manifest: Manifest read before the change.
+            etag: ETag of the manifest read, None if the dataset had no manifest.
+        """
+        s3 = get_s3_client(self._config)
+        for attempt in range(_MANIFEST_SAVE_ATTEMPTS):
+            change(manifest)
+            body = BytesIO(manifest.to_json())
+            if s3.put_object_if_unchanged(self._bucket, self._manifest_key(), body, etag):
+                return
+            LOG.debug(f"Manifest of {self._path} changed meanwhile, updating it again")
+            time.sleep(random.uniform(0, _MANIFEST_SAVE_BACKOFF * (attempt + 1)))
+            current, etag = self._read_manifest_with_etag()
+            manifest = current if current is not None else self._listed_manifest()
+
+        raise ManifestConflictError(
+            f"Manifest of {self._path} kept changing, "
+            f"gave up after {_MANIFEST_SAVE_ATTEMPTS} attempts"
+        )
+
+    def _manifest_key(self) -> str:
+        return "/".join(part for part in (self._prefix, MANIFEST_NAME) if part)
+
+    def _read_manifest_files(
+        self,
+        manifest: DatasetManifest,
+        partition_prefixes: Sequence[str] | None,
+        row_filter: RowConditionGroup | None,
+        partition_filter: Callable[[dict[str, str]], bool] | None = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Read the objects listed in the manifest that the filters keep."""
+        files = manifest.files
+        if partition_prefixes is not None:
+            folders = tuple(f"{prefix.strip('/')}/" for prefix in partition_prefixes)
+            files = [file for file in files if file.path.startswith(folders)]
+        if partition_filter is not None:
+            files = [file for file in files if partition_filter(partition_values(file.path))]
+        if not files:
+            raise DatasetDoesNotExistError(f"Dataset does not exist at {self._path}")
+
+        kept = [file for file in files if row_filter is None or file.may_match(row_filter)]
+        LOG.info(f"Manifest of {self._path} keeps {len(kept)} of {len(files)} objects to read")
+        if not kept:
+            # Partition columns come last, as they are read from the folders
+            partition_columns = list(partition_values(files[0].path))
+            columns = [column for column in manifest.columns() if column not in partition_columns]
+            return pd.DataFrame(columns=columns + partition_columns)
+        return self.read_objects([f"{self._prefix}/{file.path}" for file in kept], **kwargs)
+
+    def _read_partitions(self, partition_prefixes: Sequence[str], **kwargs: Any) -> pd.DataFrame:
+        """Read partition folders one by one, skipping folders without objects."""
+        LOG.debug(f"Reading {len(partition_prefixes)} partition folders")
+        frames = []
+        for prefix in partition_prefixes:
+            try:
+                frames.append(self._read_path(f"{self._path}/{prefix.strip('/')}", **kwargs))
+            except DatasetDoesNotExistError:
+                continue
+
+        if not frames:
+            raise DatasetDoesNotExistError(f"Dataset does not exist at {self._path}")
+
+        df = pd.concat(frames, ignore_index=True)
+        # Partition columns are categorical, with categories differing between folders
+        for column in frames[0].columns:
+            if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype("category")
+        return df
+
+    def read_objects(
+        self, keys: Sequence[str], row_filter: RowConditionGroup | None = None, **kwargs: Any
+    ) -> pd.DataFrame:
+        """Read some objects of the dataset with the partition columns of their folders.
+
+        Args:
+            keys: Keys of the objects, under the dataset prefix.
+            row_filter: Conditions the records must satisfy, all records are read if None.
+            **kwargs: Arguments of the awswrangler reader.
+
+        Returns:
+            pd.DataFrame: Records of the objects with the partition columns of the dataset.
+        """
+        LOG.info(f"Reading {len(keys)} objects of dataset {self._path}")
+
+        folders: dict[str, list[str]] = {}
+        for key in keys:
+            folders.setdefault(key.rsplit("/", 1)[0], []).append(key)
+
+        frames = []
+        partition_columns: dict[str, None] = {}
+        # Objects of a folder share their partition values, so they are read together
+        for folder_keys in folders.values():
+            partitions = partition_values(folder_keys[0].removeprefix(self._prefix))
+            paths = [f"s3://{self._bucket}/{key}" for key in folder_keys]
+            frames.append(self._read_path(paths, dataset=False, **kwargs).assign(**partitions))
+            partition_columns.update(dict.fromkeys(partitions))
+
+        if not frames:
+            raise DatasetDoesNotExistError(f"No objects to read from {self._path}")
+
+        df = pd.concat(frames, ignore_index=True).astype(
+            {column: "category" for column in partition_columns}
+        )
+        df = _filter_records(df, row_filter)
+        LOG.info(f"Successfully read objects with shape: {df.shape}")
+        return df
+
+    def _read_path(
+        self, path: str | list[str], dataset: bool = True, **kwargs: Any
+    ) -> pd.DataFrame:
+        """Read the dataset objects under an S3 path, or the listed objects if not `dataset`."""
         common_kwargs = dict(
             boto3_session=self._session,
-            path=self._path,
-            dataset=True,
+            path=path,
+            dataset=dataset,
         )
+        if dataset and self._content_type != ContentType.ARROW:
+            common_kwargs["path_ignore_suffix"] = [MANIFEST_NAME, COMPACTION_LOG_NAME]
+        if self._compression != Compression.NONE:
+            # awswrangler names zstd objects `.zstd`, which pandas does not infer zstd from
+            common_kwargs["compression"] = self._compression.value
 
         try:
-            if self._content_type == ContentType.JSON:
-                LOG.debug("Reading JSON dataset")
-                df = wr.s3.read_json(**common_kwargs, **kwargs)
+            if self._content_type in (ContentType.JSON, ContentType.JSONL):
+                # JSON datasets are written as JSON Lines
+                LOG.debug("Reading JSON Lines dataset")
+                df = wr.s3.read_json(lines=True, **common_kwargs, **kwargs)
             elif self._content_type == ContentType.CSV:
                 LOG.debug("Reading CSV dataset")
                 df = wr.s3.read_csv(**common_kwargs, **kwargs)
             elif self._content_type == ContentType.PARQUET:
                 LOG.debug("Reading Parquet dataset")
                 df = wr.s3.read_parquet(**common_kwargs, **kwargs)
+            elif self._content_type == ContentType.ARROW:
+                LOG.debug("Reading Arrow dataset")
+                if isinstance(path, str):
+                    df = self._read_arrow(path.removeprefix(self._path), **kwargs)
+                else:
+                    df = self._read_arrow_objects(path)
             else:
                 raise ValueError(f"Unsupported content type: {self._content_type}")
         except wr.exceptions.NoFilesFound:
-            LOG.error(f"Dataset does not exist at {self._path}")
-            raise DatasetDoesNotExistError(f"Dataset does not exist at {self._path}")
+            raise DatasetDoesNotExistError(f"Dataset does not exist at {path}")
 
-        LOG.info(f"Successfully read dataset with shape: {df.shape}")
         return df
 
     def write(self, df: pd.DataFrame, **kwargs: Any) -> None:
@@ -159,9 +619,16 @@ class S3Dataset:
             LOG.warning("DataFrame is empty, skipping write operation")
             return
 
+        if self._write_mode == DatasetWriteMode.UPSERT:
+            if not self._unique_ids:
+                raise ValueError("unique_ids are required in UPSERT mode")
+            LOG.debug("Writing with unique IDs merge")
+            self._write_upsert(df, **kwargs)
+            return
+
         if self._unique_ids and self._write_mode != DatasetWriteMode.APPEND:
-            LOG.error("unique_ids are only supported in APPEND mode")
-            raise ValueError("unique_ids are only supported in APPEND mode")
+            LOG.error("unique_ids are only supported in APPEND and UPSERT modes")
+            raise ValueError("unique_ids are only supported in APPEND and UPSERT modes")
 
         if self._unique_ids:
             LOG.debug("Writing with unique IDs deduplication")
@@ -170,9 +637,15 @@ class S3Dataset:
             LOG.debug("Writing without unique IDs")
             self._write(df, **kwargs)
 
-    def _write(self, df: pd.DataFrame, **kwargs: Any) -> None:
+    def _write(
+        self, df: pd.DataFrame, mode: DatasetWriteMode | None = None, **kwargs: Any
+    ) -> None:
+        """Write a DataFrame with the write mode of the dataset, unless another is given."""
         if df.empty:
             return
+        mode = mode or DatasetWriteMode(self._write_mode)
+        if self._sort_by:
+            df = df.sort_values(self._sort_by, kind="stable", ignore_index=True)
 
         common_kwargs = dict(
             df=df,
@@ -180,19 +653,179 @@ class S3Dataset:
             dataset=True,
             boto3_session=self._session,
             partition_cols=self._partition_columns,
-            mode=self._write_mode,
+            mode=mode.value,
             index=False,
         )
 
-        if self._content_type == ContentType.JSON:
-            wr.s3.to_json(orient="records", lines=True, **common_kwargs)
+        if self._compression != Compression.NONE:
+            common_kwargs["compression"] = self._compression.value
+
+        manifest, etag = self._manifest_before_write(mode)
+        if self._content_type in (ContentType.JSON, ContentType.JSONL):
+            paths = wr.s3.to_json(orient="records", lines=True, **common_kwargs)["paths"]
         elif self._content_type == ContentType.CSV:
-            wr.s3.to_csv(**common_kwargs)
+            paths = wr.s3.to_csv(**common_kwargs)["paths"]
         elif self._content_type == ContentType.PARQUET:
-            wr.s3.to_parquet(**common_kwargs)
+            options = self._parquet_options
+            # awswrangler pops the write_table_args, so they are built for every call
+            pyarrow_kwargs: dict[str, Any] = {"use_dictionary": options.use_dictionary}
+            if options.row_group_size:
+                pyarrow_kwargs["write_table_args"] = {"row_group_size": options.row_group_size}
+            paths = wr.s3.to_parquet(
+                compression=options.codec,
+                max_rows_by_file=options.max_rows_by_file,
+                pyarrow_additional_kwargs=pyarrow_kwargs,
+                **common_kwargs,
+            )["paths"]
+        elif self._content_type == ContentType.ARROW:
+            paths = self._write_arrow(df, mode)
         else:
             raise ValueError(f"Unsupported content type: {self._content_type}")
 
+        if manifest is not None:
+            written = [path.removeprefix(f"{self._path}/") for path in paths]
+            self._update_manifest(manifest, etag, df, written, mode)
+
+    def _manifest_before_write(
+        self, mode: DatasetWriteMode
+    ) -> tuple[DatasetManifest | None, str | None]:
+        """Get the manifest to update with the written objects and its ETag.
+
+        The manifest is None if it is not kept.
+        """
+        manifest, etag = self._read_manifest_with_etag()
+        if manifest is not None or not self._keep_manifest:
+            return manifest, etag
+        if mode == DatasetWriteMode.OVERWRITE:
+            return DatasetManifest(), etag
+        return self._listed_manifest(), etag
+
+    def _listed_manifest(self) -> DatasetManifest:
+        """Build a manifest of the objects listed in the dataset."""
+        # Objects written before the manifest have no statistics, so reads never skip them
+        return DatasetManifest(
+            [
+                ManifestFile(path=key.removeprefix(f"{self._prefix}/"))
+                for key in self._list_keys("")
+                if is_data_key(key)
+            ]
+        )
+
+    def _update_manifest(
+        self,
+        manifest: DatasetManifest,
+        etag: str | None,
+        df: pd.DataFrame,
+        paths: list[str],
+        mode: DatasetWriteMode,
+    ) -> None:
+        """Add written objects to the manifest, replacing the objects the write deleted."""
+        folder_paths: dict[str, list[str]] = {}
+        for path in paths:
+            folder_paths.setdefault(path.rsplit("/", 1)[0] if "/" in path else "", []).append(path)
+
+        # Records are grouped into folders by their values like awswrangler does
+        columns = list(self._partition_columns)
+        groups = df.groupby(columns, dropna=False, observed=True) if columns else [((), df)]
+        folder_records = {
+            "/".join(f"{column}={value}" for column, value in zip(columns, values)): group
+            for values, group in groups
+        }
+
+        files = []
+        for folder, written in folder_paths.items():
+            if folder in folder_records:
+                files.extend(describe_objects(written, folder_records[folder]))
+            else:
+                files.extend(ManifestFile(path=path) for path in written)
+
+        def add_files(manifest: DatasetManifest) -> None:
+            if mode == DatasetWriteMode.OVERWRITE:
+                manifest.files = []
+            elif mode == DatasetWriteMode.OVERWRITE_PARTITIONS:
+                manifest.remove_folders(set(folder_paths))
+            # A manifest rebuilt from a listing already has the written objects
+            manifest.remove_paths({file.path for file in files})
+            manifest.files.extend(files)
+
+        self._commit_manifest(add_files, manifest, etag)
+        LOG.debug(f"Added {len(files)} objects to the manifest of {self._path}")
+
+    def _list_keys(self, prefix: str) -> list[str]:
+        """List the keys of the dataset objects under a prefix relative to the dataset."""
+        prefix = "/".join(part for part in (self._prefix, prefix.strip("/")) if part) + "/"
+        return [
+            obj["Key"]
+            for obj in get_s3_client(self._config).list_objects(self._bucket, prefix)
+            if obj["Key"].startswith(prefix)
+        ]
+
+    def _read_arrow(
+        self, prefix: str = "", partition_filter: Callable[[dict[str, str]], bool] | None = None
+    ) -> pd.DataFrame:
+        """Read an Arrow IPC dataset under a prefix, awswrangler has no reader for it."""
+        s3 = get_s3_client(self._config)
+        frames = []
+        partition_columns: dict[str, None] = {}
+        for key in self._list_keys(prefix):
+            if not key.endswith(".arrow"):
+                continue
+            partitions = partition_values(key.removeprefix(self._prefix))
+            if partition_filter is not None and not partition_filter(partitions):
+                continue
+            df = read_file(s3.get_object(self._bucket, key), ContentType.ARROW)
+            frames.append(df.assign(**partitions))
+            partition_columns.update(dict.fromkeys(partitions))
+
+        if not frames:
+            raise wr.exceptions.NoFilesFound(f"No Arrow files found at {self._path}/{prefix}")
+        # Partition columns are categorical, as awswrangler reads them
+        return pd.concat(frames, ignore_index=True).astype(
+            {column: "category" for column in partition_columns}
+        )
+
+    def _read_arrow_objects(self, paths: Sequence[str]) -> pd.DataFrame:
+        """Read Arrow IPC objects of the dataset without their partition columns."""
+        s3 = get_s3_client(self._config)
+        return pd.concat(
+            [
+                read_file(
+                    s3.get_object(self._bucket, path.removeprefix(f"s3://{self._bucket}/")),
+                    ContentType.ARROW,
+                )
+                for path in paths
+            ],
+            ignore_index=True,
+        )
+
+    def _write_arrow(self, df: pd.DataFrame, mode: DatasetWriteMode) -> list[str]:
+        """Write an Arrow IPC dataset with one object per partition, like awswrangler does.
+
+        Returns:
+            list[str]: S3 paths of the written objects.
+        """
+        s3 = get_s3_client(self._config)
+        if mode == DatasetWriteMode.OVERWRITE:
+            for key in self._list_keys(""):
+                s3.delete_object(self._bucket, key)
+
+        columns = list(self._partition_columns)
+        groups = df.groupby(columns, dropna=False, observed=True) if columns else [((), df)]
+        paths = []
+        for values, group in groups:
+            folder = "/".join(f"{column}={value}" for column, value in zip(columns, values))
+            if mode == DatasetWriteMode.OVERWRITE_PARTITIONS:
+                for key in self._list_keys(folder):
+                    s3.delete_object(self._bucket, key)
+            key = "/".join(part for part in (self._prefix, folder, uuid4().hex) if part)
+            s3.put_object(
+                self._bucket,
+                f"{key}.arrow",
+                to_file(group.drop(columns=columns), ContentType.ARROW),
+            )
+            paths.append(f"s3://{self._bucket}/{key}.arrow")
+        return paths
+
     def _write_unique(self, df: pd.DataFrame, **kwargs: Any) -> None:
         """Write a DataFrame to S3 with unique IDs."""
         unique_ids = list(self._partition_columns) + list(self._unique_ids)
@@ -219,3 +852,328 @@ class S3Dataset:
             pass
 
         self._write(df, **kwargs)
+
+    def _write_upsert(self, df: pd.DataFrame, **kwargs: Any) -> None:
+        """Merge records into the dataset by unique IDs, rewriting only the partitions they touch.
+
+        Only the unique ID columns of the touched partitions are read first, where the content
+        type allows reading some columns. Records of partitions without any existing record
+        of the same IDs are appended. The other partitions are read in full, their records are
+        replaced by the new records with the same IDs, and they are rewritten in a single
+        write, which awswrangler spreads over threads.
+        """
+        partition_columns = list(self._partition_columns)
+        unique_ids = list(self._unique_ids)
+        missing_columns = [col for col in partition_columns + unique_ids if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Columns {missing_columns} not found in DataFrame columns.")
+
+        df = df.drop_duplicates(subset=partition_columns + unique_ids, keep="last")
+        folders = _partition_folders(df, partition_columns)
+        touched = list(dict.fromkeys(folders))
+        key_kwargs: dict[str, Any] = {
+            ContentType.PARQUET: {"columns": unique_ids},
+            ContentType.CSV: {"usecols": unique_ids},
+        }.get(self._content_type, {})
+
+        try:
+            existing = self.read(
+                partition_prefixes=touched if partition_columns else None, **key_kwargs
+            )
+        except DatasetDoesNotExistError:
+            self._write(df, mode=DatasetWriteMode.APPEND, **kwargs)
+            return
+
+        existing_folders = _partition_folders(existing, partition_columns)
+        matched = _match_records(df, folders, existing, existing_folders, unique_ids)
+        merged_folders = set(folders[matched])
+        rewrite = folders.isin(merged_folders).to_numpy()
+        LOG.info(
+            f"Upserting {len(df)} records into {len(touched)} partitions, "
+            f"{len(merged_folders)} of them with existing records are rewritten"
+        )
+
+        self._write(df[~rewrite], mode=DatasetWriteMode.APPEND, **kwargs)
+        if not merged_folders:
+            return
+
+        if key_kwargs:
+            existing = self.read(
+                partition_prefixes=sorted(merged_folders) if partition_columns else None
+            )
+            existing_folders = _partition_folders(existing, partition_columns)
+        else:
+            kept = existing_folders.isin(merged_folders).to_numpy()
+            existing, existing_folders = existing[kept], existing_folders[kept]
+
+        new, new_folders = df[rewrite], folders[rewrite]
+        replaced = _match_records(existing, existing_folders, new, new_folders, unique_ids)
+        existing, existing_folders = existing[~replaced], existing_folders[~replaced]
+
+        # Partition columns read from folder names are strings, take them from the new records
+        partitions = new[partition_columns].assign(_folder=new_folders.to_numpy())
+        existing = (
+            existing.drop(columns=partition_columns)
+            .assign(_folder=existing_folders.to_numpy())
+            .merge(partitions.drop_duplicates("_folder"), on="_folder", how="left")
+            .drop(columns="_folder")
+        )
+        merged = pd.concat([existing, new], ignore_index=True)
+        merged = merged[list(df.columns) + [col for col in merged.columns if col not in df]]
+
+        mode = (
+            DatasetWriteMode.OVERWRITE_PARTITIONS
+            if partition_columns
+            else DatasetWriteMode.OVERWRITE
+        )
+        self._write(merged, mode=mode, **kwargs)
+
+    def compaction_candidates(self, min_files: int) -> dict[str, list[dict[str, Any]]]:
+        """Find the partition folders holding more than `min_files` objects.
+
+        Args:
+            min_files: Number of objects a folder must exceed to be compacted.
+
+        Returns:
+            dict[str, list[dict[str, Any]]]: Objects of each folder to compact, by the folder
+                relative to the dataset, empty for objects outside of partition folders.
+        """
+        root = f"{self._prefix}/"
+        folders: dict[str, list[dict[str, Any]]] = {}
+        for obj in get_s3_client(self._config).list_objects(self._bucket, root):
+            if not obj["Key"].startswith(root) or not is_data_key(obj["Key"]):
+                continue
+            relative_key = obj["Key"].removeprefix(root)
+            folder = relative_key.rsplit("/", 1)[0] if "/" in relative_key else ""
+            folders.setdefault(folder, []).append(obj)
+        return {folder: objects for folder, objects in folders.items() if len(objects) > min_files}
+
+    def compact(
+        self,
+        min_files: int = 10,
+        target_file_size: int = 128 * 1024**2,
+        sort_by: Sequence[str] = (),
+        max_workers: int = 4,
+    ) -> list[PartitionCompaction]:
+        """Rewrite partitions made of many small objects into a few objects of a target size.
+
+        Partitions are compacted in parallel. The objects of a partition are merged, sorted
+        and split into as many objects as their total size needs. The new objects are
+        uploaded, and listed in the manifest of the dataset if it has one, before the old
+        objects are deleted, so readers never miss records of the partition. S3 cannot
+        replace objects atomically, a reader listing the partition between both steps may
+        read records twice.
+
+        Each compacted partition keeps a `_compaction.json` log of the objects the
+        compaction replaced, so that incremental reads do not read the records of the
+        compacted objects again.
+
+        Args:
+            min_files: Number of objects a partition must exceed to be compacted.
+            target_file_size: Target size of the compacted objects in bytes, estimated from
+                the size of the small objects.
+            sort_by: Columns to sort the records of each partition by, so that the ranges
+                of values of Parquet row groups overlap less.
+            max_workers: Number of partitions compacted at the same time.
+
+        Returns:
+            list[PartitionCompaction]: Objects and bytes of each compacted partition.
+        """
+        # The S3 client is taken from the configuration of the calling context, which
+        # worker threads do not inherit
+        s3 = get_s3_client(self._config)
+        candidates = self.compaction_candidates(min_files)
+        has_manifest = self.read_manifest() is not None
+        manifest_lock = threading.Lock()
+        LOG.info(f"Compacting {len(candidates)} partitions of {self._path}")
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = [
+                executor.submit(
+                    self._compact_folder,
+                    s3,
+                    folder,
+                    objects,
+                    target_file_size,
+                    list(sort_by),
+                    has_manifest,
+                    manifest_lock,
+                )
+                for folder, objects in sorted(candidates.items())
+            ]
+            results = []
+            error: BaseException | None = None
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except BaseException as e:
+                    error = error or e
+
+        if error is not None:
+            raise error
+        return results
+
+    def _compact_folder(
+        self,
+        s3: S3Client,
+        folder: str,
+        objects: list[dict[str, Any]],
+        target_file_size: int,
+        sort_by: list[str],
+        has_manifest: bool,
+        manifest_lock: threading.Lock,
+    ) -> PartitionCompaction:
+        """Merge the objects of a partition folder into objects of the target size.
+
+        The manifest is updated, under the lock shared by the partitions compacted at the
+        same time, before the old objects are deleted.
+        """
+        keys = [obj["Key"] for obj in objects]
+        df = pd.concat(
+            [
+                _read_dataset_object(s3.get_object(self._bucket, key), self._content_type)
+                for key in keys
+            ],
+            ignore_index=True,
+        )
+        if sort_by:
+            df = df.sort_values(sort_by, kind="stable", ignore_index=True)
+
+        bytes_before = sum(int(obj["Size"]) for obj in objects)
+        files = max(1, min(len(df), math.ceil(bytes_before / max(target_file_size, 1))))
+        if self._content_type == ContentType.PARQUET and self._parquet_options.max_rows_by_file:
+            files = max(files, math.ceil(len(df) / self._parquet_options.max_rows_by_file))
+        prefix = "/".join(part for part in (self._prefix, folder) if part)
+        file_type = (
+            ContentType.JSONL if self._content_type == ContentType.JSON else self._content_type
+        )
+        extension = _DATASET_EXTENSIONS[self._content_type] + self._compression.extension()
+
+        log_key = f"{prefix}/{COMPACTION_LOG_NAME}"
+        previous_log = s3.find_object(self._bucket, log_key)
+        new_keys: list[str] = []
+        new_files: list[ManifestFile] = []
+        bytes_after = 0
+        try:
+            for rows in np.array_split(np.arange(len(df)), files):
+                body = to_file(df.iloc[rows], file_type, self._compression, self._parquet_options)
+                key = f"{prefix}/{uuid4().hex}{extension}"
+                bytes_after += body.getbuffer().nbytes
+                s3.put_object(self._bucket, key, body)
+                new_keys.append(key)
+                if has_manifest:
+                    path = key.removeprefix(f"{self._prefix}/")
+                    new_files.extend(describe_objects([path], df.iloc[rows]))
+
+            log = _compaction_log(new_keys, objects, previous_log)
+            s3.put_object(self._bucket, log_key, BytesIO(log.to_json()))
+            if has_manifest:
+                replaced = {key.removeprefix(f"{self._prefix}/") for key in keys}
+                replaced.update(file.path for file in new_files)
+
+                def replace_files(manifest: DatasetManifest) -> None:
+                    manifest.remove_paths(replaced)
+                    manifest.files.extend(new_files)
+
+                with manifest_lock:
+                    manifest, etag = self._read_manifest_with_etag()
+                    self._commit_manifest(
+                        replace_files,
+                        manifest if manifest is not None else self._listed_manifest(),
+                        etag,
+                    )
+        except BaseException:
+            # Keep the partition as it was rather than with duplicated records
+            s3.delete_objects(self._bucket, new_keys)
+            if previous_log is not None:
+                previous_log.seek(0)
+                s3.put_object(self._bucket, log_key, previous_log)
+            else:
+                s3.delete_objects(self._bucket, [log_key])
+            raise
+
+        s3.delete_objects(self._bucket, keys)
+        LOG.info(f"Compacted {len(keys)} objects of {prefix} into {len(new_keys)}")
+        return PartitionCompaction(
+            folder=folder,
+            files_before=len(keys),
+            files_after=len(new_keys),
+            bytes_before=bytes_before,
+            bytes_after=bytes_after,
+        )
+
+
+def _compaction_log(
+    new_keys: list[str], replaced: list[dict[str, Any]], previous_log: BytesIO | None
+) -> CompactionLog:
+    """Describe a compaction, keeping the previous log if it wrote some of the replaced objects."""
+    log = CompactionLog(objects=new_keys, replaced={obj["Key"]: obj["ETag"] for obj in replaced})
+    if previous_log is None:
+        return log
+    try:
+        previous = CompactionLog.from_json(previous_log.getvalue())
+    except ValueError as e:
+        LOG.warning(f"Ignoring compaction log of {new_keys[0].rsplit('/', 1)[0]}: {e}")
+        return log
+    if not set(previous.objects).intersection(log.replaced):
+        return log
+    log.previous = previous
+    return log
+
+
+# Extensions awswrangler gives to the objects of datasets
+_DATASET_EXTENSIONS = {
+    ContentType.CSV: ".csv",
+    ContentType.JSON: ".json",
+    ContentType.JSONL: ".json",
+    ContentType.PARQUET: ".parquet",
+    ContentType.ARROW: ".arrow",
+}
+
+
+def _read_dataset_object(file: BytesIO, content_type: ContentType) -> pd.DataFrame:
+    """Read a dataset object without converting its values, so they are written back as is."""
+    if content_type == ContentType.CSV:
+        return pd.read_csv(decompress(file), dtype=str, keep_default_na=False)
+    if content_type in (ContentType.JSON, ContentType.JSONL):
+        # JSON datasets are written as JSON Lines
+        return pd.read_json(decompress(file), lines=True, dtype=False, convert_dates=False)
+    return read_file(file, content_type)
+
+
+def _filter_records(df: pd.DataFrame, row_filter: RowConditionGroup | None) -> pd.DataFrame:
+    """Keep the records satisfying the row filter, like `filter_rows` does."""
+    if row_filter is None or not row_filter.conditions or df.empty:
+        return df
+    mask = match_conditions(df, row_filter.conditions, row_filter.combine)
+    return df[mask].reset_index(drop=True)
+
+
+def _partition_folders(df: pd.DataFrame, partition_columns: Sequence[str]) -> pd.Series:
+    """Get the partition folder of every record, e.g. `year=2025/month=10`."""
+    if not partition_columns:
+        return pd.Series("", index=df.index, dtype=object)
+    values = df[list(partition_columns)].astype(str).itertuples(index=False)
+    return pd.Series(
+        [
+            "/".join(f"{column}={value}" for column, value in zip(partition_columns, row))
+            for row in values
+        ],
+        index=df.index,
+        dtype=object,
+    )
+
+
+def _match_records(
+    df: pd.DataFrame,
+    folders: pd.Series,
+    other: pd.DataFrame,
+    other_folders: pd.Series,
+    unique_ids: list[str],
+) -> np.ndarray:
+    """Find the records with the same partition and unique IDs as a record of another frame."""
+    keys = df[unique_ids].assign(_folder=folders.to_numpy())
+    other_keys = other[unique_ids].assign(_folder=other_folders.to_numpy()).drop_duplicates()
+    merged = keys.merge(other_keys, on=[*unique_ids, "_folder"], how="left", indicator=True)
+    matched: np.ndarray = (merged["_merge"] == "both").to_numpy()
+    return matched
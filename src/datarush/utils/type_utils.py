@@ -7,15 +7,21 @@ from __future__ import annotations
 import ast
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Callable, Literal, Type, cast, get_args, get_origin
+from types import NoneType, UnionType
+from typing import Any, Callable, Literal, Type, Union, cast, get_args, get_origin
 
 from pydantic import BaseModel
 
-from datarush.core.types import ColumnStr, StringMap, TableStr, TextStr
+from datarush.core.types import ColumnStr, OutputTableStr, StringMap, TableStr, TextStr
 
 
 def convert_to_type[T](value: str, to_type: type[T] | None) -> T:
-    """Convert a string value to the specified type."""
+    """Convert a string value to the specified type, optional types to their inner type."""
+    if get_origin(to_type) in (Union, UnionType):
+        inner = [arg for arg in get_args(to_type) if arg is not NoneType]
+        if len(inner) == 1:
+            return convert_to_type(value, inner[0])
+
     if is_string_enum(to_type):
         return to_type(value)  # type: ignore
 
@@ -77,6 +83,7 @@ _TYPE_PARSERS: dict[type, Callable[[str], Any]] = {
     bool: _to_bool,
     str: str,
     TableStr: str,
+    OutputTableStr: str,
     ColumnStr: str,
     int: int,
     float: float,
@@ -0,0 +1,3 @@
+"""Host package version, generated on build."""
+
+__version__ = "0.0.0"
@@ -40,7 +40,8 @@ def mock_s3_dataset(sample_df):
         with patch("datarush.utils.s3_client.S3Dataset.write") as mock_write:
             mock_write.return_value = None
 
-            yield mock_read, mock_write
+            with patch("datarush.utils.s3_client.S3Dataset.read_manifest", return_value=None):
+                yield mock_read, mock_write
 
 
 @pytest.fixture
@@ -52,4 +53,5 @@ def mock_s3_dataset_empty():
         with patch("datarush.utils.s3_client.S3Dataset.write") as mock_write:
             mock_write.return_value = None
 
-            yield
+            with patch("datarush.utils.s3_client.S3Dataset.read_manifest", return_value=None):
+                yield
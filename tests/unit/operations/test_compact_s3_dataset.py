@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from datarush.core.dataflow import Tableset
+from datarush.core.operations.sinks.compact_s3_dataset import CompactS3Dataset
+from datarush.utils.s3_client import PartitionCompaction
+
+
+def test_operate_success():
+    # GIVEN
+    parameters = {
+        "bucket": "test-bucket",
+        "path": "datasets/events",
+        "content_type": "PARQUET",
+        "min_files": 5,
+        "target_file_size_mb": 64,
+        "sort_by": ["id"],
+    }
+    tableset = Tableset([])
+    operation = CompactS3Dataset(parameters)
+
+    # WHEN
+    with patch(
+        "datarush.core.operations.sinks.compact_s3_dataset.S3Dataset.compact",
+        return_value=[PartitionCompaction("day=01", 10, 1, 1000, 900)],
+    ) as mock_compact:
+        result = operation.operate(tableset)
+
+    # THEN
+    mock_compact.assert_called_once_with(
+        min_files=5, target_file_size=64 * 1024**2, sort_by=["id"], max_workers=4
+    )
+    assert result is tableset
+    assert operation.has_side_effects
+    assert operation.output_tables() == []
+
+
+def test_estimate_read_bytes():
+    operation = CompactS3Dataset(
+        {"bucket": "test-bucket", "path": "datasets/events", "content_type": "CSV"}
+    )
+
+    with patch(
+        "datarush.core.operations.sinks.compact_s3_dataset.S3Dataset.compaction_candidates",
+        return_value={"day=01": [{"Size": 10}, {"Size": 20}], "day=02": [{"Size": 5}]},
+    ) as mock_candidates:
+        assert operation.estimate_read_bytes() == 35
+
+    mock_candidates.assert_called_once_with(10)
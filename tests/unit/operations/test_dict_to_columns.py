@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from datarush.core.dataflow import Table, Tableset
+from datarush.core.operations.transformations.dict_to_columns import DictToColumns
+
+
+@pytest.fixture
+def users_tableset():
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "info": [
+                {"name": "Alice", "address": {"city": "Paris", "zip": "75001"}},
+                None,
+                {"name": "Bob", "age": 30},
+            ],
+        },
+        index=[10, 20, 30],
+    )
+    return Tableset([Table("users", df)])
+
+
+def test_dict_to_columns_expands_top_level_keys(users_tableset):
+    op = DictToColumns({"table": "users", "column": "info", "drop": True})
+    result = op.operate(users_tableset).get_df("users")
+
+    expected = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "info_name": ["Alice", np.nan, "Bob"],
+            "info_address": [{"city": "Paris", "zip": "75001"}, np.nan, np.nan],
+            "info_age": [np.nan, np.nan, 30.0],
+        },
+        index=[10, 20, 30],
+    )
+    pdt.assert_frame_equal(result, expected)
+
+
+def test_dict_to_columns_keeps_source_column(users_tableset):
+    op = DictToColumns({"table": "users", "column": "info", "keys": ["name"]})
+    result = op.operate(users_tableset).get_df("users")
+
+    assert list(result.columns) == ["id", "info", "info_name"]
+
+
+def test_dict_to_columns_keys_whitelist_and_nested_depth(users_tableset):
+    op = DictToColumns(
+        {
+            "table": "users",
+            "column": "info",
+            "drop": True,
+            "keys": ["address", "age"],
+            "max_level": 1,
+        }
+    )
+    result = op.operate(users_tableset).get_df("users")
+
+    expected = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "info_age": [np.nan, np.nan, 30.0],
+            "info_address_city": ["Paris", np.nan, np.nan],
+            "info_address_zip": ["75001", np.nan, np.nan],
+        },
+        index=[10, 20, 30],
+    )
+    pdt.assert_frame_equal(result, expected, check_like=True)
+
+
+def test_dict_to_columns_rejects_non_dict_values():
+    df = pd.DataFrame({"info": [{"a": 1}, "not a dict"]})
+    tableset = Tableset([Table("data", df)])
+
+    op = DictToColumns({"table": "data", "column": "info"})
+
+    with pytest.raises(ValueError, match="must be dicts or null"):
+        op.operate(tableset)
@@ -0,0 +1,73 @@
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow as pa
+import pytest
+
+from datarush.core.dataflow import Tableset
+from datarush.core.operations.sources.local_file_source import LocalFileSource
+from datarush.core.types import Compression, ContentType
+from datarush.utils.misc import to_file
+
+DF = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"], "score": [1.5, 2.5, 3.5]})
+
+
+def _read(content_type: ContentType, **options) -> pd.DataFrame:
+    op = LocalFileSource(
+        {
+            "content_type": content_type,
+            "file": to_file(DF, content_type).read(),
+            "table_name": "data",
+            **options,
+        }
+    )
+    return op.operate(Tableset([])).get_df("data")
+
+
+@pytest.mark.parametrize("content_type", list(ContentType))
+def test_local_file_source_default_options(content_type):
+    pdt.assert_frame_equal(_read(content_type), DF)
+
+
+@pytest.mark.parametrize("content_type", list(ContentType))
+def test_local_file_source_pyarrow_backend(content_type):
+    df = _read(
+        content_type,
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        dtypes={"id": "string[pyarrow]"},
+        columns=["id", "name"],
+    )
+
+    assert list(df.columns) == ["id", "name"]
+    assert df["id"].dtype == "string[pyarrow]"
+    assert df["name"].dtype == pd.ArrowDtype(pa.string())
+    assert df["id"].tolist() == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("compression", list(Compression))
+@pytest.mark.parametrize("content_type", [ContentType.CSV, ContentType.JSON, ContentType.JSONL])
+def test_local_file_source_compressed_file(content_type, compression):
+    if compression == Compression.ZSTD:
+        pytest.importorskip("zstandard")
+    op = LocalFileSource(
+        {
+            "content_type": content_type,
+            "file": to_file(DF, content_type, compression).read(),
+            "table_name": "data",
+        }
+    )
+
+    pdt.assert_frame_equal(op.operate(Tableset([])).get_df("data"), DF)
+
+
+def test_local_file_source_text_starting_like_bz2():
+    op = LocalFileSource(
+        {"content_type": ContentType.CSV, "file": b"BZhx,id\na,1\n", "table_name": "data"}
+    )
+
+    assert list(op.operate(Tableset([])).get_df("data").columns) == ["BZhx", "id"]
+
+
+def test_to_file_rejects_compressed_binary_formats():
+    with pytest.raises(ValueError, match="cannot be compressed"):
+        to_file(DF, ContentType.PARQUET, Compression.GZIP)
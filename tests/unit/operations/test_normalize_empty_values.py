@@ -31,3 +31,33 @@ def test_normalize_empty_values_all_columns_and_no_custom():
     result = op.operate(make_tableset(df))
     result_df = result.get_df("departments")
     pd.testing.assert_frame_equal(result_df, expected, check_dtype=False)
+
+
+def test_normalize_empty_values_selected_columns_only():
+    df = pd.DataFrame(
+        {
+            "col1": ["", "N.A.", "x"],
+            "col2": ["", "N.A.", "x"],
+            "col3": [0, 1, 2],
+        }
+    )
+    model = {
+        "table": "departments",
+        "columns": ["col1", "col3", "missing"],
+        "custom_empty_values": ["N.A.", "0"],
+    }
+    op = NormalizeEmptyValues(model)
+    result_df = op.operate(make_tableset(df)).get_df("departments")
+
+    assert result_df["col1"].tolist() == [None, None, "x"]
+    assert result_df["col2"].tolist() == ["", "N.A.", "x"]
+    assert result_df["col3"].tolist() == [0, 1, 2]
+
+
+def test_normalize_empty_values_categorical_column():
+    df = pd.DataFrame({"col": pd.Series(["a", "Unknown", ""], dtype="category")})
+    model = {"table": "departments", "custom_empty_values": ["Unknown"]}
+    op = NormalizeEmptyValues(model)
+    result_df = op.operate(make_tableset(df)).get_df("departments")
+
+    assert result_df["col"].isna().tolist() == [False, True, True]
@@ -1,3 +1,7 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
 import pytest
@@ -52,3 +56,108 @@ def test_parse_json_column_raises_on_error():
 
     with pytest.raises(ValueError, match="Failed to parse JSON value: not a json"):
         op.operate(tableset)
+
+
+def test_parse_json_column_parses_repeated_payloads_once():
+    payloads = ['"click"', '"view"'] * 3
+    df = pd.DataFrame({"payload": payloads})
+    tableset = Tableset([Table("events", df)])
+
+    model = {"table": "events", "column": "payload"}
+
+    with patch(
+        "datarush.core.operations.transformations.parse_json_column._loads",
+        side_effect=json.loads,
+    ) as mock_loads:
+        result = ParseJSONColumn(model).operate(tableset)
+
+    assert mock_loads.call_count == 2
+    assert result.get_df("events")["payload"].tolist() == ["click", "view"] * 3
+
+
+def test_parse_json_column_repeated_payloads_are_not_shared():
+    df = pd.DataFrame({"payload": ['{"tags": ["a"]}'] * 3})
+    tableset = Tableset([Table("events", df)])
+
+    result = ParseJSONColumn({"table": "events", "column": "payload"}).operate(tableset)
+
+    values = result.get_df("events")["payload"]
+    values.iloc[0]["tags"].append("b")
+    assert values.tolist() == [{"tags": ["a", "b"]}, {"tags": ["a"]}, {"tags": ["a"]}]
+
+
+def test_parse_json_column_mixed_payloads_are_not_shared():
+    df = pd.DataFrame({"payload": ["1", "[1]", "1", "[1]", None]})
+    tableset = Tableset([Table("data", df)])
+
+    model = {"table": "data", "column": "payload", "on_error": "null"}
+    values = ParseJSONColumn(model).operate(tableset).get_df("data")["payload"]
+
+    values.iloc[1].append(2)
+    assert values.tolist() == [1, [1, 2], 1, [1], None]
+
+
+def test_parse_json_column_repeated_payloads_are_not_shared():
+    df = pd.DataFrame({"payload": ['{"tags": ["a"]}'] * 3})
+    tableset = Tableset([Table("events", df)])
+
+    result = ParseJSONColumn({"table": "events", "column": "payload"}).operate(tableset)
+
+    values = result.get_df("events")["payload"]
+    values.iloc[0]["tags"].append("b")
+    assert values.tolist() == [{"tags": ["a", "b"]}, {"tags": ["a"]}, {"tags": ["a"]}]
+
+
+def test_parse_json_column_without_orjson():
+    df = pd.DataFrame({"payload": ['{"x": NaN}', "[1, 2]"]})
+    tableset = Tableset([Table("data", df)])
+
+    model = {"table": "data", "column": "payload"}
+
+    with patch("datarush.core.operations.transformations.parse_json_column.orjson", None):
+        result = ParseJSONColumn(model).operate(tableset)
+
+    values = result.get_df("data")["payload"].tolist()
+    assert np.isnan(values[0]["x"])
+    assert values[1] == [1, 2]
+
+
+def test_parse_json_column_flatten():
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "payload": ['{"a": 1, "b": {"c": "x"}}', '{"a": 2}', '{"a": 1, "b": {"c": "x"}}'],
+        }
+    )
+    tableset = Tableset([Table("data", df)])
+
+    model = {"table": "data", "column": "payload", "flatten": True}
+
+    result = ParseJSONColumn(model).operate(tableset)
+
+    expected = pd.DataFrame(
+        {"id": [1, 2, 3], "payload_a": [1, 2, 1], "payload_b_c": ["x", np.nan, "x"]}
+    )
+    pdt.assert_frame_equal(result.get_df("data"), expected)
+
+
+def test_parse_json_column_flatten_with_null_on_error():
+    df = pd.DataFrame({"payload": ['{"a": 1}', "invalid", "[1, 2]", None]})
+    tableset = Tableset([Table("data", df)])
+
+    model = {"table": "data", "column": "payload", "flatten": True, "on_error": "null"}
+
+    result = ParseJSONColumn(model).operate(tableset)
+
+    expected = pd.DataFrame({"payload_a": [1.0, np.nan, np.nan, np.nan]})
+    pdt.assert_frame_equal(result.get_df("data"), expected)
+
+
+def test_parse_json_column_flatten_raises_on_non_object():
+    df = pd.DataFrame({"payload": ['{"a": 1}', "[1, 2]"]})
+    tableset = Tableset([Table("data", df)])
+
+    model = {"table": "data", "column": "payload", "flatten": True}
+
+    with pytest.raises(ValueError, match="JSON value is not an object"):
+        ParseJSONColumn(model).operate(tableset)
@@ -1,11 +1,17 @@
+from io import BytesIO
 from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
+from datarush.config import FilesystemStateStoreConfig
 from datarush.core.dataflow import Tableset
-from datarush.core.operations.sources.s3_dataset_source import S3DatasetSource
-from datarush.utils.s3_client import DatasetDoesNotExistError
+from datarush.core.operations.sources.s3_dataset_source import S3DatasetSource, _prune_partitions
+from datarush.core.state import FilesystemStateStore
+from datarush.core.types import PartitionFilterGroup
+from datarush.exceptions import IncrementalReadError
+from datarush.utils.manifest import DatasetManifest
+from datarush.utils.s3_client import CompactionLog, DatasetDoesNotExistError, is_data_key
 
 
 def test_operate_success(mock_s3_dataset, sample_df):
@@ -67,7 +73,8 @@ def test_operate_empty_success(mock_s3_dataset_empty):
 
 def test_partition_filter_passed_as_dict(monkeypatch, sample_df):
     # GIVEN: a mocked read method that asserts filter logic
-    def mock_read(self, partition_filter=None):
+    def mock_read(self, partition_prefixes=None, partition_filter=None, **kwargs):
+        assert partition_prefixes == ["region=us-east-1"]
         assert partition_filter is not None
 
         # Filter should pass for matching value
@@ -79,6 +86,11 @@ def test_partition_filter_passed_as_dict(monkeypatch, sample_df):
         return sample_df
 
     monkeypatch.setattr("datarush.utils.s3_client.S3Dataset.read", mock_read)
+    monkeypatch.setattr("datarush.utils.s3_client.S3Dataset.read_manifest", lambda self: None)
+    monkeypatch.setattr(
+        "datarush.core.operations.sources.s3_dataset_source.get_s3_client",
+        lambda: FakeS3Client(["datasets/example/region=eu-west-1/a.csv"]),
+    )
 
     parameters = {
         "bucket": "test-bucket",
@@ -108,3 +120,284 @@ def test_partition_filter_passed_as_dict(monkeypatch, sample_df):
     # THEN
     result_df = tableset.get_df("s3_table")
     pd.testing.assert_frame_equal(result_df, sample_df)
+
+
+def test_manifest_replaces_partition_listing(monkeypatch, sample_df):
+    # GIVEN: a dataset with a manifest
+    manifest = DatasetManifest()
+    read_kwargs = {}
+
+    def mock_read(self, **kwargs):
+        read_kwargs.update(kwargs)
+        return sample_df
+
+    monkeypatch.setattr("datarush.utils.s3_client.S3Dataset.read", mock_read)
+    monkeypatch.setattr("datarush.utils.s3_client.S3Dataset.read_manifest", lambda self: manifest)
+    parameters = {
+        "bucket": "test-bucket",
+        "path": "datasets/example",
+        "content_type": "CSV",
+        "partition_filter": {
+            "filters": [{"column": "region", "operator": "equals", "value": "us-east-1"}],
+        },
+        "row_filter": {
+            "conditions": [{"column": "int_column", "operator": "equals", "value": "1"}],
+        },
+    }
+
+    # WHEN
+    with patch("datarush.core.operations.sources.s3_dataset_source.get_s3_client") as client:
+        S3DatasetSource(parameters).operate(Tableset([]))
+
+    # THEN: partitions are not listed, the manifest and the filters are passed to the read
+    client.assert_not_called()
+    assert read_kwargs["partition_prefixes"] is None
+    assert read_kwargs["manifest"] is manifest
+    assert read_kwargs["row_filter"].conditions[0].column == "int_column"
+    assert read_kwargs["partition_filter"]({"region": "us-east-1"}) is True
+
+
+def test_estimate_read_bytes_skips_filtered_partitions():
+    objects = [
+        {"Key": "datasets/example/region=us-east-1/a.csv", "Size": 100},
+        {"Key": "datasets/example/region=us-east-1/b.csv", "Size": 50},
+        {"Key": "datasets/example/region=eu-west-1/c.csv", "Size": 1000},
+    ]
+    parameters = {
+        "bucket": "test-bucket",
+        "path": "datasets/example",
+        "content_type": "CSV",
+        "partition_filter": {
+            "filters": [{"column": "region", "operator": "equals", "value": "us-east-1"}],
+        },
+    }
+
+    with patch("datarush.core.operations.sources.s3_dataset_source.get_s3_client") as client:
+        client.return_value.first_data_key.return_value = objects[0]["Key"]
+        client.return_value.list_objects.return_value = objects
+        op = S3DatasetSource(parameters)
+
+        assert not op.reads_full_source()
+        assert op.estimate_read_bytes() == 150
+        client.return_value.list_objects.assert_called_once_with(
+            "test-bucket", "datasets/example/region=us-east-1/"
+        )
+
+
+class FakeS3Client:
+    """S3 client listing fixed keys and recording the listed prefixes."""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.listed = []
+
+    def first_data_key(self, bucket, prefix):
+        return next(
+            (key for key in self.keys if key.startswith(prefix) and is_data_key(key)), None
+        )
+
+    def list_prefixes(self, bucket, prefix):
+        self.listed.append(prefix)
+        return sorted(
+            {
+                prefix + key.removeprefix(prefix).split("/")[0] + "/"
+                for key in self.keys
+                if key.startswith(prefix) and "/" in key.removeprefix(prefix)
+            }
+        )
+
+
+def _daily_keys(years):
+    return [
+        f"dataset/year={year}/month={month:02d}/day={day:02d}/data.csv"
+        for year in years
+        for month in range(1, 13)
+        for day in range(1, 29)
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters, expected, listed",
+    [
+        (
+            [
+                {"column": "year", "operator": "equals", "value": "2024"},
+                {"column": "month", "operator": "equals", "value": "10"},
+                {"column": "day", "operator": "equals", "value": "05"},
+            ],
+            ["year=2024/month=10/day=05"],
+            [],
+        ),
+        (
+            [
+                {"column": "year", "operator": "equals", "value": "2024"},
+                {"column": "month", "operator": "is greater than", "value": "10"},
+            ],
+            ["year=2024/month=11", "year=2024/month=12"],
+            ["dataset/year=2024/"],
+        ),
+        (
+            [{"column": "day", "operator": "equals", "value": "01"}],
+            [
+                f"year={year}/month={month:02d}/day=01"
+                for year in (2023, 2024)
+                for month in range(1, 13)
+            ],
+            ["dataset/", "dataset/year=2023/", "dataset/year=2024/"],
+        ),
+    ],
+)
+def test_prune_partitions(filters, expected, listed):
+    s3 = FakeS3Client(_daily_keys([2023, 2024]))
+    group = PartitionFilterGroup(filters=filters, combine="and")
+
+    assert _prune_partitions(s3, "bucket", "dataset/", group) == expected
+    assert s3.listed == listed
+
+
+def test_prune_partitions_falls_back_to_filter():
+    s3 = FakeS3Client(_daily_keys([2024]))
+    filters = [{"column": "year", "operator": "equals", "value": "2024"}]
+
+    assert (
+        _prune_partitions(
+            s3, "bucket", "dataset/", PartitionFilterGroup(filters=filters, combine="or")
+        )
+        is None
+    )
+    assert (
+        _prune_partitions(
+            s3,
+            "bucket",
+            "dataset/",
+            PartitionFilterGroup(filters=[{**filters[0], "column": "region"}], combine="and"),
+        )
+        is None
+    )
+
+
+def test_prune_partitions_skips_metadata_objects():
+    # The manifest and compaction logs are not partitioned like the records
+    keys = _daily_keys([2024]) + ["dataset/_manifest.json", "dataset/year=2024/_compaction.json"]
+    s3 = FakeS3Client(keys)
+    filters = [{"column": "month", "operator": "equals", "value": "02"}]
+
+    assert _prune_partitions(
+        s3, "bucket", "dataset/", PartitionFilterGroup(filters=filters, combine="and")
+    ) == ["year=2024/month=02"]
+
+
+def test_incremental_read(monkeypatch, tmp_path, sample_df):
+    # GIVEN: a dataset listing and a state store in a temporary folder
+    objects = [
+        {"Key": "datasets/events/day=01/a.csv", "ETag": "1", "Size": 10},
+        {"Key": "datasets/events/day=01/_SUCCESS", "ETag": "0", "Size": 0},
+        {"Key": "datasets/events/day=02/b.csv", "ETag": "2", "Size": 20},
+    ]
+    read_keys = []
+
+    def mock_read_objects(self, keys, row_filter=None):
+        read_keys.append(keys)
+        return sample_df
+
+    monkeypatch.setenv("STATE_STORE_FILESYSTEM_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "datarush.utils.s3_client.S3Dataset.read_objects", mock_read_objects, raising=True
+    )
+    parameters = {
+        "bucket": "test-bucket",
+        "path": "datasets/events",
+        "content_type": "CSV",
+        "incremental": True,
+    }
+
+    with patch("datarush.core.operations.sources.s3_dataset_source.get_s3_client") as client:
+        client.return_value.list_objects.side_effect = lambda bucket, prefix: list(objects)
+        op = S3DatasetSource(parameters)
+
+        # WHEN: the first run reads all objects and commits
+        op.operate(Tableset([]))
+        op.commit()
+
+        # THEN: only added or changed objects are read afterwards
+        assert op.estimate_read_bytes() == 0
+        objects[0] = {**objects[0], "ETag": "1b"}
+        objects.append({"Key": "datasets/events/day=03/c.csv", "ETag": "3", "Size": 30})
+        assert op.estimate_read_bytes() == 40
+
+        tableset = op.operate(Tableset([]))
+
+        # A run that is not committed is read again
+        op.operate(Tableset([]))
+
+    assert read_keys == [
+        ["datasets/events/day=01/a.csv", "datasets/events/day=02/b.csv"],
+        ["datasets/events/day=01/a.csv", "datasets/events/day=03/c.csv"],
+        ["datasets/events/day=01/a.csv", "datasets/events/day=03/c.csv"],
+    ]
+    pd.testing.assert_frame_equal(tableset.get_df("s3_table"), sample_df)
+    state = FilesystemStateStore(FilesystemStateStoreConfig.fromenv())
+    assert state.read_state("read_s3_dataset/test-bucket/datasets/events") == {
+        "objects": {"datasets/events/day=01/a.csv": "1", "datasets/events/day=02/b.csv": "2"}
+    }
+
+
+def test_incremental_read_compacted_objects(monkeypatch, tmp_path, sample_df):
+    # GIVEN: a partition whose objects are compacted between incremental runs
+    objects = [
+        {"Key": "datasets/events/day=01/a.csv", "ETag": "1", "Size": 10},
+        {"Key": "datasets/events/day=01/b.csv", "ETag": "2", "Size": 10},
+    ]
+    logs = {}
+    read_keys = []
+
+    def mock_read_objects(self, keys, row_filter=None):
+        read_keys.append(keys)
+        return sample_df
+
+    def compact(replaced, compacted):
+        logs["datasets/events/day=01/_compaction.json"] = CompactionLog(
+            objects=[compacted["Key"]],
+            replaced={obj["Key"]: obj["ETag"] for obj in replaced},
+        ).to_json()
+        objects[:] = [obj for obj in objects if obj not in replaced] + [
+            compacted,
+            {"Key": "datasets/events/day=01/_compaction.json", "ETag": "log", "Size": 1},
+        ]
+
+    monkeypatch.setenv("STATE_STORE_FILESYSTEM_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        "datarush.utils.s3_client.S3Dataset.read_objects", mock_read_objects, raising=True
+    )
+    parameters = {
+        "bucket": "test-bucket",
+        "path": "datasets/events",
+        "content_type": "CSV",
+        "incremental": True,
+    }
+
+    with patch("datarush.core.operations.sources.s3_dataset_source.get_s3_client") as client:
+        client.return_value.list_objects.side_effect = lambda bucket, prefix: list(objects)
+        client.return_value.get_object.side_effect = lambda bucket, key: BytesIO(logs[key])
+        op = S3DatasetSource(parameters)
+        op.operate(Tableset([]))
+        op.commit()
+
+        # WHEN: the objects already read are compacted
+        compact(list(objects), {"Key": "datasets/events/day=01/c.csv", "ETag": "3", "Size": 20})
+
+        # THEN: the compacted object is not read again
+        assert op.estimate_read_bytes() == 0
+        op.operate(Tableset([]))
+        op.commit()
+
+        # WHEN: a new object is compacted together with objects already read
+        objects.append({"Key": "datasets/events/day=01/d.csv", "ETag": "4", "Size": 10})
+        replaced = [obj for obj in objects if obj["Key"].endswith(".csv")]
+        compact(replaced, {"Key": "datasets/events/day=01/e.csv", "ETag": "5", "Size": 30})
+
+        # THEN: the read is refused rather than reading records twice or missing them
+        with pytest.raises(IncrementalReadError, match="reset the state"):
+            op.operate(Tableset([]))
+
+    assert read_keys == [["datasets/events/day=01/a.csv", "datasets/events/day=01/b.csv"]]
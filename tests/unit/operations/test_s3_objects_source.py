@@ -0,0 +1,83 @@
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from datarush.core.dataflow import Tableset
+from datarush.core.operations.sources.s3_objects_source import S3ObjectsSource
+from datarush.core.types import Compression, ContentType
+from datarush.utils.misc import to_file
+
+OBJECTS = {
+    "dumps/2024-01-02.csv": pd.DataFrame({"id": [3], "day": ["2024-01-02"]}),
+    "dumps/2024-01-01.csv": pd.DataFrame({"id": [1, 2], "day": ["2024-01-01"] * 2}),
+    "dumps/2023-12-31.csv": pd.DataFrame({"id": [0], "day": ["2023-12-31"]}),
+    "dumps/notes.txt": None,
+    "dumps-archive/2024-01-03.csv": pd.DataFrame({"id": [4], "day": ["2024-01-03"]}),
+}
+
+
+@pytest.fixture
+def mock_s3_client():
+    files = {
+        key: to_file(df, ContentType.CSV, Compression.GZIP).getvalue() if df is not None else b""
+        for key, df in OBJECTS.items()
+    }
+    client = MagicMock()
+    client.list_objects.side_effect = lambda bucket, prefix: [
+        {"Key": key, "Size": len(body)}
+        for key, body in files.items()
+        if key.startswith(prefix.strip("/"))
+    ]
+    client.get_object.side_effect = lambda bucket, key: BytesIO(files[key])
+    with patch(
+        "datarush.core.operations.sources.s3_objects_source.get_s3_client", return_value=client
+    ):
+        yield client
+
+
+def _operation(**model):
+    return S3ObjectsSource(
+        {
+            "bucket": "bucket",
+            "prefix": "dumps/",
+            "content_type": "CSV",
+            "table_name": "dumps",
+            **model,
+        }
+    )
+
+
+def test_read_objects_matching_glob(mock_s3_client):
+    op = _operation(pattern="2024-*.csv", source_key_column="source_key", max_workers=1)
+
+    df = op.operate(Tableset([])).get_df("dumps")
+
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["source_key"].tolist() == [
+        "dumps/2024-01-01.csv",
+        "dumps/2024-01-01.csv",
+        "dumps/2024-01-02.csv",
+    ]
+    assert op.estimate_read_bytes() == sum(
+        obj["Size"]
+        for obj in mock_s3_client.list_objects("bucket", "dumps")
+        if obj["Key"] in ("dumps/2024-01-01.csv", "dumps/2024-01-02.csv")
+    )
+
+
+def test_read_objects_matching_regex(mock_s3_client):
+    op = _operation(pattern=r"\d{4}-\d{2}-\d{2}\.csv", pattern_type="regex", columns=["id"])
+
+    df = op.operate(Tableset([])).get_df("dumps")
+
+    assert df.to_dict("list") == {"id": [0, 1, 2, 3]}
+
+
+def test_read_objects_no_match(mock_s3_client):
+    with pytest.raises(ValueError, match="No object"):
+        _operation(pattern="*.parquet").operate(Tableset([]))
+
+    tableset = _operation(pattern="*.parquet", error_on_empty=False).operate(Tableset([]))
+    assert tableset.get_df("dumps").empty
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from datarush.core.dataflow import Tableset
+from datarush.core.operations.sinks.s3_sink import S3ObjectSink
+
+
+def test_operate_parquet_options():
+    # GIVEN
+    parameters = {
+        "bucket": "test-bucket",
+        "object_key": "data.parquet",
+        "content_type": "PARQUET",
+        "table": "table",
+        "sort_by": ["id"],
+        "parquet_compression": "zstd",
+        "row_group_size": 2,
+        "dictionary_encoding": False,
+    }
+    tableset = Tableset([])
+    tableset.set_df("table", pd.DataFrame({"id": [3, 1, 2], "value": ["c", "a", "b"]}))
+
+    operation = S3ObjectSink(parameters)
+
+    # WHEN
+    with patch("datarush.core.operations.sinks.s3_sink.get_s3_client") as mock_get_client:
+        operation.operate(tableset)
+
+    # THEN
+    args, _ = mock_get_client.return_value.put_object.call_args
+    parquet_file = pq.ParquetFile(args[2])
+    assert parquet_file.metadata.num_row_groups == 2
+    column = parquet_file.metadata.row_group(0).column(0)
+    assert column.compression == "ZSTD"
+    assert "PLAIN_DICTIONARY" not in column.encodings
+    assert "RLE_DICTIONARY" not in column.encodings
+    assert parquet_file.read().to_pandas()["id"].tolist() == [1, 2, 3]
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+from pydantic import ValidationError
+
+from datarush.core.dataflow import Table, Tableset
+from datarush.core.operations.transformations.sort import SortByColumn
+
+
+@pytest.fixture
+def sales_df():
+    return pd.DataFrame(
+        {
+            "region": ["north", "south", "north", "east", "south"],
+            "revenue": [100, 250, 300, 250, 50],
+            "units": [1, 5, 3, 2, 7],
+        }
+    )
+
+
+def test_sort_single_column_backwards_compatible(sales_df):
+    tableset = Tableset([Table("sales", sales_df)])
+
+    op = SortByColumn({"table": "sales", "column": "revenue", "ascending": False})
+    result = op.operate(tableset).get_df("sales")
+
+    assert result["revenue"].tolist() == [300, 250, 250, 100, 50]
+
+
+def test_sort_multiple_columns_with_per_key_direction(sales_df):
+    tableset = Tableset([Table("sales", sales_df)])
+
+    op = SortByColumn(
+        {
+            "table": "sales",
+            "column": "region",
+            "then_by": ["revenue", "units"],
+            "descending": ["revenue"],
+        }
+    )
+    result = op.operate(tableset).get_df("sales")
+
+    expected = sales_df.sort_values(
+        by=["region", "revenue", "units"], ascending=[True, False, True]
+    )
+    pdt.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("na_position", ["first", "last"])
+def test_sort_na_position(na_position):
+    df = pd.DataFrame({"value": [2.0, np.nan, 1.0]})
+    tableset = Tableset([Table("data", df)])
+
+    op = SortByColumn({"table": "data", "column": "value", "na_position": na_position})
+    result = op.operate(tableset).get_df("data")
+
+    pdt.assert_frame_equal(result, df.sort_values("value", na_position=na_position))
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_limit_selects_top_rows(sales_df, ascending):
+    tableset = Tableset([Table("sales", sales_df)])
+
+    op = SortByColumn(
+        {
+            "table": "sales",
+            "column": "revenue",
+            "ascending": ascending,
+            "then_by": ["units"],
+            "descending": [] if ascending else ["units"],
+            "limit": 3,
+        }
+    )
+    result = op.operate(tableset).get_df("sales")
+
+    expected = sales_df.sort_values(
+        by=["revenue", "units"], ascending=ascending, kind="stable"
+    ).head(3)
+    pdt.assert_frame_equal(result, expected)
+
+
+def test_sort_limit_with_mixed_directions_and_strings(sales_df):
+    tableset = Tableset([Table("sales", sales_df)])
+
+    op = SortByColumn(
+        {
+            "table": "sales",
+            "column": "region",
+            "ascending": False,
+            "then_by": ["revenue"],
+            "limit": 2,
+        }
+    )
+    result = op.operate(tableset).get_df("sales")
+
+    assert result["region"].tolist() == ["south", "south"]
+    assert result["revenue"].tolist() == [50, 250]
+
+
+def test_sort_stable_keeps_original_order_of_ties():
+    df = pd.DataFrame({"key": [2, 1, 2, 1] * 50, "order": range(200)})
+    tableset = Tableset([Table("data", df)])
+
+    op = SortByColumn({"table": "data", "column": "key", "stable": True})
+    result = op.operate(tableset).get_df("data")
+
+    for _, group in result.groupby("key"):
+        assert group["order"].is_monotonic_increasing
+
+
+def test_sort_skips_already_sorted_table(sales_df, monkeypatch):
+    df = sales_df.sort_values(by=["region", "revenue"])
+    tableset = Tableset([Table("sales", df)])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sort_values should not be called")
+
+    monkeypatch.setattr(pd.DataFrame, "sort_values", fail)
+
+    op = SortByColumn({"table": "sales", "column": "region", "then_by": ["revenue"]})
+    result = op.operate(tableset).get_df("sales")
+
+    pdt.assert_frame_equal(result, df)
+
+
+def test_sort_summary(sales_df):
+    op = SortByColumn(
+        {
+            "table": "sales",
+            "column": "region",
+            "then_by": ["revenue"],
+            "descending": ["revenue"],
+            "limit": 10,
+        }
+    )
+
+    assert op.summary() == (
+        "Sort `sales` by region in ascending order, then by revenue (descending) "
+        "and keep the first 10 rows"
+    )
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_sort_limit_must_be_positive(limit):
+    op = SortByColumn({"table": "sales", "column": "revenue", "limit": limit})
+
+    with pytest.raises(ValidationError):
+        op.model
+
+
+def test_sort_limit_template(sales_df):
+    tableset = Tableset([Table("sales", sales_df)])
+
+    op = SortByColumn(
+        {
+            "table": "sales",
+            "column": "revenue",
+            "then_by": [],
+            "descending": [],
+            "limit": "{{ parameters.top }}",
+        },
+        advanced_mode=True,
+    )
+    op.update_template_context({"parameters": {"top": 2}})
+    result = op.operate(tableset).get_df("sales")
+
+    assert result["revenue"].tolist() == [50, 100]
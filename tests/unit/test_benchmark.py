@@ -0,0 +1,151 @@
+"""Tests for benchmark module."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from datarush.benchmark import (
+    BenchmarkResult,
+    SyntheticTableSpec,
+    compare_to_baseline,
+    generate_table,
+    load_results,
+    run_benchmarks,
+    run_end_to_end_benchmarks,
+    save_results,
+)
+from datarush.benchmark.end_to_end import END_TO_END_COLUMN_KINDS
+from datarush.benchmark.runner import benchmark_from_command_line
+
+
+def test_generate_table():
+    spec = SyntheticTableSpec(rows=1000, cardinality=10, null_fraction=0.1)
+
+    df = generate_table(spec)
+
+    assert len(df) == 1000
+    assert list(df.columns) == ["id", *spec.columns]
+    assert df["id"].is_unique
+    assert df["string"].nunique() <= 10
+    assert 0 < df["float"].isna().sum() < 300
+    assert isinstance(df["dict"].iloc[0], dict)
+    assert isinstance(df["list"].iloc[0], list)
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df, generate_table(spec))
+
+
+def test_generate_table_repeated_and_unknown_columns():
+    df = generate_table(SyntheticTableSpec(rows=10, columns=("int", "int")))
+    assert list(df.columns) == ["id", "int", "int_2"]
+
+    with pytest.raises(ValueError, match="Unknown column kinds"):
+        generate_table(SyntheticTableSpec(rows=10, columns=("complex",)))
+
+
+def test_run_benchmarks_all_operations():
+    results = run_benchmarks(scales=[500], repeat=1, measure_memory=False)
+
+    failed = [result for result in results if result.status == "failed"]
+    assert failed == []
+
+    by_operation = {result.operation: result for result in results}
+    assert by_operation["sort"].status == "ok"
+    assert by_operation["sort"].rows_per_second > 0
+    assert by_operation["write_s3_dataset"].status == "skipped"
+
+
+def test_run_benchmarks_skips_cases():
+    spec = SyntheticTableSpec(columns=("int",))
+
+    results = run_benchmarks(
+        scales=[20_000], spec=spec, operations=["transpose", "strip", "astype"], repeat=1
+    )
+
+    by_operation = {result.operation: result for result in results}
+    assert by_operation["transpose"].note == "limited to 10,000 rows"
+    assert by_operation["strip"].note == "synthetic table has no columns ['text']"
+    assert by_operation["astype"].status == "ok"
+    assert by_operation["astype"].peak_memory_bytes > 0
+
+
+def test_compare_to_baseline():
+    baseline = [
+        BenchmarkResult("sort", 1000, "ok", seconds=1.0, peak_memory_bytes=100),
+        BenchmarkResult("join", 1000, "ok", seconds=1.0, peak_memory_bytes=100),
+        BenchmarkResult("strip", 1000, "ok", seconds=0.001, peak_memory_bytes=100),
+        BenchmarkResult("melt", 1000, "ok", seconds=1.0, peak_memory_bytes=100),
+    ]
+    results = [
+        BenchmarkResult("sort", 1000, "ok", seconds=1.2, peak_memory_bytes=200),
+        BenchmarkResult("join", 1000, "ok", seconds=2.0, peak_memory_bytes=100),
+        BenchmarkResult("strip", 1000, "ok", seconds=0.01, peak_memory_bytes=100),
+        BenchmarkResult("melt", 1000, "failed", note="boom"),
+        BenchmarkResult("sort", 2000, "ok", seconds=10.0),
+    ]
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25)
+
+    assert [(r.operation, r.metric) for r in regressions] == [
+        ("sort", "peak_memory_bytes"),
+        ("join", "seconds"),
+        ("melt", "failed"),
+    ]
+    assert regressions[1].ratio == 2.0
+
+
+def test_save_and_load_results(tmp_path):
+    results = [BenchmarkResult("sort", 1000, "ok", seconds=1.0, rows_per_second=1000.0)]
+    path = str(tmp_path / "results.json")
+
+    save_results(results, path)
+
+    assert load_results(path) == results
+
+
+def test_benchmark_from_command_line_regression(monkeypatch, tmp_path, capsys):
+    baseline_path = tmp_path / "baseline.json"
+    save_results([BenchmarkResult("astype", 1000, "ok", seconds=1e-9)], str(baseline_path))
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "datarush",
+            "benchmark",
+            "--rows",
+            "1e3",
+            "--operations",
+            "astype",
+            "--repeat",
+            "1",
+            "--baseline",
+            str(baseline_path),
+            "--output",
+            str(tmp_path / "results.json"),
+        ],
+    )
+
+    # Baseline timings below the noise threshold are not compared
+    benchmark_from_command_line()
+    assert "REGRESSION" not in capsys.readouterr().out
+    assert load_results(str(tmp_path / "results.json"))[0].operation == "astype"
+
+    save_results([BenchmarkResult("astype", 1000, "ok", seconds=0.01)], str(baseline_path))
+    monkeypatch.setattr("datarush.benchmark.runner.time.perf_counter", iter(range(100)).__next__)
+    with pytest.raises(SystemExit):
+        benchmark_from_command_line()
+    assert "REGRESSION: astype @ 1,000 rows: seconds" in capsys.readouterr().out
+
+
+def test_run_end_to_end_benchmarks():
+    pytest.importorskip("moto.server")
+    spec = SyntheticTableSpec(rows=100, columns=END_TO_END_COLUMN_KINDS)
+
+    results = run_end_to_end_benchmarks(scales=[200], spec=spec, repeat=1, files=2)
+
+    assert [(result.operation, result.status) for result in results] == [
+        (f"end_to_end:{scenario}:{content_type}", "ok")
+        for content_type in ("csv", "json", "jsonl", "parquet", "arrow")
+        for scenario in ("overwrite", "append_unique", "upsert")
+    ]
+    assert all(result.rows == 200 and result.rows_per_second > 0 for result in results)
+    assert os.environ["TEMPLATE_STORE_TYPE"] == "FILESYSTEM"
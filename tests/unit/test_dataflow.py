@@ -1,11 +1,23 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from typing import Any
 
 import pandas as pd
 import pytest
 from pydantic import Field
 
-from datarush.core.dataflow import Dataflow, Operation, Table, Tableset
-from datarush.core.types import BaseOperationModel, ColumnStr, ParameterSpec, TableStr
+from datarush.core.dataflow import Dataflow, Operation, Table, Tableset, _SourcePrefetch
+from datarush.core.operations.sources.local_file_source import LocalFileSource
+from datarush.core.operations.transformations.copy_table import CopyTable
+from datarush.core.operations.transformations.join import JoinTables
+from datarush.core.types import (
+    BaseOperationModel,
+    ColumnStr,
+    OutputTableStr,
+    ParameterSpec,
+    TableStr,
+)
 from datarush.exceptions import UnknownTableError
 from datarush.ui.state import DataflowUI
 
@@ -224,3 +236,212 @@ def test_dataflow_ui_run():
     assert operation1.called_count == 2
     assert operation2.called_count == 3
     assert operation3.called_count == 2
+
+
+def test_dataflow_run_release_tables():
+    class RecordTables(MockOperation):
+        """Mock operation recording the tables it sees."""
+
+        has_side_effects = True
+
+        def operate(self, tableset: Tableset) -> Tableset:
+            self.tables = list(tableset)
+            return tableset
+
+    csv = b"id,name\n1, a\n2, b\n"
+    record = RecordTables({"table": "joined", "column": "id"})
+    dataflow = Dataflow(
+        operations=[
+            LocalFileSource({"content_type": "CSV", "file": csv, "table_name": "left"}),
+            LocalFileSource({"content_type": "CSV", "file": csv, "table_name": "right"}),
+            JoinTables(
+                {
+                    "left_table": "left",
+                    "right_table": "right",
+                    "left_on": "id",
+                    "right_on": "id",
+                    "output_table": "joined",
+                }
+            ),
+            record,
+            CopyTable({"source_table": "joined", "target_table": "copy"}),
+        ]
+    )
+
+    dataflow.run(release_tables=True, keep_tables=["result"])
+
+    assert record.tables == ["joined"]
+    assert list(dataflow.current_tableset) == []
+
+    dataflow.run()
+
+    assert list(dataflow.current_tableset) == ["left", "right", "joined", "copy"]
+
+
+def test_dataflow_run_commits_after_success():
+    class Committing(MockOperation):
+        """Mock operation recording commits."""
+
+        commits = 0
+        fail = False
+
+        def operate(self, tableset: Tableset) -> Tableset:
+            if self.fail:
+                raise RuntimeError("failed")
+            return tableset
+
+        def commit(self) -> None:
+            self.commits += 1
+
+    first = Committing({"table": "table", "column": "id"})
+    second = Committing({"table": "table", "column": "id"})
+    dataflow = Dataflow(operations=[first, second])
+
+    dataflow.run()
+    assert (first.commits, second.commits) == (1, 1)
+
+    second.fail = True
+    with pytest.raises(RuntimeError):
+        dataflow.run()
+    assert (first.commits, second.commits) == (1, 1)
+
+
+class MockSourceModel(BaseOperationModel):
+    """Mock source model."""
+
+    table_name: OutputTableStr = Field(title="Table Name")
+
+
+REQUEST_ID: ContextVar[str] = ContextVar("REQUEST_ID", default="")
+
+
+class MockSource(Operation):
+    """Mock source recording the thread and context it reads in."""
+
+    name = "mock_source"
+    title = "Mock Source"
+    description = "Mocking a source for testing"
+    model: MockSourceModel
+    prefetchable = True
+
+    def __init__(self, model_dict: dict[str, Any], barrier: threading.Barrier | None = None):
+        super().__init__(model_dict)
+        self.barrier = barrier
+        self.error: Exception | None = None
+
+    def summary(self) -> str:
+        return f"Load `{self.model.table_name}` table"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        self.thread = threading.current_thread()
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.error is not None:
+            raise self.error
+        tableset.set_df(self.model.table_name, pd.DataFrame({"id": [REQUEST_ID.get()]}))
+        return tableset
+
+
+def test_dataflow_run_prefetch():
+    # Both sources wait for each other, so the run only succeeds if they read concurrently
+    barrier = threading.Barrier(2, timeout=5)
+    first = MockSource({"table_name": "first"}, barrier)
+    second = MockSource({"table_name": "second"}, barrier)
+    dataflow = Dataflow(
+        operations=[
+            first,
+            CopyTable({"source_table": "first", "target_table": "copy"}),
+            second,
+        ]
+    )
+
+    token = REQUEST_ID.set("request")
+    try:
+        dataflow.run(prefetch_workers=2)
+    finally:
+        REQUEST_ID.reset(token)
+
+    assert list(dataflow.current_tableset) == ["first", "copy", "second"]
+    assert dataflow.current_tableset.get_df("second")["id"].tolist() == ["request"]
+    assert first.thread is not threading.current_thread()
+
+
+def test_dataflow_run_prefetch_stops_at_writes():
+    class Sink(MockOperation):
+        """Mock operation writing outside the dataflow."""
+
+        has_side_effects = True
+
+    first = MockSource({"table_name": "first"})
+    second = MockSource({"table_name": "second"})
+    dataflow = Dataflow(
+        operations=[first, Sink({"table": "first", "column": "id"}), second],
+    )
+
+    dataflow.run(prefetch_workers=2)
+
+    assert first.thread is not threading.current_thread()
+    assert second.thread is threading.current_thread()
+    assert list(dataflow.current_tableset) == ["first", "second"]
+
+    dataflow.run(prefetch_workers=2, profile=True)
+
+    assert first.thread is threading.current_thread()
+
+
+def test_dataflow_run_prefetch_stops_at_custom_sink():
+    # The sink only has a TableStr field and does not override output_tables
+    first = MockSource({"table_name": "first"})
+    second = MockSource({"table_name": "second"})
+    dataflow = Dataflow(
+        operations=[first, MockOperation({"table": "first", "column": "id"}), second],
+    )
+
+    dataflow.run(prefetch_workers=2)
+
+    assert first.thread is not threading.current_thread()
+    assert second.thread is threading.current_thread()
+
+
+def test_source_prefetch_holds_at_most_window():
+    sources = [MockSource({"table_name": f"t{i}"}) for i in range(4)]
+    executor = ThreadPoolExecutor(max_workers=2)
+    submit = executor.submit
+    submitted = []
+
+    def record_submit(fn, *args):
+        submitted.append(len(submitted) + 1)
+        return submit(fn, *args)
+
+    executor.submit = record_submit  # type: ignore[method-assign]
+    with executor:
+        prefetch = _SourcePrefetch(executor, sources, [1, 2, 3, 4], window=2)
+        assert submitted == [1, 2]
+
+        assert list(prefetch.take(1)) == ["t0"]
+        assert submitted == [1, 2, 3]
+        assert list(prefetch.take(2)) == ["t1"]
+        assert list(prefetch.take(3)) == ["t2"]
+        assert list(prefetch.take(4)) == ["t3"]
+        assert submitted == [1, 2, 3, 4]
+
+
+def test_dataflow_run_prefetch_one_worker():
+    sources = [MockSource({"table_name": f"t{i}"}) for i in range(3)]
+    dataflow = Dataflow(operations=sources)
+
+    dataflow.run(prefetch_workers=1)
+
+    assert list(dataflow.current_tableset) == ["t0", "t1", "t2"]
+    assert all(source.thread is not threading.current_thread() for source in sources)
+
+
+def test_dataflow_run_prefetch_error():
+    first = MockSource({"table_name": "first"})
+    second = MockSource({"table_name": "second"})
+    second.error = ValueError("unreadable")
+    dataflow = Dataflow(operations=[first, second])
+
+    with pytest.raises(ValueError, match="unreadable"):
+        dataflow.run(prefetch_workers=2)
+    assert list(dataflow.current_tableset) == ["first"]
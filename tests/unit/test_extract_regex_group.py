@@ -105,3 +105,85 @@ def test_extract_missing_group_error():
 
     with pytest.raises(ValueError, match="Group 'missing' not found in regex match"):
         op.operate(tableset)
+
+
+def test_extract_multiple_groups_in_single_pass():
+    df = pd.DataFrame({"email": ["alice@example.com", "bob@site.org", "invalid"]})
+    tableset = Tableset([Table("users", df)])
+
+    model = {
+        "table": "users",
+        "column": "email",
+        "regex": r"(?P<user>^[^@]+)@(?P<domain>[^@]+$)",
+        "group": "user",
+        "target_column": "username",
+        "extra_groups": {"domain": "domain", "0": "address"},
+    }
+
+    op = ExtractRegexGroup(model)
+    result = op.operate(tableset)
+
+    expected = df.copy()
+    expected["username"] = ["alice", "bob", None]
+    expected["domain"] = ["example.com", "site.org", None]
+    expected["address"] = ["alice@example.com", "bob@site.org", None]
+    pdt.assert_frame_equal(result.get_df("users"), expected)
+
+
+def test_extract_from_non_string_column():
+    df = pd.DataFrame({"code": [1001, 2002]})
+    tableset = Tableset([Table("codes", df)])
+
+    model = {
+        "table": "codes",
+        "column": "code",
+        "regex": r"^(\d)",
+        "target_column": "prefix",
+    }
+
+    op = ExtractRegexGroup(model)
+    result = op.operate(tableset)
+
+    expected = df.copy()
+    expected["prefix"] = ["1", "2"]
+    pdt.assert_frame_equal(result.get_df("codes"), expected)
+
+
+def test_extract_missing_group_null_behavior():
+    df = pd.DataFrame({"data": ["val:123"]})
+    tableset = Tableset([Table("input", df)])
+
+    model = {
+        "table": "input",
+        "column": "data",
+        "regex": r"val:(\d+)",
+        "group": "2",
+        "target_column": "output",
+        "on_missing": "null",
+    }
+
+    op = ExtractRegexGroup(model)
+    result = op.operate(tableset)
+
+    assert result.get_df("input")["output"].tolist() == [None]
+
+
+def test_extract_whole_match_with_inline_flags():
+    df = pd.DataFrame({"code": ["id-ABC-1", "id-xyz-2", "none"]})
+    tableset = Tableset([Table("codes", df)])
+
+    model = {
+        "table": "codes",
+        "column": "code",
+        "regex": r"(?i)[a-z]+-(\d)",
+        "group": "0",
+        "target_column": "match",
+        "extra_groups": {"1": "number"},
+    }
+
+    result = ExtractRegexGroup(model).operate(tableset)
+
+    expected = df.copy()
+    expected["match"] = ["ABC-1", "xyz-2", None]
+    expected["number"] = ["1", "2", None]
+    pdt.assert_frame_equal(result.get_df("codes"), expected)
@@ -2,6 +2,7 @@ import jinja2
 import pytest
 from pydantic import BaseModel, Field
 
+from datarush.utils import jinja2 as jinja2_utils
 from datarush.utils.jinja2 import model_validate_jinja2, render_jinja2_template
 
 
@@ -90,3 +91,30 @@ def test_model_validate_jinja2_with_invalid_type_conversion():
 
     with pytest.raises(ValueError):
         model_validate_jinja2(TestModel, model_dict, context)
+
+
+@pytest.mark.parametrize("template_str", ["plain text", "line\n", "a\r\nb", "", "{# c #}x"])
+def test_render_jinja2_template_matches_jinja2(template_str):
+    assert render_jinja2_template(template_str, {}) == jinja2.Template(template_str).render({})
+
+
+def test_render_jinja2_template_constant_skips_jinja2(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Jinja2 should not be invoked")
+
+    monkeypatch.setattr(jinja2_utils._ENVIRONMENT, "get_template", fail)
+
+    assert render_jinja2_template("s3://bucket/key.csv", {}) == "s3://bucket/key.csv"
+
+
+def test_render_jinja2_template_reuses_compiled_template():
+    template_str = "{{ value }} is cached"
+
+    first = jinja2_utils._ENVIRONMENT.get_template(template_str)
+    assert render_jinja2_template(template_str, {"value": "template"}) == "template is cached"
+    assert jinja2_utils._ENVIRONMENT.get_template(template_str) is first
+
+
+def test_render_jinja2_template_syntax_error():
+    with pytest.raises(jinja2.exceptions.TemplateSyntaxError):
+        render_jinja2_template("{{ unclosed", {})
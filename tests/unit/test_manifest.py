@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+from datarush.core.types import RowConditionGroup
+from datarush.utils.manifest import ColumnStats, DatasetManifest, StatsKind, describe_objects
+
+
+def _group(*conditions, combine="and"):
+    return RowConditionGroup.model_validate({"conditions": conditions, "combine": combine})
+
+
+def _condition(column, operator, value, value_type="string", negate=False):
+    return {
+        "column": column,
+        "operator": operator,
+        "value": value,
+        "value_type": value_type,
+        "negate": negate,
+    }
+
+
+def test_column_stats():
+    df = pd.DataFrame(
+        {
+            "number": [3, 1, None],
+            "string": pd.Series(["b", "a", "c"], dtype="category"),
+            "flag": [True, False, True],
+            "time": pd.to_datetime(["2025-01-02", "2025-01-01", None]),
+            "mixed": [1, "a", None],
+            "empty": [None, None, None],
+        }
+    )
+
+    stats = {name: ColumnStats.from_series(df[name]) for name in df.columns}
+
+    assert stats["number"] == ColumnStats(1, StatsKind.NUMBER, 1.0, 3.0)
+    assert stats["string"] == ColumnStats(0, StatsKind.STRING, "a", "c")
+    assert stats["flag"] == ColumnStats(0, StatsKind.BOOLEAN, False, True)
+    assert stats["time"] == ColumnStats(
+        1, StatsKind.DATETIME, "2025-01-01T00:00:00", "2025-01-02T00:00:00"
+    )
+    assert stats["mixed"] == ColumnStats(1)
+    assert stats["empty"] == ColumnStats(3)
+
+
+@pytest.mark.parametrize(
+    "conditions, combine, expected",
+    [
+        ([_condition("id", "equals", "15", "integer")], "and", True),
+        ([_condition("id", "equals", "25", "integer")], "and", False),
+        ([_condition("id", "is less than", "10", "integer")], "and", False),
+        ([_condition("id", "is less than or equals", "10", "integer")], "and", True),
+        ([_condition("id", "is greater than", "20", "integer")], "and", False),
+        ([_condition("id", "is greater than or equals", "20", "integer")], "and", True),
+        ([_condition("id", "equals", "25", "integer", negate=True)], "and", True),
+        ([_condition("id", "equals", "15")], "and", True),
+        ([_condition("name", "is greater than", "m")], "and", False),
+        ([_condition("name", "matches regex", "z.*")], "and", True),
+        ([_condition("time", "is less than", "2025-01-01", "datetime")], "and", False),
+        ([_condition("time", "is less than", "2025-01-01", "date")], "and", False),
+        ([_condition("time", "is greater than", "2025-01-01", "date")], "and", True),
+        ([_condition("empty", "equals", "a")], "and", False),
+        ([_condition("unknown", "equals", "a")], "and", True),
+        (
+            [_condition("id", "equals", "25", "integer"), _condition("name", "equals", "b")],
+            "and",
+            False,
+        ),
+        (
+            [_condition("id", "equals", "25", "integer"), _condition("name", "equals", "b")],
+            "or",
+            True,
+        ),
+        ([], "or", True),
+    ],
+)
+def test_may_match(conditions, combine, expected):
+    df = pd.DataFrame(
+        {
+            "id": [10, 20],
+            "name": ["a", "c"],
+            "time": pd.to_datetime(["2025-01-01 12:00", "2025-01-03 00:00"]),
+            "empty": [None, None],
+        }
+    )
+    (file,) = describe_objects(["part=a/object.csv"], df)
+
+    assert file.may_match(_group(*conditions, combine=combine)) is expected
+
+
+def test_manifest_json_round_trip():
+    df = pd.DataFrame({"id": [1, 2, 3], "time": pd.to_datetime(["2025-01-01"] * 3)})
+    manifest = DatasetManifest(
+        describe_objects(["part=a/0.parquet", "part=a/1.parquet"], df)
+        + describe_objects(["part=b/0.parquet"], df)
+    )
+
+    parsed = DatasetManifest.from_json(manifest.to_json())
+
+    assert parsed == manifest
+    assert [file.rows for file in parsed.files] == [None, None, 3]
+    assert [file.folder for file in parsed.files] == ["part=a", "part=a", "part=b"]
+    assert parsed.columns() == ["id", "time"]
+
+    parsed.remove_folders({"part=a"})
+    assert [file.path for file in parsed.files] == ["part=b/0.parquet"]
+
+    with pytest.raises(ValueError, match="Invalid dataset manifest"):
+        DatasetManifest.from_json(b'{"version": 2, "files": []}')
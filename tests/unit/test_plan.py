@@ -0,0 +1,235 @@
+"""Tests for plan module."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from datarush.core.dataflow import Dataflow, Operation, Tableset
+from datarush.core.operations.sinks.s3_dataset_sink import S3DatasetSink
+from datarush.core.operations.sources.local_file_source import LocalFileSource
+from datarush.core.operations.sources.s3_dataset_source import S3DatasetSource
+from datarush.core.operations.transformations.filter_row import FilterByColumn
+from datarush.core.operations.transformations.join import JoinTables
+from datarush.core.operations.transformations.rename_table import RenameTable
+from datarush.core.operations.transformations.split_table_on_column import SplitTableOnColumn
+from datarush.core.operations.transformations.strip import Strip
+from datarush.core.plan import analyze_liveness, format_bytes
+from datarush.core.types import BaseOperationModel, OutputTableStr, TableStr
+from datarush.ui.state import DataflowUI
+
+CSV = b"id,name\n1, a\n2, b\n"
+
+
+class LoadModel(BaseOperationModel):
+    """Load model."""
+
+    table_name: OutputTableStr
+
+
+class LoadOperation(Operation):
+    """Operation loading a table."""
+
+    name = "load"
+    title = "Load"
+    description = "Load a table"
+    model: LoadModel
+
+    def summary(self) -> str:
+        """Provide summary."""
+        return "Load"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        tableset.set_df(self.model.table_name, pd.DataFrame({"id": ["1", "2"]}))
+        return tableset
+
+
+class SendModel(BaseOperationModel):
+    """Send model."""
+
+    table: TableStr
+
+
+class SendOperation(Operation):
+    """Sink sending a table outside the dataflow."""
+
+    name = "send"
+    title = "Send"
+    description = "Send a table"
+    model: SendModel
+
+    def summary(self) -> str:
+        """Provide summary."""
+        return "Send"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        return tableset
+
+
+def _local_file(table: str) -> LocalFileSource:
+    return LocalFileSource({"content_type": "CSV", "file": CSV, "table_name": table})
+
+
+def _filter(table: str) -> FilterByColumn:
+    return FilterByColumn(
+        {
+            "table": table,
+            "conditions": {"conditions": [{"column": "id", "operator": "equals", "value": "1"}]},
+        }
+    )
+
+
+def test_explain_table_dependencies_and_stages():
+    dataflow = Dataflow(
+        operations=[
+            _local_file("left"),
+            _local_file("right"),
+            Strip({"table": "left", "columns": ["name"]}),
+            JoinTables(
+                {
+                    "left_table": "left",
+                    "right_table": "right",
+                    "left_on": "id",
+                    "right_on": "id",
+                    "output_table": "joined",
+                }
+            ),
+            RenameTable({"table": "joined", "new_name": "result"}),
+        ]
+    )
+
+    plan = dataflow.explain()
+
+    local_left, local_right, strip, join, rename = plan.operations
+    assert (local_left.stage, local_right.stage, strip.stage) == (1, 1, 2)
+    assert local_left.output_tables == ["left"]
+    assert strip.input_tables == {"left": 1}
+    assert strip.output_tables == ["left"]
+    assert strip.chunk_safe and not join.chunk_safe
+    assert join.input_tables == {"left": 3, "right": 2}
+    assert join.depends_on == [2, 3]
+    assert (join.stage, rename.stage) == (3, 4)
+    assert rename.dropped_tables == ["joined"]
+    assert local_left.read_bytes == len(CSV)
+    assert join.input_bytes == 2 * len(CSV)
+    assert plan.read_bytes == 2 * len(CSV)
+    assert plan.stages == 4
+    assert plan.warnings == []
+    assert json.loads(plan.to_json())["operations"][3]["output_tables"] == ["joined"]
+    assert "#4 Join Tables: `left` (#3), `right` (#2) -> `joined`" in plan.to_text()
+
+
+def test_explain_warnings():
+    source = S3DatasetSource(
+        {"bucket": "bucket", "path": "dataset", "content_type": "CSV", "table_name": "data"}
+    )
+    dataflow = Dataflow(
+        operations=[
+            source,
+            _filter("data"),
+            _filter("data"),
+            _filter("missing"),
+            S3DatasetSink(
+                {
+                    "bucket": "bucket",
+                    "path": "output",
+                    "content_type": "CSV",
+                    "mode": "overwrite",
+                    "table": "data",
+                }
+            ),
+        ]
+    )
+
+    plan = dataflow.explain(estimate=False)
+
+    assert plan.warnings == [
+        "#2 Filter Rows drops rows of `data` after #1 Read S3 Dataset read all of it, "
+        "filtering the source could avoid reading data that is dropped",
+        "#4 Filter Rows reads `missing`, which no earlier operation creates",
+    ]
+    assert plan.operations[0].read_bytes is None
+    assert plan.operations[-1].output_tables == []
+    assert plan.operations[-1].depends_on == [3]
+
+
+def test_explain_unresolved_and_dynamic_tables():
+    dataflow = Dataflow(
+        operations=[
+            _local_file("data"),
+            SplitTableOnColumn({"table": "data", "split_column": "name"}),
+            _filter("a"),
+            Strip({"table": "{{ parameters.missing.name }}", "columns": []}, advanced_mode=True),
+            _filter("b"),
+        ],
+    )
+
+    plan = dataflow.explain()
+
+    split, filter_a, strip, filter_b = plan.operations[1:]
+    assert split.output_tables == []
+    assert filter_a.depends_on == [2]
+    assert strip.error is not None
+    assert strip.depends_on == [1, 2, 3]
+    assert filter_b.depends_on == [4]
+    assert len(plan.warnings) == 1 and "cannot resolve tables" in plan.warnings[0]
+
+
+def test_explain_cache_hits():
+    dataflow = DataflowUI(operations=[LoadOperation({"table_name": "data"}), _filter("data")])
+    dataflow.run()
+    dataflow.operations[1].model_dict["conditions"]["conditions"][0]["value"] = "2"
+
+    plan = dataflow.explain()
+
+    assert [op.cache_hit for op in plan.operations] == [True, False]
+
+
+def test_analyze_liveness():
+    operations = [
+        _local_file("data"),
+        _local_file("lookup"),
+        Strip({"table": "lookup", "columns": ["name"]}),
+        _filter("data"),
+        RenameTable({"table": "data", "new_name": "result"}),
+        Strip({"table": "result", "columns": ["name"]}),
+    ]
+    operations[1].is_enabled = False
+
+    liveness = analyze_liveness(operations, keep_tables=["result"])
+
+    assert liveness.unused == {3}
+    assert liveness.live_after == {
+        1: {"data"},
+        3: {"data"},
+        4: {"data"},
+        5: {"result"},
+        6: {"result"},
+    }
+    assert analyze_liveness(operations).unused == {3, 6}
+
+
+def test_analyze_liveness_custom_sink():
+    operations = [
+        _local_file("data"),
+        SendOperation({"table": "data"}),
+        Strip({"table": "data", "columns": ["name"]}),
+    ]
+
+    liveness = analyze_liveness(operations)
+
+    # The sink has no output table field, so it may write its table out and is kept
+    assert operations[1].may_have_side_effects()
+    assert not operations[2].may_have_side_effects()
+    assert liveness.unused == {3}
+    assert liveness.live_after[1] == {"data"}
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [(None, "unknown"), (512, "512 B"), (1536, "1.5 KiB"), (5 * 1024**3, "5.0 GiB")],
+)
+def test_format_bytes(size, expected):
+    assert format_bytes(size) == expected
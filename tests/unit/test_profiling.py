@@ -0,0 +1,216 @@
+"""Tests for profiling module."""
+
+import json
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from datarush.core.dataflow import Dataflow, Operation, Tableset
+from datarush.core.types import BaseOperationModel, OutputTableStr, TableStr
+from datarush.ui.state import DataflowUI
+from datarush.utils.profiling import RunProfile, RunProfiler, profile_tables
+
+
+class EmptyModel(BaseOperationModel):
+    """Empty model."""
+
+
+class LoadOperation(Operation):
+    """Operation loading a table."""
+
+    name = "load"
+    title = "Load"
+    description = "Load a table"
+    model: EmptyModel
+
+    def summary(self) -> str:
+        """Provide summary."""
+        return "Load"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        tableset.set_df("table", pd.DataFrame({"a": range(100), "b": ["x"] * 100}))
+        return tableset
+
+
+class HeadOperation(Operation):
+    """Operation keeping the first rows of a table."""
+
+    name = "head"
+    title = "Head"
+    description = "Keep the first rows"
+    model: EmptyModel
+
+    def summary(self) -> str:
+        """Provide summary."""
+        return "Head"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        tableset.set_df("table", tableset.get_df("table").head(10))
+        return tableset
+
+
+class FailingOperation(HeadOperation):
+    """Operation that always fails."""
+
+    name = "fail"
+    title = "Fail"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        raise ValueError("boom")
+
+
+class CopyModel(BaseOperationModel):
+    """Model of an operation copying a table."""
+
+    table: TableStr
+    output_table: OutputTableStr
+
+
+class CopyOperation(Operation):
+    """Operation copying a table."""
+
+    name = "copy"
+    title = "Copy"
+    description = "Copy a table"
+    model: CopyModel
+
+    def summary(self) -> str:
+        """Provide summary."""
+        return "Copy"
+
+    def operate(self, tableset: Tableset) -> Tableset:
+        """Run operation."""
+        tableset.set_df(self.model.output_table, tableset.get_df(self.model.table).copy())
+        return tableset
+
+
+def test_profile_tables():
+    tableset = Tableset([])
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    tableset.set_df("table", df)
+
+    profiles = profile_tables(tableset)
+
+    assert profiles["table"].rows == 3
+    assert profiles["table"].columns == 2
+    assert profiles["table"].memory_bytes == df.memory_usage(deep=True).sum()
+
+
+def test_dataflow_run_profile():
+    dataflow = Dataflow(operations=[LoadOperation({}), HeadOperation({})])
+
+    dataflow.run(profile=True)
+
+    profile = dataflow.profile
+    assert isinstance(profile, RunProfile)
+    assert [op.name for op in profile.operations] == ["load", "head"]
+
+    load, head = profile.operations
+    assert load.index == 1
+    assert load.input_tables == {}
+    assert load.output_rows == 100
+    assert load.traced_memory_peak_bytes > 0
+    assert head.input_tables == load.output_tables
+    assert (head.input_rows, head.output_rows) == (100, 10)
+    assert head.output_memory_bytes < head.input_memory_bytes
+    assert all(op.wall_time >= 0 and op.cpu_time >= 0 for op in profile.operations)
+    assert profile.wall_time >= sum(op.wall_time for op in profile.operations)
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_tables_selected():
+    tableset = Tableset([])
+    tableset.set_df("a", pd.DataFrame({"x": [1, 2]}))
+    tableset.set_df("b", pd.DataFrame({"x": [1, 2, 3]}))
+
+    profiles = profile_tables(tableset, ["b", "missing"])
+
+    assert list(profiles) == ["b"]
+    assert profiles["b"].rows == 3
+
+
+def test_dataflow_run_profile_operation_tables():
+    dataflow = Dataflow(
+        operations=[
+            LoadOperation({}),
+            CopyOperation({"table": "table", "output_table": "copy"}),
+            CopyOperation({"table": "copy", "output_table": "copy2"}),
+        ]
+    )
+
+    dataflow.run(profile=True)
+
+    assert dataflow.profile is not None
+    load, first, second = dataflow.profile.operations
+    assert list(load.output_tables) == ["table"]
+    assert list(first.input_tables) == ["table"]
+    assert list(first.output_tables) == ["copy"]
+    assert list(second.input_tables) == ["copy"]
+    assert list(second.output_tables) == ["copy2"]
+    assert (second.input_rows, second.output_rows) == (100, 100)
+
+
+def test_dataflow_run_profile_unresolved_tables():
+    dataflow = Dataflow(
+        operations=[
+            LoadOperation({}),
+            CopyOperation({"table": "table", "output_table": "copy"}),
+            CopyOperation(
+                {"table": "table", "output_table": "{{ undefined.name }}"}, advanced_mode=True
+            ),
+        ]
+    )
+
+    with pytest.raises(Exception, match="undefined"):
+        dataflow.run(profile=True)
+
+    # The tables of the last operation cannot be resolved, so the whole tableset is profiled
+    assert dataflow.profile is not None
+    assert list(dataflow.profile.operations[2].input_tables) == ["table", "copy"]
+
+
+def test_dataflow_run_without_profile():
+    dataflow = Dataflow(operations=[LoadOperation({})])
+    dataflow.run()
+    assert dataflow.profile is None
+
+
+def test_dataflow_run_profile_failed_operation():
+    dataflow = Dataflow(operations=[LoadOperation({}), FailingOperation({})])
+
+    with pytest.raises(ValueError, match="boom"):
+        dataflow.run(profile=True)
+
+    assert dataflow.profile is not None
+    assert dataflow.profile.operations[-1].error == "ValueError: boom"
+
+
+def test_dataflow_ui_run_profile_cache_hits():
+    dataflow = DataflowUI(operations=[LoadOperation({}), HeadOperation({})])
+    dataflow.run()
+
+    dataflow.run(profile=True)
+
+    assert dataflow.profile is not None
+    assert [op.cache_hit for op in dataflow.profile.operations] == [True, True]
+    assert dataflow.profile.operations[1].output_rows == 10
+
+
+def test_run_profile_serialization():
+    tableset = Tableset([])
+    profiler = RunProfiler(lambda: tableset)
+    with profiler.operation(1, LoadOperation({})):
+        LoadOperation({}).operate(tableset)
+    profile = profiler.finish()
+
+    data = json.loads(profile.to_json())
+    assert data["operations"][0]["name"] == "load"
+    assert data["operations"][0]["output_tables"]["table"]["rows"] == 100
+
+    df = profile.to_dataframe()
+    assert df[["operation", "rows_in", "rows_out"]].values.tolist() == [["Load", 0, 100]]
+    assert profile.slowest() is profile.operations[0]
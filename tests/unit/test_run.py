@@ -1,15 +1,22 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from datarush.config import DatarushConfig, get_datarush_config
+from datarush.core.plan import DataflowPlan
 from datarush.core.types import ParameterSpec
 from datarush.run import (
+    RunResult,
+    _init_batch_worker,
     _parse_parameter_values_from_specs,
-    _setup,
+    _read_parameter_sets,
     run_template,
+    run_template_batch,
     run_template_from_command_line,
+    setup,
 )
+from datarush.utils.profiling import RunProfile
 
 CustomOperation = MagicMock(name="custom_operation")
 
@@ -26,7 +33,7 @@ def mock_template_manager():
 
 @pytest.fixture
 def mock_setup():
-    with patch("datarush.run._setup") as mock_setup:
+    with patch("datarush.run.setup") as mock_setup:
         yield mock_setup
 
 
@@ -72,7 +79,10 @@ def test_run_template_no_parameters_no_config(mock_setup, mock_template_manager,
     # Assertions
     mock_template_manager.return_value.read_template.assert_called_once_with("test_template", "v1")
     mock_dataflow.set_parameters_values.assert_not_called()
-    mock_dataflow.run.assert_called_once()
+    # Tables are only released on request, custom operations may not declare what they read
+    mock_dataflow.run.assert_called_once_with(
+        profile=False, release_tables=False, prefetch_workers=0
+    )
     mock_setup.assert_called_once_with(None)
 
 
@@ -165,7 +175,164 @@ def test_parse_parameter_values_from_specs_missing_required():
 
 @patch("datarush.run.register_operation_type")
 def test_setup(mock_register_operation_type):
-    _setup(MOCK_CONFIG)
+    setup(MOCK_CONFIG)
 
     assert get_datarush_config() == MOCK_CONFIG
     mock_register_operation_type.assert_called_once_with(CustomOperation)
+
+
+def test_run_template_batch_reuses_dataflow(mock_setup, mock_template_manager, mock_dataflow):
+    mock_template_manager.return_value.read_template.return_value = {"mock": "template"}
+    mock_dataflow.parameters = [
+        ParameterSpec(name="day", type="integer", description="Day", default="", required=True)
+    ]
+    mock_dataflow.run.side_effect = [None, RuntimeError("boom"), None]
+
+    results = run_template_batch(
+        "test_template", "v1", [{"day": "1"}, {"day": "2"}, {"day": "3"}], config=MOCK_CONFIG
+    )
+
+    mock_template_manager.return_value.read_template.assert_called_once_with("test_template", "v1")
+    assert mock_dataflow.run.call_count == 3
+    assert [r.succeeded for r in results] == [True, False, True]
+    assert [r.parameters for r in results] == [{"day": "1"}, {"day": "2"}, {"day": "3"}]
+    assert results[1].error == "RuntimeError: boom"
+    assert all(r.duration >= 0 for r in results)
+
+
+def test_run_template_batch_process_pool(mock_template_manager):
+    mock_template_manager.return_value.read_template.return_value = {
+        "parameters": [
+            {
+                "name": "day",
+                "type": "integer",
+                "description": "Day",
+                "default": "",
+                "required": True,
+            }
+        ],
+        "operations": [],
+    }
+
+    results = run_template_batch(
+        "test_template", "v1", [{"day": "1"}, {}, {"day": "3"}], max_workers=2
+    )
+
+    assert [r.succeeded for r in results] == [True, False, True]
+    assert "Parameter day not found" in results[1].error
+
+
+def test_init_batch_worker_clears_inherited_clients(mock_setup):
+    with (
+        patch("datarush.run.clear_s3_clients") as mock_clear_s3_clients,
+        patch("datarush.run.clear_template_managers") as mock_clear_template_managers,
+        patch("datarush.run.template_to_dataflow"),
+    ):
+        _init_batch_worker(MOCK_CONFIG, {"operations": []})
+
+    mock_clear_s3_clients.assert_called_once()
+    mock_clear_template_managers.assert_called_once()
+    mock_setup.assert_called_once_with(MOCK_CONFIG)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '[{"day": "1"}, {"day": "2"}]',
+        '{"day": "1"}\n\n{"day": "2"}\n',
+    ],
+)
+def test_read_parameter_sets(tmp_path, content):
+    path = tmp_path / "parameters.json"
+    path.write_text(content)
+
+    assert _read_parameter_sets(str(path)) == [{"day": "1"}, {"day": "2"}]
+
+
+def test_run_template_from_command_line_batch(monkeypatch, tmp_path):
+    path = tmp_path / "parameters.json"
+    path.write_text('[{"day": "1"}, {"day": "2"}]')
+    monkeypatch.setattr(
+        "sys.argv",
+        ["run.py", "--template", "t", "--version", "v1", "--parameters-file", str(path)],
+    )
+
+    with patch("datarush.run.run_template_batch") as mock_batch:
+        mock_batch.return_value = [
+            RunResult(parameters={"day": "1"}, succeeded=True, duration=0.1),
+            RunResult(parameters={"day": "2"}, succeeded=False, duration=0.1, error="boom"),
+        ]
+        with pytest.raises(SystemExit):
+            run_template_from_command_line(config=MOCK_CONFIG)
+
+    mock_batch.assert_called_once_with(
+        "t",
+        "v1",
+        [{"day": "1"}, {"day": "2"}],
+        config=MOCK_CONFIG,
+        max_workers=1,
+        release_tables=False,
+        prefetch_workers=0,
+    )
+
+
+def test_run_template_from_command_line_profile(
+    mock_setup, mock_template_manager, mock_dataflow, monkeypatch, tmp_path
+):
+    mock_template_manager.return_value.read_template.return_value = {"mock": "template"}
+    mock_dataflow.parameters = []
+    mock_dataflow.profile = RunProfile(wall_time=1.5)
+
+    profile_path = tmp_path / "profile.json"
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "run.py",
+            "--template",
+            "test_template",
+            "--version",
+            "v1",
+            "--profile",
+            str(profile_path),
+        ],
+    )
+
+    run_template_from_command_line(config=MOCK_CONFIG)
+
+    mock_dataflow.run.assert_called_once_with(
+        profile=True, release_tables=False, prefetch_workers=0
+    )
+    assert json.loads(profile_path.read_text())["wall_time"] == 1.5
+
+
+def test_run_template_from_command_line_explain(
+    mock_setup, mock_template_manager, mock_dataflow, monkeypatch, capsys
+):
+    mock_template_manager.return_value.read_template.return_value = {"mock": "template"}
+    mock_dataflow.parameters = []
+    mock_dataflow.explain.return_value = DataflowPlan(warnings=["expensive"])
+    monkeypatch.setattr(
+        "sys.argv", ["run.py", "--template", "test_template", "--version", "v1", "--explain"]
+    )
+
+    run_template_from_command_line(config=MOCK_CONFIG)
+
+    mock_dataflow.run.assert_not_called()
+    assert "- expensive" in capsys.readouterr().out
+
+
+def test_run_template_from_command_line_release_tables(
+    mock_setup, mock_template_manager, mock_dataflow, monkeypatch
+):
+    mock_template_manager.return_value.read_template.return_value = {"mock": "template"}
+    mock_dataflow.parameters = []
+    monkeypatch.setattr(
+        "sys.argv",
+        ["run.py", "--template", "test_template", "--version", "v1", "--release-tables"],
+    )
+
+    run_template_from_command_line(config=MOCK_CONFIG)
+
+    mock_dataflow.run.assert_called_once_with(
+        profile=False, release_tables=True, prefetch_workers=0
+    )
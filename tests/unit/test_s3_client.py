@@ -1,12 +1,23 @@
+import hashlib
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 
+import awswrangler as wr
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
-from datarush.core.types import ContentType
-from datarush.utils.s3_client import DatasetWriteMode, S3Client, S3Dataset
+from datarush.core.types import Compression, ContentType, ParquetCompression, RowConditionGroup
+from datarush.utils.manifest import DatasetManifest
+from datarush.utils.misc import ParquetOptions
+from datarush.utils.s3_client import (
+    CompactionLog,
+    DatasetWriteMode,
+    ManifestConflictError,
+    S3Client,
+    S3Dataset,
+    get_s3_client,
+)
 
 
 @pytest.fixture
@@ -20,6 +31,17 @@ def s3_client(mock_boto3_client):
     return S3Client()
 
 
+@pytest.fixture(scope="module")
+def local_s3_config():
+    pytest.importorskip("moto.server")
+    from datarush.benchmark.end_to_end import local_s3
+
+    with local_s3() as config:
+        yield config
+    # S3Dataset points awswrangler to the emulator
+    wr.config.reset()
+
+
 def test_get_object(s3_client, mock_boto3_client):
     # Mock the get_object method
     mock_client_instance = mock_boto3_client.return_value
@@ -62,6 +84,26 @@ def test_delete_object(s3_client, mock_boto3_client):
     )
 
 
+def test_delete_objects_in_batches(s3_client, mock_boto3_client):
+    mock_client_instance = mock_boto3_client.return_value
+    mock_client_instance.delete_objects = MagicMock(return_value={})
+
+    s3_client.delete_objects("test-bucket", [f"key-{i}" for i in range(1500)])
+
+    batches = [
+        call.kwargs["Delete"]["Objects"]
+        for call in mock_client_instance.delete_objects.call_args_list
+    ]
+    assert [len(batch) for batch in batches] == [1000, 500]
+    assert batches[1][-1] == {"Key": "key-1499"}
+
+    mock_client_instance.delete_objects.return_value = {
+        "Errors": [{"Key": "key-0", "Message": "Access Denied"}]
+    }
+    with pytest.raises(RuntimeError, match="key-0: Access Denied"):
+        s3_client.delete_objects("test-bucket", ["key-0"])
+
+
 def test_list_object_keys(s3_client, mock_boto3_client):
     # Mock the list_objects_v2 method
     mock_client_instance = mock_boto3_client.return_value
@@ -94,6 +136,38 @@ def test_list_object_keys_empty(s3_client, mock_boto3_client):
     )
 
 
+def test_list_objects_reads_all_pages(s3_client, mock_boto3_client):
+    # Mock the list_objects_v2 paginator with two pages
+    mock_client_instance = mock_boto3_client.return_value
+    mock_paginator = mock_client_instance.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {"Contents": [{"Key": "folder/file1.txt", "Size": 1}]},
+        {"Contents": [{"Key": "folder/file2.txt", "Size": 2}]},
+        {},
+    ]
+
+    # Call the method
+    result = s3_client.list_objects("test-bucket", "folder/")
+
+    # Assertions
+    assert [obj["Key"] for obj in result] == ["folder/file1.txt", "folder/file2.txt"]
+    mock_client_instance.get_paginator.assert_called_once_with("list_objects_v2")
+    mock_paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="folder")
+
+
+def test_find_object_missing(s3_client, mock_boto3_client):
+    # Mock the get_object method raising NoSuchKey
+    mock_client_instance = mock_boto3_client.return_value
+    mock_client_instance.exceptions.NoSuchKey = KeyError
+    mock_client_instance.get_object = MagicMock(side_effect=KeyError("test-key"))
+
+    # Call the method
+    result = s3_client.find_object("test-bucket", "test-key")
+
+    # Assertions
+    assert result is None
+
+
 def test_list_folders(s3_client, mock_boto3_client):
     # Mock the list_objects_v2 method
     mock_client_instance = mock_boto3_client.return_value
@@ -156,7 +230,15 @@ def mock_boto3_session():
 
 
 @pytest.fixture
-def s3_dataset(mock_awswrangler, mock_boto3_session):
+def mock_s3_client():
+    with patch("datarush.utils.s3_client.get_s3_client") as mock_get_client:
+        mock_get_client.return_value.find_object.return_value = None
+        mock_get_client.return_value.find_object_with_etag.return_value = None
+        yield mock_get_client.return_value
+
+
+@pytest.fixture
+def s3_dataset(mock_awswrangler, mock_boto3_session, mock_s3_client):
     return S3Dataset(
         bucket="test-bucket",
         prefix="test-prefix",
@@ -179,6 +261,7 @@ def test_read_csv(mock_awswrangler, mock_boto3_session, s3_dataset):
         boto3_session=mock_boto3_session,
         path="s3://test-bucket/test-prefix",
         dataset=True,
+        path_ignore_suffix=["_manifest.json", "_compaction.json"],
     )
     assert isinstance(result, pd.DataFrame)
     assert result.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
@@ -210,6 +293,43 @@ def test_write_csv(mock_awswrangler, mock_boto3_session, s3_dataset):
     )
 
 
+def test_write_parquet_options(mock_awswrangler, mock_boto3_session, mock_s3_client):
+    dataset = S3Dataset(
+        bucket="test-bucket",
+        prefix="test-prefix",
+        content_type=ContentType.PARQUET,
+        parquet_options=ParquetOptions(
+            compression=ParquetCompression.ZSTD,
+            row_group_size=1000,
+            use_dictionary=False,
+            max_rows_by_file=5000,
+        ),
+        sort_by=["id"],
+    )
+    df = pd.DataFrame({"id": [3, 1, 2], "value": ["c", "a", "b"]})
+
+    dataset.write(df)
+
+    _, called_kwargs = mock_awswrangler.s3.to_parquet.call_args
+    assert_frame_equal(
+        called_kwargs.pop("df"), pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
+    )
+    assert called_kwargs == dict(
+        path="s3://test-bucket/test-prefix",
+        dataset=True,
+        boto3_session=mock_boto3_session,
+        partition_cols=[],
+        mode=DatasetWriteMode.APPEND.value,
+        index=False,
+        compression="zstd",
+        max_rows_by_file=5000,
+        pyarrow_additional_kwargs={
+            "use_dictionary": False,
+            "write_table_args": {"row_group_size": 1000},
+        },
+    )
+
+
 def test_write_empty_dataframe(mock_awswrangler, s3_dataset):
     # Mock an empty DataFrame
     df = pd.DataFrame()
@@ -257,3 +377,410 @@ def test_write_unique_missing_columns(mock_awswrangler, s3_dataset):
     # Call the method and expect an exception
     with pytest.raises(ValueError, match="Columns \\['id'\\] not found in DataFrame columns."):
         s3_dataset.write(df)
+
+
+class FakeS3Client:
+    """S3 client keeping objects in memory."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    def list_objects(self, bucket, prefix):
+        return [
+            {"Key": key, "Size": len(body), "ETag": self._etag(key)}
+            for key, body in sorted(self.objects.items())
+            if key.startswith(prefix.strip("/"))
+        ]
+
+    def get_object(self, bucket, key):
+        return BytesIO(self.objects[key])
+
+    def find_object(self, bucket, key):
+        return BytesIO(self.objects[key]) if key in self.objects else None
+
+    def find_object_with_etag(self, bucket, key):
+        if key not in self.objects:
+            return None
+        return BytesIO(self.objects[key]), self._etag(key)
+
+    def put_object(self, bucket, key, body):
+        self.objects[key] = body.read()
+
+    def put_object_if_unchanged(self, bucket, key, body, etag):
+        current = self._etag(key) if key in self.objects else None
+        if current != etag:
+            return False
+        self.put_object(bucket, key, body)
+        return True
+
+    def _etag(self, key):
+        return f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
+
+    def delete_object(self, bucket, key):
+        del self.objects[key]
+
+    def delete_objects(self, bucket, keys):
+        for key in keys:
+            self.objects.pop(key, None)
+
+
+def test_arrow_dataset(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+    fake_s3.objects["test-prefix-other/part=a/other.arrow"] = b""
+
+    def dataset(mode):
+        return S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.ARROW,
+            partition_columns=["part"],
+            write_mode=mode,
+        )
+
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        dataset(DatasetWriteMode.OVERWRITE).write(
+            pd.DataFrame({"id": [1, 2, 3], "part": ["a", "a", "b"]})
+        )
+        dataset(DatasetWriteMode.APPEND).write(pd.DataFrame({"id": [4], "part": ["b"]}))
+        dataset(DatasetWriteMode.OVERWRITE_PARTITIONS).write(
+            pd.DataFrame({"id": [5], "part": ["a"]})
+        )
+
+        result = dataset(DatasetWriteMode.APPEND).read()
+        filtered = dataset(DatasetWriteMode.APPEND).read(
+            partition_filter=lambda partitions: partitions["part"] == "b"
+        )
+
+    assert sorted(zip(result["id"], result["part"])) == [(3, "b"), (4, "b"), (5, "a")]
+    assert sorted(filtered["id"]) == [3, 4]
+    assert len([key for key in fake_s3.objects if key.startswith("test-prefix/")]) == 3
+    assert "test-prefix-other/part=a/other.arrow" in fake_s3.objects
+
+
+def test_upsert_dataset(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+
+    def dataset(mode, unique_ids=None):
+        return S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.ARROW,
+            partition_columns=["part"],
+            unique_ids=unique_ids,
+            write_mode=mode,
+        )
+
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        dataset(DatasetWriteMode.UPSERT, ["id"]).write(
+            pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"], "part": [1, 1, 2]})
+        )
+        untouched = {key for key in fake_s3.objects if "part=2/" in key}
+
+        dataset(DatasetWriteMode.UPSERT, ["id"]).write(
+            pd.DataFrame({"id": [2, 4, 5, 5], "value": ["B", "d", "x", "e"], "part": [1, 1, 3, 3]})
+        )
+        result = dataset(DatasetWriteMode.APPEND).read().sort_values("id")
+
+        with pytest.raises(ValueError, match="required in UPSERT mode"):
+            dataset(DatasetWriteMode.UPSERT).write(pd.DataFrame({"id": [1], "part": [1]}))
+
+    assert list(zip(result["id"], result["value"], result["part"])) == [
+        (1, "a", "1"),
+        (2, "B", "1"),
+        (3, "c", "2"),
+        (4, "d", "1"),
+        (5, "e", "3"),
+    ]
+    assert {key for key in fake_s3.objects if "part=2/" in key} == untouched
+    assert len([key for key in fake_s3.objects if "part=1/" in key]) == 1
+
+
+def test_compact_dataset(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+
+    def dataset(mode=DatasetWriteMode.APPEND):
+        return S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.ARROW,
+            partition_columns=["part"],
+            write_mode=mode,
+        )
+
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        for i in [3, 1, 2]:
+            dataset().write(pd.DataFrame({"id": [i], "part": ["a"]}))
+        dataset().write(pd.DataFrame({"id": [4, 5], "part": ["b", "b"]}))
+        fake_s3.objects["test-prefix/part=a/_SUCCESS"] = b""
+        untouched = {key for key in fake_s3.objects if "part=b/" in key}
+        replaced = {
+            obj["Key"]: obj["ETag"]
+            for obj in fake_s3.list_objects("test-bucket", "test-prefix/part=a")
+            if obj["Key"].endswith(".arrow")
+        }
+
+        compactions = dataset().compact(min_files=2, sort_by=["id"])
+        result = dataset().read()
+
+    assert [(c.folder, c.files_before, c.files_after) for c in compactions] == [("part=a", 3, 1)]
+    assert list(zip(result["id"], result["part"])) == [
+        (1, "a"),
+        (2, "a"),
+        (3, "a"),
+        (4, "b"),
+        (5, "b"),
+    ]
+    assert {key for key in fake_s3.objects if "part=b/" in key} == untouched
+    assert len([key for key in fake_s3.objects if "part=a/" in key]) == 3
+    log = CompactionLog.from_json(fake_s3.objects["test-prefix/part=a/_compaction.json"])
+    assert log.replaced == replaced
+    assert [key for key in log.objects if key in fake_s3.objects] == log.objects
+    assert log.processed_by(replaced) is True
+    assert log.processed_by({}) is False
+    assert log.processed_by(dict(list(replaced.items())[:1])) is None
+
+
+def test_compact_dataset_with_manifest(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+
+    def dataset():
+        return S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.ARROW,
+            partition_columns=["part"],
+            write_mode=DatasetWriteMode.APPEND,
+            manifest=True,
+        )
+
+    def data_objects():
+        return {
+            obj["Key"]: obj["ETag"]
+            for obj in fake_s3.list_objects("test-bucket", "test-prefix/part=a")
+            if obj["Key"].endswith(".arrow")
+        }
+
+    deleted_while_listed = []
+    delete_objects = fake_s3.delete_objects
+
+    def record_delete_objects(bucket, keys):
+        manifest = DatasetManifest.from_json(fake_s3.objects["test-prefix/_manifest.json"])
+        listed = {f"test-prefix/{file.path}" for file in manifest.files}
+        deleted_while_listed.extend(key for key in keys if key in listed)
+        delete_objects(bucket, keys)
+
+    fake_s3.delete_objects = record_delete_objects
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        for i in range(3):
+            dataset().write(pd.DataFrame({"id": [i, i + 10], "part": ["a", "b"]}))
+        first_replaced = data_objects()
+        dataset().compact(min_files=2)
+        first = CompactionLog.from_json(fake_s3.objects["test-prefix/part=a/_compaction.json"])
+
+        for i in range(3):
+            dataset().write(pd.DataFrame({"id": [i + 20], "part": ["a"]}))
+        new_objects = {
+            key: etag for key, etag in data_objects().items() if key not in first.objects
+        }
+        dataset().compact(min_files=2)
+        second = CompactionLog.from_json(fake_s3.objects["test-prefix/part=a/_compaction.json"])
+        manifest = dataset().read_manifest()
+
+    # Old objects are only deleted once the manifest no longer lists them
+    assert deleted_while_listed == []
+    assert sorted(f"test-prefix/{file.path}" for file in manifest.files) == sorted(
+        key for key in fake_s3.objects if key.endswith(".arrow")
+    )
+    assert second.previous == first
+    assert second.processed_by({**first_replaced, **new_objects}) is True
+    assert second.processed_by(first_replaced) is None
+    assert second.processed_by(new_objects) is None
+
+
+def test_compression_is_only_supported_for_text_datasets(mock_boto3_session):
+    with pytest.raises(ValueError, match="cannot be compressed"):
+        S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.PARQUET,
+            compression=Compression.GZIP,
+        )
+
+
+def test_dataset_manifest(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+
+    def dataset(mode=DatasetWriteMode.APPEND, manifest=False):
+        return S3Dataset(
+            bucket="test-bucket",
+            prefix="test-prefix",
+            content_type=ContentType.ARROW,
+            partition_columns=["part"],
+            write_mode=mode,
+            manifest=manifest,
+        )
+
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        dataset().write(pd.DataFrame({"id": [1, 2], "part": ["a", "a"]}))
+        dataset(manifest=True).write(pd.DataFrame({"id": [10, 11], "part": ["a", "b"]}))
+        dataset().write(pd.DataFrame({"id": [20, 21], "part": ["b", "c"]}))
+        dataset(DatasetWriteMode.OVERWRITE_PARTITIONS).write(
+            pd.DataFrame({"id": [30], "part": ["c"]})
+        )
+
+        fake_s3.list_objects = MagicMock(side_effect=AssertionError("listed"))
+        read_keys = []
+        get_object = fake_s3.get_object
+        fake_s3.get_object = lambda bucket, key: read_keys.append(key) or get_object(bucket, key)
+        result = dataset().read(
+            row_filter=RowConditionGroup.model_validate(
+                {
+                    "conditions": [
+                        {
+                            "column": "id",
+                            "operator": "is greater than",
+                            "value": "15",
+                            "value_type": "integer",
+                        }
+                    ]
+                }
+            )
+        )
+        manifest = dataset().read_manifest()
+
+    assert list(zip(result["id"], result["part"])) == [(20, "b"), (30, "c")]
+    # The object written before the manifest has no statistics and is always read
+    assert sorted(key.split("/")[1] for key in read_keys) == ["part=a", "part=b", "part=c"]
+    assert len(manifest.files) == 5
+    assert sorted(f"test-prefix/{file.path}" for file in manifest.files) == sorted(
+        key for key in fake_s3.objects if not key.endswith("_manifest.json")
+    )
+
+
+def test_dataset_manifest_concurrent_appends(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+    dataset = S3Dataset(
+        bucket="test-bucket",
+        prefix="test-prefix",
+        content_type=ContentType.ARROW,
+        partition_columns=["part"],
+        write_mode=DatasetWriteMode.APPEND,
+        manifest=True,
+    )
+
+    put_object_if_unchanged = fake_s3.put_object_if_unchanged
+    interleaved = []
+
+    def put_after_other_writer(bucket, key, body, etag):
+        if not interleaved:
+            # Another writer appends between this writer reading and saving the manifest
+            interleaved.append(True)
+            dataset.write(pd.DataFrame({"id": [2], "part": ["b"]}))
+        return put_object_if_unchanged(bucket, key, body, etag)
+
+    with patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3):
+        dataset.write(pd.DataFrame({"id": [0], "part": ["a"]}))
+        fake_s3.put_object_if_unchanged = put_after_other_writer
+        dataset.write(pd.DataFrame({"id": [1], "part": ["a"]}))
+        manifest = dataset.read_manifest()
+        result = dataset.read()
+
+    assert sorted(f"test-prefix/{file.path}" for file in manifest.files) == sorted(
+        key for key in fake_s3.objects if not key.endswith("_manifest.json")
+    )
+    assert sorted(result["id"]) == [0, 1, 2]
+
+
+def test_dataset_manifest_conflicts_give_up(mock_boto3_session):
+    fake_s3 = FakeS3Client()
+    fake_s3.put_object_if_unchanged = MagicMock(return_value=False)
+    dataset = S3Dataset(
+        bucket="test-bucket",
+        prefix="test-prefix",
+        content_type=ContentType.ARROW,
+        write_mode=DatasetWriteMode.APPEND,
+        manifest=True,
+    )
+
+    with (
+        patch("datarush.utils.s3_client.get_s3_client", return_value=fake_s3),
+        patch("datarush.utils.s3_client._MANIFEST_SAVE_BACKOFF", 0),
+        pytest.raises(ManifestConflictError),
+    ):
+        dataset.write(pd.DataFrame({"id": [0]}))
+
+
+@pytest.mark.parametrize(
+    "content_type", [ContentType.CSV, ContentType.JSON, ContentType.PARQUET, ContentType.ARROW]
+)
+def test_compacted_dataset_round_trip(local_s3_config, content_type):
+    from datarush.benchmark.end_to_end import BUCKET
+
+    def dataset(mode=DatasetWriteMode.APPEND, unique_ids=None):
+        return S3Dataset(
+            bucket=BUCKET,
+            prefix=f"compacted-{content_type.value.lower()}",
+            content_type=content_type,
+            partition_columns=["part"],
+            write_mode=mode,
+            unique_ids=unique_ids,
+            config=local_s3_config,
+        )
+
+    for i in range(3):
+        dataset().write(pd.DataFrame({"id": [i], "part": ["a"]}))
+    dataset().compact(min_files=2)
+    # Writes with unique ids read the dataset before writing
+    dataset(unique_ids=["id"]).write(pd.DataFrame({"id": [2, 3], "part": ["a", "a"]}))
+
+    result = dataset().read()
+
+    assert list(result.columns) == ["id", "part"]
+    assert sorted(result["id"].astype(int)) == [0, 1, 2, 3]
+
+
+def test_first_data_key_skips_metadata(local_s3_config):
+    from datarush.benchmark.end_to_end import BUCKET
+
+    dataset = S3Dataset(
+        bucket=BUCKET,
+        prefix="first-data-key",
+        content_type=ContentType.PARQUET,
+        partition_columns=["part"],
+        write_mode=DatasetWriteMode.APPEND,
+        manifest=True,
+        config=local_s3_config,
+    )
+    for i in range(3):
+        dataset.write(pd.DataFrame({"id": [i], "part": ["a"]}))
+    dataset.compact(min_files=2)
+    s3 = get_s3_client(local_s3_config)
+
+    # The manifest sorts before the partition folders
+    assert s3.list_object_keys(BUCKET, "first-data-key/")[0] == "first-data-key/_manifest.json"
+    key = s3.first_data_key(BUCKET, "first-data-key/")
+    assert key.startswith("first-data-key/part=a/") and key.endswith(".parquet")
+    assert s3.first_data_key(BUCKET, "first-data-key-missing/") is None
+
+
+@pytest.mark.parametrize("content_type", [ContentType.CSV, ContentType.JSON, ContentType.JSONL])
+@pytest.mark.parametrize("compression", [Compression.GZIP, Compression.ZSTD, Compression.BZ2])
+def test_compressed_dataset_round_trip(local_s3_config, content_type, compression):
+    from datarush.benchmark.end_to_end import BUCKET
+
+    if compression == Compression.ZSTD:
+        pytest.importorskip("zstandard")
+    dataset = S3Dataset(
+        bucket=BUCKET,
+        prefix=f"compressed-{content_type.value.lower()}-{compression.value}",
+        content_type=content_type,
+        partition_columns=["part"],
+        write_mode=DatasetWriteMode.APPEND,
+        compression=compression,
+        config=local_s3_config,
+    )
+
+    dataset.write(pd.DataFrame({"id": [1, 2], "part": ["a", "b"]}))
+    result = dataset.read()
+
+    assert sorted(result["id"].astype(int)) == [1, 2]
@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from datarush.exceptions import QueueFullError
+from datarush.server import JobStatus, TemplateRunServer
+
+TEMPLATE = {
+    "parameters": [
+        {
+            "name": "day",
+            "type": "integer",
+            "description": "Day",
+            "default": "",
+            "required": True,
+        }
+    ],
+    "operations": [],
+}
+
+
+@pytest.fixture
+def mock_template_manager():
+    with patch("datarush.core.templates.get_template_manager") as mock_manager:
+        mock_manager.return_value.read_template.return_value = TEMPLATE
+        yield mock_manager.return_value
+
+
+@pytest.fixture
+def server(mock_template_manager):
+    server = TemplateRunServer(port=0, max_concurrency=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def _request(server, method, path, payload=None):
+    host, port = server.address
+    request = urllib.request.Request(
+        f"http://{host}:{port}{path}",
+        method=method,
+        data=json.dumps(payload).encode() if payload is not None else None,
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _wait_for(server, job_id):
+    for _ in range(100):
+        status, job = _request(server, "GET", f"/runs/{job_id}")
+        if job["status"] in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("Run did not finish")
+
+
+def test_server_runs_submitted_jobs(server, mock_template_manager):
+    status, job = _request(
+        server, "POST", "/runs", {"template": "t", "version": "v1", "parameters": {"day": "1"}}
+    )
+    assert status == 202
+    assert job["template"] == "t"
+
+    finished = _wait_for(server, job["id"])
+    assert finished["status"] == JobStatus.SUCCEEDED
+    assert finished["duration"] >= 0
+
+    _, failing = _request(server, "POST", "/runs", {"template": "t", "version": "v1"})
+    finished = _wait_for(server, failing["id"])
+    assert finished["status"] == JobStatus.FAILED
+    assert "Parameter day not found" in finished["error"]
+    mock_template_manager.read_template.assert_called_with("t", "v1")
+
+
+def test_server_rejects_invalid_requests(server):
+    assert _request(server, "POST", "/runs", {"template": "t"})[0] == 400
+    assert _request(server, "GET", "/runs/unknown")[0] == 404
+    assert _request(server, "GET", "/health") == (
+        200,
+        {"status": "ok", "queued": 0, "running": 0, "max_concurrency": 2},
+    )
+
+
+def test_server_queue_is_bounded(mock_template_manager):
+    server = TemplateRunServer(port=0, max_queue_size=1)
+    try:
+        server.submit("t", "v1", {"day": "1"})
+        with pytest.raises(QueueFullError):
+            server.submit("t", "v1", {"day": "2"})
+    finally:
+        server._http.server_close()
@@ -0,0 +1,60 @@
+from io import BytesIO
+
+import pytest
+
+from datarush.config import FilesystemStateStoreConfig, S3StateStoreConfig
+from datarush.core.state import FilesystemStateStore, S3StateStore
+
+
+class FakeS3Client:
+    """S3 client keeping objects in memory."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def find_object(self, bucket, key):
+        body = self.objects.get((bucket, key))
+        return BytesIO(body) if body is not None else None
+
+    def put_object(self, bucket, key, body):
+        self.objects[(bucket, key)] = body.read()
+
+
+def test_filesystem_state_store(tmp_path):
+    store = FilesystemStateStore(FilesystemStateStoreConfig(path=str(tmp_path)))
+
+    assert store.read_state("read_s3_dataset/bucket/events") is None
+
+    store.write_state("read_s3_dataset/bucket/events", {"objects": {"a.csv": "etag"}})
+    store.write_state("read_s3_dataset/bucket/events", {"objects": {"b.csv": "etag"}})
+
+    assert store.read_state("read_s3_dataset/bucket/events") == {"objects": {"b.csv": "etag"}}
+    assert (tmp_path / "state/read_s3_dataset/bucket/events.json").exists()
+    assert [path.name for path in (tmp_path / "state/read_s3_dataset/bucket").iterdir()] == [
+        "events.json"
+    ]
+
+
+def test_filesystem_state_store_errors(tmp_path):
+    store = FilesystemStateStore(FilesystemStateStoreConfig(path=str(tmp_path)))
+
+    with pytest.raises(ValueError, match="Invalid state key"):
+        store.write_state("../outside", {})
+
+    (tmp_path / "state").mkdir()
+    (tmp_path / "state/broken.json").write_text("[1, 2")
+    with pytest.raises(ValueError, match="not valid JSON"):
+        store.read_state("broken")
+
+
+def test_s3_state_store(monkeypatch):
+    s3 = FakeS3Client()
+    monkeypatch.setattr("datarush.core.state.get_s3_client", lambda: s3)
+    store = S3StateStore(S3StateStoreConfig(bucket="bucket", prefix="datarush"))
+
+    assert store.read_state("events") is None
+
+    store.write_state("events", {"objects": {}})
+
+    assert store.read_state("events") == {"objects": {}}
+    assert list(s3.objects) == [("bucket", "datarush/state/events.json")]
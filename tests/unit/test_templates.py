@@ -1,15 +1,26 @@
+import contextvars
+import json
+from datetime import datetime, timezone
+from io import BytesIO
 from unittest.mock import patch
 
 import pytest
 from pydantic import Field
 
-from datarush.config import FilesystemTemplateStoreConfig, S3TemplateStoreConfig
+from datarush.config import (
+    DatarushConfig,
+    FilesystemTemplateStoreConfig,
+    S3TemplateStoreConfig,
+    set_datarush_config,
+)
 from datarush.core.dataflow import Dataflow, Operation, Tableset
 from datarush.core.operations import register_operation_type
 from datarush.core.templates import (
+    CachingTemplateManager,
     FilesystemTemplateManager,
     S3TemplateManager,
     dataflow_to_template,
+    get_template_manager,
     template_to_dataflow,
 )
 from datarush.core.types import BaseOperationModel, ColumnStr, ParameterSpec, TableStr
@@ -71,25 +82,266 @@ def mock_s3_client():
         yield MockS3Client.return_value
 
 
-@patch("datarush.core.templates.S3Client.list_folders", return_value=["template1", "template2"])
-def test_s3_template_manager_list_templates(mock_list_folders):
-    manager = S3TemplateManager(
-        config=S3TemplateStoreConfig(bucket="sample-bucket", prefix="datarush")
-    )
-    templates = manager.list_templates()
-    assert templates == ["template1", "template2"]
+def test_s3_template_manager_list_templates_from_catalog():
+    catalog = {
+        "format_version": 1,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "entries": [
+            {
+                "name": name,
+                "version": "1.0.0",
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "datarush_version": "0.0.0",
+                "size": 10,
+            }
+            for name in ["template1", "template2"]
+        ],
+    }
+    with (
+        patch(
+            "datarush.core.templates.S3Client.find_object_with_etag",
+            side_effect=lambda *_: (BytesIO(json.dumps(catalog).encode("utf-8")), '"etag"'),
+        ) as mock_find_object,
+        patch("datarush.core.templates.S3Client.list_objects") as mock_list_objects,
+    ):
+        manager = S3TemplateManager(
+            config=S3TemplateStoreConfig(bucket="sample-bucket", prefix="datarush")
+        )
+        assert manager.list_templates() == ["template1", "template2"]
+        assert manager.list_template_versions("template1") == ["1.0.0"]
+
+    mock_find_object.assert_called_with("sample-bucket", "datarush/templates/_catalog.json")
+    mock_list_objects.assert_not_called()
+
+
+def test_s3_template_manager_lists_missing_catalog_without_writing():
+    template = {"parameters": [], "operations": [], "datarush_version": "0.0.0"}
+    objects = [
+        {
+            "Key": "datarush/templates/template1/version=1.0.0/template.json",
+            "Size": 42,
+            "ETag": '"v1"',
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        },
+        {
+            "Key": "datarush/templates/template1/notes.txt",
+            "Size": 1,
+            "ETag": '"notes"',
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        },
+    ]
+    with (
+        patch("datarush.core.templates.S3Client.find_object_with_etag", return_value=None),
+        patch(
+            "datarush.core.templates.S3Client.list_objects", return_value=objects
+        ) as mock_list_objects,
+        patch(
+            "datarush.core.templates.S3Client.get_object",
+            return_value=BytesIO(json.dumps(template).encode("utf-8")),
+        ),
+        patch("datarush.core.templates.S3Client.put_object") as mock_put_object,
+        patch(
+            "datarush.core.templates.S3Client.put_object_if_unchanged"
+        ) as mock_put_object_if_unchanged,
+    ):
+        manager = S3TemplateManager(
+            config=S3TemplateStoreConfig(bucket="sample-bucket", prefix="datarush")
+        )
+        assert manager.list_templates() == ["template1"]
+        assert manager.list_template_versions("template1") == ["1.0.0"]
+
+    # Read-only credentials can list templates, the store is listed once per check interval
+    mock_put_object.assert_not_called()
+    mock_put_object_if_unchanged.assert_not_called()
+    mock_list_objects.assert_called_once()
+
+
+def test_s3_template_manager_rebuilds_catalog_incrementally():
+    def entry(name, etag):
+        return {
+            "name": name,
+            "version": "1.0.0",
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "datarush_version": "0.0.0",
+            "size": 10,
+            "etag": etag,
+        }
+
+    catalog = {"format_version": 1, "entries": [entry("kept", '"k"'), entry("changed", '"c1"')]}
+    objects = [
+        {
+            "Key": f"datarush/templates/{name}/version=1.0.0/template.json",
+            "Size": 42,
+            "ETag": etag,
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        }
+        for name, etag in [("kept", '"k"'), ("changed", '"c2"'), ("added", '"a"')]
+    ]
+    template = {"parameters": [], "operations": [], "datarush_version": "1.0.0"}
+    with (
+        patch(
+            "datarush.core.templates.S3Client.find_object_with_etag",
+            side_effect=lambda *_: (BytesIO(json.dumps(catalog).encode("utf-8")), '"etag"'),
+        ),
+        patch("datarush.core.templates.S3Client.list_objects", return_value=objects),
+        patch(
+            "datarush.core.templates.S3Client.get_object",
+            side_effect=lambda *_: BytesIO(json.dumps(template).encode("utf-8")),
+        ) as mock_get_object,
+        patch(
+            "datarush.core.templates.S3Client.put_object_if_unchanged", return_value=True
+        ) as mock_put_object,
+    ):
+        manager = S3TemplateManager(
+            config=S3TemplateStoreConfig(bucket="sample-bucket", prefix="datarush")
+        )
+        manager.rebuild_catalog()
+
+    assert sorted(call.args[1] for call in mock_get_object.call_args_list) == [
+        "datarush/templates/added/version=1.0.0/template.json",
+        "datarush/templates/changed/version=1.0.0/template.json",
+    ]
+    bucket, key, body, etag = mock_put_object.call_args.args
+    assert key == "datarush/templates/_catalog.json"
+    assert etag == '"etag"'
+    saved = {entry["name"]: entry for entry in json.loads(body.getvalue())["entries"]}
+    assert saved["kept"] == entry("kept", '"k"')
+    assert saved["changed"] == {
+        "name": "changed",
+        "version": "1.0.0",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "datarush_version": "1.0.0",
+        "size": 42,
+        "etag": '"c2"',
+    }
+    assert saved["added"]["etag"] == '"a"'
 
 
 def test_filesystem_template_manager_list_templates(tmp_path):
-    templates_path = tmp_path / "templates"
-    templates_path.mkdir()
-    (templates_path / "template1").mkdir()
-    (templates_path / "template2").mkdir()
+    manager = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    assert manager.list_templates() == []
+    assert not (tmp_path / "templates" / "_catalog.json").exists()
+
+    _write_sample_template(manager, "template1", "1.0.0")
+    _write_sample_template(manager, "template2", "1.0.0")
+    _write_sample_template(manager, "template1", "1.1.0")
+
+    assert sorted(manager.list_templates()) == ["template1", "template2"]
+    assert manager.list_template_versions("template1") == ["1.0.0", "1.1.0"]
+    assert manager.list_template_versions("template3") == []
+
+    catalog = json.loads((tmp_path / "templates" / "_catalog.json").read_text())
+    entry = catalog["entries"][0]
+    assert entry["name"] == "template1"
+    assert entry["version"] == "1.0.0"
+    assert entry["datarush_version"] == "0.0.0"
+    assert (
+        entry["size"]
+        == (tmp_path / "templates/template1/version=1.0.0/template.json").stat().st_size
+    )
+
+
+def test_filesystem_template_manager_answers_listings_from_catalog(tmp_path):
+    manager = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    _write_sample_template(manager, "template1", "1.0.0")
+
+    with patch("datarush.core.templates.os.listdir") as mock_listdir:
+        assert manager.list_templates() == ["template1"]
+    mock_listdir.assert_not_called()
+
+
+@pytest.mark.parametrize("catalog_content", [None, "not json", '{"format_version": 0}'])
+def test_filesystem_template_manager_rebuilds_stale_catalog(tmp_path, catalog_content):
+    manager = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    _write_sample_template(manager, "template1", "1.0.0")
+    _write_sample_template(manager, "template2", "1.0.0")
+
+    catalog_path = tmp_path / "templates" / "_catalog.json"
+    if catalog_content is None:
+        catalog_path.unlink()
+    else:
+        catalog_path.write_text(catalog_content)
+
+    assert sorted(manager.list_templates()) == ["template1", "template2"]
+    assert json.loads(catalog_path.read_text())["format_version"] == 1
+
+
+def test_filesystem_template_manager_checks_catalog_against_store(tmp_path):
+    config = FilesystemTemplateStoreConfig(path=str(tmp_path))
+    manager = FilesystemTemplateManager(config=config)
+    _write_sample_template(manager, "template1", "1.0.0")
+
+    # Copied into the store without updating the catalog
+    copied = tmp_path / "templates" / "template2" / "version=1.0.0"
+    copied.mkdir(parents=True)
+    (copied / "template.json").write_text(
+        (tmp_path / "templates/template1/version=1.0.0/template.json").read_text()
+    )
+
+    assert manager.list_templates() == ["template1"]
+
+    checking = FilesystemTemplateManager(config=config, check_interval=0)
+    assert sorted(checking.list_templates()) == ["template1", "template2"]
+    assert sorted(manager.list_templates()) == ["template1", "template2"]
+
+
+def test_filesystem_template_manager_checks_unchecked_catalog(tmp_path):
+    manager = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    _write_sample_template(manager, "template1", "1.0.0")
+    _write_sample_template(manager, "template2", "1.0.0")
+
+    # Catalog of an older version, missing a template and never checked
+    catalog_path = tmp_path / "templates" / "_catalog.json"
+    catalog = json.loads(catalog_path.read_text())
+    del catalog["checked_at"]
+    catalog["entries"] = catalog["entries"][:1]
+    catalog_path.write_text(json.dumps(catalog))
+
+    assert sorted(manager.list_templates()) == ["template1", "template2"]
+    assert "checked_at" in json.loads(catalog_path.read_text())
 
-    manager = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path="."))
-    manager._path = str(tmp_path)
-    templates = manager.list_templates()
-    assert sorted(templates) == ["template1", "template2"]
+
+def test_s3_template_manager_retries_conflicting_catalog_update():
+    template = {"parameters": [], "operations": [], "datarush_version": "0.0.0"}
+    entry = {
+        "name": "template1",
+        "version": "1.0.0",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "datarush_version": "0.0.0",
+        "size": 10,
+    }
+    # The catalog gets an entry from another process between the two loads
+    catalogs = [
+        {"format_version": 1, "entries": []},
+        {"format_version": 1, "entries": [entry]},
+    ]
+    with (
+        patch("datarush.core.templates.S3Client.list_object_keys", return_value=[]),
+        patch("datarush.core.templates.S3Client.put_object"),
+        patch(
+            "datarush.core.templates.S3Client.find_object_with_etag",
+            side_effect=[
+                (BytesIO(json.dumps(catalog).encode("utf-8")), f'"etag{i}"')
+                for i, catalog in enumerate(catalogs)
+            ],
+        ),
+        patch(
+            "datarush.core.templates.S3Client.put_object_if_unchanged",
+            side_effect=[False, True],
+        ) as mock_put_if_unchanged,
+    ):
+        manager = S3TemplateManager(
+            config=S3TemplateStoreConfig(bucket="sample-bucket", prefix="datarush")
+        )
+        manager.write_template(template, "template2", "1.0.0")
+
+    bucket, key, body, etag = mock_put_if_unchanged.call_args.args
+    assert etag == '"etag1"'
+    saved = json.loads(body.getvalue())
+    assert [(e["name"], e["version"]) for e in saved["entries"]] == [
+        ("template1", "1.0.0"),
+        ("template2", "1.0.0"),
+    ]
 
 
 def test_template_to_dataflow():
@@ -138,3 +390,68 @@ def test_dataflow_to_template():
     assert template["parameters"][0]["name"] == "param1"
     assert len(template["operations"]) == 1
     assert template["operations"][0]["name"] == "mock_operation"
+
+
+def _write_sample_template(manager, name, version):
+    manager.write_template(
+        {"parameters": [], "operations": [], "datarush_version": "0.0.0"}, name, version
+    )
+
+
+def test_caching_template_manager_reads_template_once(tmp_path):
+    store = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    _write_sample_template(store, "template1", "1.0.0")
+    manager = CachingTemplateManager(store)
+
+    with patch.object(store, "read_template", wraps=store.read_template) as mock_read:
+        first = manager.read_template("template1", "1.0.0")
+        first["operations"].append({"name": "modified"})
+        second = manager.read_template("template1", "1.0.0")
+
+    mock_read.assert_called_once_with("template1", "1.0.0")
+    assert second["operations"] == []
+
+
+def test_caching_template_manager_listing_ttl(tmp_path):
+    store = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    _write_sample_template(store, "template1", "1.0.0")
+    manager = CachingTemplateManager(store, list_ttl=60)
+
+    assert manager.list_templates() == ["template1"]
+    assert manager.list_template_versions("template1") == ["1.0.0"]
+
+    # Written directly to the store, not visible until the listing expires
+    _write_sample_template(store, "template2", "1.0.0")
+    assert manager.list_templates() == ["template1"]
+
+    # Written through the manager, listings are refreshed
+    _write_sample_template(manager, "template1", "1.1.0")
+    assert sorted(manager.list_templates()) == ["template1", "template2"]
+    assert sorted(manager.list_template_versions("template1")) == ["1.0.0", "1.1.0"]
+
+
+def test_caching_template_manager_listing_expires(tmp_path):
+    store = FilesystemTemplateManager(config=FilesystemTemplateStoreConfig(path=str(tmp_path)))
+    manager = CachingTemplateManager(store, list_ttl=0)
+
+    assert manager.list_templates() == []
+    _write_sample_template(store, "template1", "1.0.0")
+    assert manager.list_templates() == ["template1"]
+
+
+def test_get_template_manager_follows_active_config(tmp_path, monkeypatch):
+    def manager_for(path: str):
+        monkeypatch.setenv("TEMPLATE_STORE_TYPE", "FILESYSTEM")
+        monkeypatch.setenv("TEMPLATE_STORE_FILESYSTEM_PATH", path)
+        set_datarush_config(DatarushConfig())
+        return get_template_manager()
+
+    first = contextvars.copy_context().run(manager_for, str(tmp_path / "first"))
+    again = contextvars.copy_context().run(manager_for, str(tmp_path / "first"))
+    second = contextvars.copy_context().run(manager_for, str(tmp_path / "second"))
+
+    assert first is again
+    assert second is not first
+    _write_sample_template(second, "template1", "1.0.0")
+    assert first.list_templates() == []
+    assert second.list_templates() == ["template1"]
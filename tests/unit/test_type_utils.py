@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import Literal
+from typing import Literal, Optional
 
 import pytest
 
@@ -92,6 +92,11 @@ def test_convert_to_type_pydantic_model():
         convert_to_type('{"name": "Alice"}', MyModel)  # Missing 'age' field
 
 
+def test_convert_to_type_optional():
+    assert convert_to_type("5", int | None) == 5
+    assert convert_to_type("5", Optional[int]) == 5
+
+
 def test_convert_to_type_unsupported_type():
     class UnsupportedType:
         pass